@@ -0,0 +1,78 @@
+"""
+Compares cached user payloads: pickled ORM instances vs compact projections.
+
+Usage:
+    python -m benchmarks.cache_serialization [--rounds 20000]
+"""
+
+import argparse
+import time
+import timeit
+from datetime import datetime
+
+from aiocache.serializers import JsonSerializer, MsgPackSerializer, PickleSerializer
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from src.entity.models import Base, User, UserRole
+from src.entity.snapshots import dump_user, load_user
+
+
+def load_orm_user() -> User:
+    """
+    Loads a user through a session, so it carries the same state as a queried one.
+    """
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine, expire_on_commit=False) as session:
+        session.add(
+            User(
+                username="benchmark_user",
+                email="benchmark_user@example.com",
+                hashed_password="$2b$12$" + "x" * 53,
+                avatar="https://www.gravatar.com/avatar/0123456789abcdef",
+                confirmed=True,
+                role=UserRole.USER,
+                created_at=datetime(2024, 1, 1, 12, 30),
+            )
+        )
+        session.commit()
+        return session.scalars(select(User)).one()
+
+
+def envelope(value) -> dict:
+    """
+    Wraps a value the way CacheService.get_or_load stores it.
+    """
+    return {"value": value, "delta": 0.0042, "expires": time.time() + 300}
+
+
+def measure(name: str, serializer, value, decode, rounds: int) -> None:
+    payload = serializer.dumps(envelope(value))
+    encode_us = timeit.timeit(lambda: serializer.dumps(envelope(value)), number=rounds)
+    decode_us = timeit.timeit(
+        lambda: decode(serializer.loads(payload)["value"]), number=rounds
+    )
+    print(
+        f"{name:<28}{len(payload):>10}{encode_us / rounds * 1e6:>14.2f}"
+        f"{decode_us / rounds * 1e6:>14.2f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20000)
+    args = parser.parse_args()
+
+    user = load_orm_user()
+    projection = dump_user(user)
+
+    print(f"{'payload':<28}{'bytes':>10}{'encode, us':>14}{'decode, us':>14}")
+    measure("pickle ORM instance", PickleSerializer(), user, lambda v: v, args.rounds)
+    measure("pickle projection", PickleSerializer(), projection, load_user, args.rounds)
+    measure("json projection", JsonSerializer(), projection, load_user, args.rounds)
+    measure("msgpack projection", MsgPackSerializer(), projection, load_user, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Compares listing contacts as ORM entities and as column projections.
+
+Both paths run the query of ContactRepository.get_contacts on a SQLite
+database and serialize the result with model_response:
+
+- orm entities: `select(Contact)`, which builds Contact instances, tracks them
+  in the session identity map and sets up their `user` relationship;
+- row projection: the repository query, selecting CONTACT_COLUMNS as rows
+  returned as dicts.
+
+Prints the median CPU time and the peak traced memory per listed contact.
+
+Usage:
+    python -m benchmarks.contact_projection
+    python -m benchmarks.contact_projection --sizes 100 1000 --rounds 20
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from src.entity.models import Base, Contact, User, UserRole
+from src.repository.contacts import ContactRepository
+from src.schemas.contacts import ContactResponse
+from src.services.serialization import model_response
+
+adapter = TypeAdapter(List[ContactResponse])
+
+
+def seed(path: Path, count: int) -> User:
+    """
+    Creates a database with one user owning `count` contacts.
+    """
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with Session(engine, expire_on_commit=False) as session:
+        user = User(
+            username="benchmark_user",
+            email="benchmark_user@example.com",
+            hashed_password="x",
+            role=UserRole.USER,
+        )
+        session.add(user)
+        session.flush()
+        session.add_all(
+            Contact(
+                name=f"Name{i}",
+                surname=f"Surname{i}",
+                email=f"contact{i}@example.com",
+                phone=f"+38050{i:07d}",
+                birthday=date(1990, 1, 1) + timedelta(days=i % 10000),
+                info="Met at the conference" if i % 2 else None,
+                created_at=datetime(2024, 1, 1, 12, 30),
+                updated_at=datetime(2024, 6, 1, 8, 15),
+                user_id=user.id,
+            )
+            for i in range(count)
+        )
+        session.commit()
+    engine.dispose()
+    return user
+
+
+async def orm_entities(db, user: User, count: int):
+    """
+    The previous listing path: full entities in the identity map.
+    """
+    stmt = select(Contact).filter_by(user_id=user.id).offset(0).limit(count)
+    return (await db.execute(stmt)).scalars().all()
+
+
+async def row_projection(db, user: User, count: int):
+    return await ContactRepository(db).get_contacts("", "", "", 0, count, user)
+
+
+async def measure(sessions, load, user: User, count: int, rounds: int) -> tuple:
+    """
+    Returns the median CPU time and the peak memory of one listing.
+    """
+
+    async def listing():
+        async with sessions() as db:
+            return model_response(adapter, await load(db, user, count))
+
+    times = []
+    for _ in range(rounds):
+        started = time.process_time()
+        await listing()
+        times.append(time.process_time() - started)
+
+    tracemalloc.start()
+    response = await listing()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return sorted(times)[len(times) // 2], peak, len(response.body)
+
+
+async def run(sizes: list[int], rounds: int) -> None:
+    print(f"{'items':>8}{'path':>18}{'cpu/item, us':>15}{'mem/item, B':>14}{'bytes':>12}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "contacts.db"
+            user = seed(path, size)
+            engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+            sessions = async_sessionmaker(bind=engine)
+            for name, load in (
+                ("orm entities", orm_entities),
+                ("row projection", row_projection),
+            ):
+                cpu, peak, body = await measure(sessions, load, user, size, rounds)
+                print(
+                    f"{size:>8}{name:>18}{cpu / size * 1e6:>15.2f}"
+                    f"{peak / size:>14.0f}{body:>12}"
+                )
+            await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Generates a synthetic dataset of users and contacts for performance work.
+
+Names follow a skewed (Zipf-like) distribution, birthdays are spread over
+1940-2010 and the number of contacts per user is log-normal: most users have a
+few dozen, some have thousands. Rows are streamed in batches with COPY on
+PostgreSQL (asyncpg) and with driver-level executemany elsewhere, so millions of rows
+take minutes, not hours. All users share the password "password".
+
+Usage:
+    python -m benchmarks.dataset --users 1000000 --mean-contacts 25
+    python -m benchmarks.dataset --db-url sqlite+aiosqlite:///bench.db --users 10000
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from src.entity.models import Base, Contact, User
+
+FIRST_NAMES = [
+    "Olena", "Andrii", "Iryna", "Oleksandr", "Natalia", "Dmytro", "Tetiana",
+    "Serhii", "Yulia", "Maksym", "Oksana", "Ivan", "Kateryna", "Mykola", "Anna",
+    "Taras", "Sofia", "Bohdan", "Maria", "Yurii", "Daria", "Viktor", "Alina",
+    "Roman", "Svitlana", "Pavlo", "Halyna", "Artem", "Larysa", "Vasyl", "Emma",
+    "Liam", "Olivia", "Noah", "Ava", "James", "Mia", "Lucas", "Chloe", "Mateo",
+]
+SURNAMES = [
+    "Melnyk", "Shevchenko", "Boiko", "Kovalenko", "Bondarenko", "Tkachenko",
+    "Kovalchuk", "Kravchenko", "Oliinyk", "Shevchuk", "Koval", "Polishchuk",
+    "Bondar", "Tkachuk", "Moroz", "Marchenko", "Lysenko", "Rudenko", "Savchenko",
+    "Petrenko", "Smith", "Johnson", "Brown", "Garcia", "Miller", "Davis", "Wilson",
+    "Anderson", "Taylor", "Thomas", "Moore", "Martin", "Lee", "Walker", "Young",
+]
+# Weights of the n-th most common name: 1/n (Zipf's law).
+FIRST_WEIGHTS = [1 / rank for rank in range(1, len(FIRST_NAMES) + 1)]
+SURNAME_WEIGHTS = [1 / rank for rank in range(1, len(SURNAMES) + 1)]
+BIRTHDAY_START = date(1940, 1, 1)
+BIRTHDAY_DAYS = (date(2010, 12, 31) - BIRTHDAY_START).days
+MAX_CONTACTS = 5000
+# bcrypt hash of "password", computed once instead of per user.
+PASSWORD_HASH = "$2b$12$7K0hhRIW73kpqsHt2TmIo.vjpsnP7ZGxzBqZNGnvbPuUgCMfjd/Ba"
+
+USER_COLUMNS = [
+    "id", "username", "email", "hashed_password", "created_at", "avatar",
+    "confirmed", "role",
+]
+CONTACT_COLUMNS = [
+    "id", "name", "surname", "email", "phone", "birthday", "created_at",
+    "updated_at", "info", "user_id",
+]
+
+
+def contacts_per_user(rng: random.Random, mean: float) -> int:
+    """
+    Draws a log-normal number of contacts with the given mean.
+    """
+    sigma = 1.0
+    mu = math.log(mean) - sigma**2 / 2
+    return min(int(rng.lognormvariate(mu, sigma)), MAX_CONTACTS)
+
+
+def generate(
+    rng: random.Random,
+    users: int,
+    mean_contacts: float,
+    first_user_id: int,
+    first_contact_id: int,
+):
+    """
+    Yields ("users", row) and ("contacts", row) tuples in insertion order.
+    """
+    now = datetime(2024, 1, 1)
+    contact_id = first_contact_id
+    for user_id in range(first_user_id, first_user_id + users):
+        first = rng.choices(FIRST_NAMES, FIRST_WEIGHTS)[0]
+        last = rng.choices(SURNAMES, SURNAME_WEIGHTS)[0]
+        username = f"{first.lower()}.{last.lower()}{user_id}"
+        yield "users", (
+            user_id,
+            username,
+            f"{username}@example.com",
+            PASSWORD_HASH,
+            now - timedelta(days=rng.randrange(1000)),
+            None,
+            rng.random() < 0.9,
+            "ADMIN" if rng.random() < 0.01 else "USER",
+        )
+        for _ in range(contacts_per_user(rng, mean_contacts)):
+            name = rng.choices(FIRST_NAMES, FIRST_WEIGHTS)[0]
+            surname = rng.choices(SURNAMES, SURNAME_WEIGHTS)[0]
+            created_at = now - timedelta(minutes=rng.randrange(500_000))
+            yield "contacts", (
+                contact_id,
+                name,
+                surname,
+                f"{name.lower()}.{surname.lower()}.{contact_id}@example.com",
+                f"+38{contact_id:010d}",
+                BIRTHDAY_START + timedelta(days=rng.randrange(BIRTHDAY_DAYS)),
+                created_at,
+                created_at,
+                "Colleague" if rng.random() < 0.2 else None,
+                user_id,
+            )
+            contact_id += 1
+
+
+async def write_batch(conn: AsyncConnection, table: str, rows: list[tuple]) -> None:
+    """
+    Inserts rows with COPY on PostgreSQL or a driver-level executemany otherwise.
+    """
+    columns = USER_COLUMNS if table == "users" else CONTACT_COLUMNS
+    if conn.dialect.driver == "asyncpg":
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            table, records=rows, columns=columns
+        )
+    else:
+        # A driver-level executemany skips per-row ORM and Core processing.
+        placeholder = "?" if conn.dialect.paramstyle == "qmark" else "%s"
+        await conn.exec_driver_sql(
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join([placeholder] * len(columns))})",
+            rows,
+        )
+
+
+async def populate(args) -> None:
+    engine = create_async_engine(args.db_url)
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    counts = {"users": 0, "contacts": 0}
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        # Continues after existing rows, so the generator can be run repeatedly.
+        first_user_id = (await conn.scalar(select(func.max(User.id)))) or 0
+        first_contact_id = (await conn.scalar(select(func.max(Contact.id)))) or 0
+
+        batches = {"users": [], "contacts": []}
+        rows = generate(
+            rng, args.users, args.mean_contacts, first_user_id + 1, first_contact_id + 1
+        )
+        for table, row in rows:
+            batches[table].append(row)
+            counts[table] += 1
+            if len(batches[table]) >= args.batch_size:
+                # Users go first, so contacts never reference missing users.
+                if table == "contacts" and batches["users"]:
+                    await write_batch(conn, "users", batches["users"])
+                    batches["users"] = []
+                await write_batch(conn, table, batches[table])
+                batches[table] = []
+                if table == "contacts":
+                    print(
+                        f"\r{counts['users']} users, {counts['contacts']} contacts",
+                        end="",
+                    )
+        for table in ("users", "contacts"):
+            if batches[table]:
+                await write_batch(conn, table, batches[table])
+
+        if conn.dialect.name == "postgresql":
+            # Explicit IDs bypass the sequences: moves them past the new rows.
+            for table in ("users", "contacts"):
+                await conn.execute(
+                    text(
+                        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                        f"(SELECT max(id) FROM {table}))"
+                    )
+                )
+            await conn.execute(text("ANALYZE users"))
+            await conn.execute(text("ANALYZE contacts"))
+    await engine.dispose()
+
+    elapsed = time.perf_counter() - started
+    total = counts["users"] + counts["contacts"]
+    print(
+        f"\rInserted {counts['users']} users and {counts['contacts']} contacts "
+        f"in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db-url", help="database URL (default: DB_URL setting)")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--mean-contacts", type=float, default=25)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    if args.db_url is None:
+        from src.conf.config import settings
+
+        args.db_url = settings.DB_URL
+    asyncio.run(populate(args))
+
+
+if __name__ == "__main__":
+    main()
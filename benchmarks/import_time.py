@@ -0,0 +1,77 @@
+"""
+Profiles the import of the application (the cold start of every worker).
+
+Runs `python -X importtime -c "import main"` in fresh interpreters and prints
+the median wall time and the modules with the largest cumulative and own
+import times. Heavy subsystems should not show up here: they are imported on
+first use or during the lifespan warmup (src.services.lifecycle).
+
+Usage:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --repeat 10 --top 30
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+
+def import_profile() -> list[tuple[str, int, int]]:
+    """
+    Returns (module, own microseconds, cumulative microseconds) of one import of main.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line.removeprefix("import time:").split("|")
+        modules.append((name.strip(), int(own), int(cumulative)))
+    return modules
+
+
+def wall_time() -> float:
+    """
+    Returns the time to import main in a fresh interpreter, in seconds.
+    """
+    code = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="timed imports")
+    parser.add_argument("--top", type=int, default=20, help="modules listed")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    times = [wall_time() for _ in range(args.repeat)]
+    print(
+        f"import main: median {statistics.median(times) * 1000:.0f} ms, "
+        f"min {min(times) * 1000:.0f} ms over {args.repeat} runs"
+    )
+
+    modules = import_profile()
+    for title, column in (("cumulative", 2), ("own", 1)):
+        print(f"\nTop {args.top} modules by {title} import time:")
+        for module in sorted(modules, key=lambda m: m[column], reverse=True)[: args.top]:
+            print(f"{module[column] / 1000:>10.1f} ms  {module[0]}")
+    print(f"\nProfiled in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Drives a user scenario against the API and reports latency per endpoint.
+
+Each virtual user runs the scenario steps concurrently with the others: steps
+marked "once" (register, confirm email, login) run once, the rest on every
+iteration. Steps limited to some "dialects" (e.g. birthdays, which uses
+PostgreSQL date functions) are skipped on other databases. The report lists
+throughput and p50/p95/p99 latency per step; it can be stored as a baseline
+(benchmarks/baselines/<scenario>-<dialect>.json) and compared with one, failing
+on regressions. Baselines depend on the machine: record them where you compare.
+
+Usage:
+    # Against a running server (same JWT_SECRET as the server):
+    python -m benchmarks.load_test --base-url http://127.0.0.1:8000 --dialect postgresql
+
+    # In-process against a fresh SQLite database (no server, emails not sent):
+    python -m benchmarks.load_test --in-process
+
+    # Store or check a baseline:
+    python -m benchmarks.load_test --in-process --save-baseline
+    python -m benchmarks.load_test --in-process --compare
+
+All virtual users share the IP of this client, and servers limit requests per
+IP: raise AUTH_THROTTLE_MAX_IP_ATTEMPTS and the route limits (RATE_LIMIT_USERS_ME,
+RATE_LIMIT_CONTACTS_READ, RATE_LIMIT_CONTACTS_WRITE) on the server above what
+the scenario sends, or its requests fail with 429. In-process runs turn the
+route limits off.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+
+BENCHMARKS_DIR = Path(__file__).parent
+DEFAULT_SCENARIO = BENCHMARKS_DIR / "scenarios" / "contacts.json"
+BASELINES_DIR = BENCHMARKS_DIR / "baselines"
+# Metrics compared with the baseline: lower latency and higher throughput are better.
+LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def render(template, variables: dict):
+    """
+    Substitutes {variables} in all strings of a step template.
+    """
+    if isinstance(template, str):
+        return template.format_map(variables)
+    if isinstance(template, dict):
+        return {key: render(value, variables) for key, value in template.items()}
+    if isinstance(template, list):
+        return [render(value, variables) for value in template]
+    return template
+
+
+async def run_user(
+    client: httpx.AsyncClient,
+    steps: list[dict],
+    user: int,
+    iterations: int,
+    run_id: str,
+    samples: dict,
+) -> None:
+    """
+    Runs the scenario for one virtual user, recording (latency, ok) per step.
+    """
+    from src.services.auth import create_email_token
+
+    username = f"load_{run_id}_{user}"
+    email = f"{username}@example.com"
+    variables = {
+        "user": user,
+        "username": username,
+        "email": email,
+        "password": "load-test-password",
+        # Confirms the email without reading the mailbox.
+        "email_token": create_email_token({"sub": email}),
+    }
+    headers = {}
+
+    for iteration in range(iterations):
+        variables.update(iteration=iteration, month=iteration % 12 + 1)
+        for step in steps:
+            if step.get("once") and iteration > 0:
+                continue
+            request = {"headers": headers}
+            if "json" in step:
+                request["json"] = render(step["json"], variables)
+            if "form" in step:
+                request["data"] = render(step["form"], variables)
+            path = render(step["path"], variables)
+
+            started = time.perf_counter()
+            try:
+                response = await client.request(step["method"], path, **request)
+                ok = response.status_code == step.get("expect", 200)
+            except httpx.HTTPError:
+                response, ok = None, False
+            samples[step["name"]].append((time.perf_counter() - started, ok))
+
+            if ok and "save" in step:
+                data = response.json()
+                for variable, field in step["save"].items():
+                    variables[variable] = data[field]
+                if "access_token" in variables:
+                    token = variables["access_token"]
+                    headers = {"Authorization": f"Bearer {token}"}
+
+
+def percentile(latencies: list[float], n: int) -> float:
+    if len(latencies) < 2:
+        return latencies[0] if latencies else 0.0
+    return statistics.quantiles(latencies, n=100, method="inclusive")[n - 1]
+
+
+def summarize(samples: dict, elapsed: float) -> dict:
+    """
+    Builds the report: request count, errors, throughput and latency percentiles per step.
+    """
+    report = {}
+    for name, values in samples.items():
+        latencies = sorted(latency for latency, _ in values)
+        report[name] = {
+            "requests": len(values),
+            "errors": sum(1 for _, ok in values if not ok),
+            "rps": round(len(values) / elapsed, 2),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        }
+    return report
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Returns the regressions of a report against a baseline.
+
+    A step regresses when a latency percentile grows, or its throughput drops,
+    by more than `threshold` (e.g. 0.25 for 25%), or when it has errors.
+    """
+    regressions = []
+    for name, current in report.items():
+        if current["errors"]:
+            regressions.append(f"{name}: {current['errors']} failed requests")
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric in LATENCY_METRICS:
+            if previous[metric] and current[metric] > previous[metric] * (1 + threshold):
+                regressions.append(
+                    f"{name}: {metric} {current[metric]} > {previous[metric]} (baseline)"
+                )
+        if current["rps"] < previous["rps"] * (1 - threshold):
+            regressions.append(
+                f"{name}: rps {current['rps']} < {previous['rps']} (baseline)"
+            )
+    return regressions
+
+
+def print_report(report: dict, elapsed: float) -> None:
+    total = sum(step["requests"] for step in report.values())
+    print(f"{total} requests in {elapsed:.2f}s ({total / elapsed:.1f} req/s)")
+    print(
+        f"{'step':<18}{'requests':>10}{'errors':>8}{'req/s':>10}"
+        f"{'p50, ms':>10}{'p95, ms':>10}{'p99, ms':>10}"
+    )
+    for name, step in report.items():
+        print(
+            f"{name:<18}{step['requests']:>10}{step['errors']:>8}{step['rps']:>10}"
+            f"{step['p50_ms']:>10}{step['p95_ms']:>10}{step['p99_ms']:>10}"
+        )
+
+
+def in_process_client(database: Path) -> httpx.AsyncClient:
+    """
+    Returns a client calling the application directly, on a fresh SQLite database.
+    """
+    os.environ["DB_URL"] = f"sqlite+aiosqlite:///{database}"
+    # One client IP registers all virtual users.
+    os.environ.setdefault("AUTH_THROTTLE_MAX_IP_ATTEMPTS", "1000000")
+    os.environ.setdefault("AUTH_THROTTLE_MAX_FAILURES", "1000000")
+    # Keeps the report readable.
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    from sqlalchemy import create_engine
+
+    from main import app
+    from src.entity.models import Base
+    from src.services.limiter import limiter
+    import src.routes.auth
+
+    # The route limits would reject most requests of the virtual users.
+    limiter.enabled = False
+
+    database.unlink(missing_ok=True)
+    Base.metadata.create_all(create_engine(f"sqlite:///{database}"))
+
+    # No SMTP server here: confirmation emails are skipped.
+    async def skip_email(*args, **kwargs):
+        pass
+
+    src.routes.auth.send_confirm_email = skip_email
+    # Unhandled errors are returned as 500 responses and counted, not raised.
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    return httpx.AsyncClient(transport=transport, base_url="http://loadtest")
+
+
+async def run(args, scenario: dict) -> tuple[dict, float]:
+    if args.in_process:
+        client = in_process_client(Path(args.database))
+    else:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=30)
+
+    steps = [
+        step
+        for step in scenario["steps"]
+        if args.dialect in step.get("dialects", [args.dialect])
+    ]
+    samples = defaultdict(list)
+    run_id = uuid.uuid4().hex[:8]
+    users = args.users or scenario["users"]
+    iterations = args.iterations or scenario["iterations"]
+    async with client:
+        started = time.perf_counter()
+        await asyncio.gather(
+            *[
+                run_user(client, steps, user, iterations, run_id, samples)
+                for user in range(users)
+            ]
+        )
+        elapsed = time.perf_counter() - started
+    ordered = {step["name"]: samples[step["name"]] for step in steps}
+    return summarize(ordered, elapsed), elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenario", type=Path, default=DEFAULT_SCENARIO)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--in-process", action="store_true")
+    parser.add_argument("--database", default="loadtest.db")
+    parser.add_argument("--users", type=int, help="virtual users (default: scenario)")
+    parser.add_argument(
+        "--iterations", type=int, help="iterations per user (default: scenario)"
+    )
+    parser.add_argument(
+        "--dialect",
+        help="database of the app: sqlite or postgresql (default: sqlite in-process, "
+        "postgresql otherwise); also names the baseline",
+    )
+    parser.add_argument(
+        "--threshold", type=float, help="allowed regression, e.g. 0.25 (default: scenario)"
+    )
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    args = parser.parse_args()
+    if args.dialect is None:
+        args.dialect = "sqlite" if args.in_process else "postgresql"
+
+    scenario = json.loads(args.scenario.read_text())
+    report, elapsed = asyncio.run(run(args, scenario))
+    print_report(report, elapsed)
+
+    baseline_path = BASELINES_DIR / f"{scenario['name']}-{args.dialect}.json"
+    if args.save_baseline:
+        BASELINES_DIR.mkdir(exist_ok=True)
+        baseline_path.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline saved to {baseline_path}")
+    if args.compare:
+        baseline = json.loads(baseline_path.read_text())
+        threshold = args.threshold if args.threshold is not None else scenario["threshold"]
+        regressions = compare(report, baseline, threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions over {threshold:.0%} against {baseline_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""
+Times every ContactRepository and UserRepository method on a large dataset.
+
+Run it against a database filled by benchmarks.dataset. Each method is called
+--rounds times, every call in a new session, for users sampled at random plus
+the user with the most contacts. The report lists p50/p95/p99 latency and the
+number of statements per call, followed by the plan of each SELECT a method
+runs (EXPLAIN ANALYZE on PostgreSQL, EXPLAIN QUERY PLAN on SQLite).
+
+Write methods leave the data as they found it: created contacts are updated
+and then removed, created users are deleted at the end, and user updates write
+the values the users already have. get_upcoming_birthdays uses PostgreSQL date
+functions and only runs there.
+
+Usage:
+    python -m benchmarks.dataset --db-url sqlite+aiosqlite:///bench.db --users 10000
+    python -m benchmarks.repositories --db-url sqlite+aiosqlite:///bench.db
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from benchmarks.load_test import percentile
+from src.database.instrumentation import instrument_engine, start_query_stats
+from src.entity.models import Contact, User, UserRole
+from src.repository.contacts import ContactRepository
+from src.repository.users import UserRepository
+from src.schemas.contacts import ContactModel
+from src.schemas.user import UserCreate
+
+
+def contact_body(label: str) -> ContactModel:
+    return ContactModel(
+        name="Bench",
+        surname="Mark",
+        email=f"bench.{label}@example.com",
+        phone=f"+99{label[:12]}",
+        birthday=date(1990, 6, 15),
+        info="Created by the repository benchmark",
+    )
+
+
+class Benchmark:
+    """
+    Calls repository methods in fresh sessions and records their latency.
+
+    Attributes:
+    - sessions: Session factory configured like the application's.
+    - users: Sampled users (id, username, email, hashed_password, avatar).
+    - contacts: One contact (id, email, phone) of each sampled user.
+    - created_contacts: Contacts created by create_contact, as (id, label, user).
+    - created_users: IDs of users created by create_user.
+    """
+
+    def __init__(self, engine: AsyncEngine, users: list, contacts: dict):
+        self.sessions = async_sessionmaker(autoflush=False, autocommit=False, bind=engine)
+        self.users = users
+        self.contacts = contacts
+        self.created_contacts = []
+        self.created_users = []
+
+    def cases(self, dialect: str) -> dict:
+        """
+        Returns the benchmarked calls by name, in the order they must run.
+
+        Each call takes the round number and a session and awaits one
+        repository method.
+        """
+        def user(n):
+            return self.users[n % len(self.users)]
+
+        def contact(n):
+            return self.contacts[user(n).id]
+
+        async def create_contact(n, db):
+            label = uuid.uuid4().hex
+            created = await ContactRepository(db).create_contact(contact_body(label), user(n))
+            self.created_contacts.append((created.id, label, user(n)))
+
+        async def update_contact(n, db):
+            contact_id, label, owner = self.created_contacts[n % len(self.created_contacts)]
+            await ContactRepository(db).update_contact(contact_id, contact_body(label), owner)
+
+        async def remove_contact(n, db):
+            contact_id, _, owner = self.created_contacts.pop()
+            await ContactRepository(db).remove_contact(contact_id, owner)
+
+        async def create_user(n, db):
+            name = f"bench_{uuid.uuid4().hex[:12]}"
+            body = UserCreate(
+                username=name,
+                email=f"{name}@example.com",
+                password=user(n).hashed_password,
+                role=UserRole.USER,
+            )
+            created = await UserRepository(db).create_user(body)
+            self.created_users.append(created.id)
+
+        cases = {
+            "contacts.get_contacts": lambda n, db: ContactRepository(db).get_contacts(
+                "", "", "", 0, 50, user(n)
+            ),
+            "contacts.get_contacts(filtered)": lambda n, db: ContactRepository(
+                db
+            ).get_contacts("Ol", "enko", "", 0, 50, user(n)),
+            "contacts.get_contact_by_id": lambda n, db: ContactRepository(
+                db
+            ).get_contact_by_id(contact(n).id, user(n)),
+            "contacts.is_contact_exists": lambda n, db: ContactRepository(
+                db
+            ).is_contact_exists(contact(n).email, contact(n).phone, user(n)),
+            "contacts.get_upcoming_birthdays": lambda n, db: ContactRepository(
+                db
+            ).get_upcoming_birthdays(30, user(n)),
+            "contacts.create_contact": create_contact,
+            "contacts.update_contact": update_contact,
+            "contacts.remove_contact": remove_contact,
+            "users.get_user_by_id": lambda n, db: UserRepository(db).get_user_by_id(
+                user(n).id
+            ),
+            "users.get_user_by_username": lambda n, db: UserRepository(
+                db
+            ).get_user_by_username(user(n).username),
+            "users.get_user_by_email": lambda n, db: UserRepository(
+                db
+            ).get_user_by_email(user(n).email),
+            "users.create_user": create_user,
+            "users.confirmed_email": lambda n, db: UserRepository(db).confirmed_email(
+                user(n).email
+            ),
+            "users.update_avatar_url": lambda n, db: UserRepository(
+                db
+            ).update_avatar_url(user(n).email, user(n).avatar),
+            "users.reset_password": lambda n, db: UserRepository(db).reset_password(
+                user(n).id, user(n).hashed_password
+            ),
+        }
+        if dialect != "postgresql":
+            del cases["contacts.get_upcoming_birthdays"]
+        return cases
+
+    async def measure(self, call, rounds: int) -> dict:
+        """
+        Runs a call `rounds` times and returns its latency percentiles.
+        """
+        latencies, queries = [], 0
+        for n in range(rounds):
+            async with self.sessions() as db:
+                stats = start_query_stats()
+                started = time.perf_counter()
+                await call(n, db)
+                latencies.append(time.perf_counter() - started)
+                queries += stats.count
+        latencies.sort()
+        return {
+            "calls": rounds,
+            "queries": round(queries / rounds, 1),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+            "max_ms": round(latencies[-1] * 1000, 3),
+        }
+
+    async def cleanup(self) -> None:
+        async with self.sessions() as db:
+            if self.created_users:
+                await db.execute(delete(User).where(User.id.in_(self.created_users)))
+                await db.commit()
+
+
+async def capture_selects(engine: AsyncEngine, run) -> list[tuple[str, tuple]]:
+    """
+    Returns the distinct SELECT statements (with parameters) executed by `run`.
+    """
+    captured = {}
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.setdefault(statement, parameters)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        await run()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", listener)
+    return list(captured.items())
+
+
+async def explain(engine: AsyncEngine, statement: str, parameters) -> list[str]:
+    """
+    Returns the query plan of a statement as lines of text.
+    """
+    if engine.dialect.name == "postgresql":
+        prefix = "EXPLAIN (ANALYZE, BUFFERS) "
+    elif engine.dialect.name == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN "
+    else:
+        prefix = "EXPLAIN "
+    async with engine.connect() as conn:
+        result = await conn.exec_driver_sql(prefix + statement, parameters)
+        return [" ".join(str(value) for value in row) for row in result]
+
+
+async def sample_users(engine: AsyncEngine, count: int) -> tuple[list, dict]:
+    """
+    Picks `count` random users plus the one with the most contacts.
+
+    Returns the users and one contact of each, by user ID.
+    """
+    columns = (User.id, User.username, User.email, User.hashed_password, User.avatar)
+    async with engine.connect() as conn:
+        heaviest = await conn.scalar(
+            select(Contact.user_id)
+            .group_by(Contact.user_id)
+            .order_by(func.count().desc())
+            .limit(1)
+        )
+        # Users without contacts are left out: some methods need a contact.
+        sampled = (
+            select(Contact.user_id)
+            .where(Contact.user_id != heaviest)
+            .group_by(Contact.user_id)
+            .order_by(func.random())
+            .limit(count)
+        )
+        users = (
+            await conn.execute(select(*columns).where(User.id.in_(sampled)))
+        ).all()
+        users += (await conn.execute(select(*columns).filter_by(id=heaviest))).all()
+
+        contacts = {}
+        for user in users:
+            contacts[user.id] = (
+                await conn.execute(
+                    select(Contact.id, Contact.email, Contact.phone)
+                    .filter_by(user_id=user.id)
+                    .limit(1)
+                )
+            ).one()
+    return users, contacts
+
+
+def print_report(report: dict) -> None:
+    print(
+        f"{'method':<36}{'calls':>7}{'queries':>9}"
+        f"{'p50, ms':>10}{'p95, ms':>10}{'p99, ms':>10}{'max, ms':>10}"
+    )
+    for name, method in report.items():
+        print(
+            f"{name:<36}{method['calls']:>7}{method['queries']:>9}{method['p50_ms']:>10}"
+            f"{method['p95_ms']:>10}{method['p99_ms']:>10}{method['max_ms']:>10}"
+        )
+
+
+async def run(args) -> tuple[dict, dict]:
+    engine = create_async_engine(args.db_url)
+    instrument_engine(engine)
+    users, contacts = await sample_users(engine, args.sample_users)
+    if not users:
+        raise SystemExit("No users with contacts: fill the database first")
+    print(f"Sampled {len(users)} users, the last one has the most contacts")
+
+    benchmark = Benchmark(engine, users, contacts)
+    report, plans = {}, {}
+    try:
+        for name, call in benchmark.cases(engine.dialect.name).items():
+            report[name] = await benchmark.measure(call, args.rounds)
+
+            # The heaviest user has the largest plans and the slowest queries.
+            async def once():
+                async with benchmark.sessions() as db:
+                    await call(len(users) - 1, db)
+
+            if args.plans and not name.endswith(("create_contact", "remove_contact")):
+                plans[name] = [
+                    (statement, await explain(engine, statement, parameters))
+                    for statement, parameters in await capture_selects(engine, once)
+                ]
+    finally:
+        await benchmark.cleanup()
+        await engine.dispose()
+    return report, plans
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db-url", help="database URL (default: DB_URL setting)")
+    parser.add_argument("--rounds", type=int, default=200, help="calls per method")
+    parser.add_argument("--sample-users", type=int, default=50)
+    parser.add_argument("--output", type=Path, help="also write the report as JSON")
+    parser.add_argument(
+        "--no-plans", dest="plans", action="store_false", help="skip query plans"
+    )
+    args = parser.parse_args()
+    if args.db_url is None:
+        from src.conf.config import settings
+
+        args.db_url = settings.DB_URL
+
+    report, plans = asyncio.run(run(args))
+    print_report(report)
+    for name, statements in plans.items():
+        for statement, plan in statements:
+            print(f"\n{name}: {' '.join(statement.split())}")
+            for line in plan:
+                print(f"    {line}")
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Compares the CPU time of serializing contact lists in the response paths.
+
+- emailstr + json: the baseline, the original response model (the stored
+  email re-validated as EmailStr) on the default FastAPI path;
+- fastapi + json: the default path, validation and conversion by FastAPI,
+  encoding with the stdlib JSON encoder (JSONResponse);
+- fastapi + orjson: the same with the application default ORJSONResponse;
+- pydantic-core: one validation dumped straight to bytes (model_response),
+  used by the contact routes.
+
+Usage:
+    python -m benchmarks.response_serialization
+    python -m benchmarks.response_serialization --sizes 100 1000 --rounds 20
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import date, datetime, timedelta
+from typing import List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from pydantic import EmailStr, Field, TypeAdapter
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from src.entity.models import Base, Contact, User, UserRole
+from src.schemas.contacts import ContactResponse
+from src.services.serialization import model_response
+
+
+class EmailStrContactResponse(ContactResponse):
+    """
+    The contact response model before the email was taken as a string.
+    """
+
+    email: EmailStr = Field(min_length=7, max_length=100)
+
+
+def load_contacts(count: int) -> list[Contact]:
+    """
+    Loads contacts through a session, so they carry the same state as queried ones.
+    """
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine, expire_on_commit=False) as session:
+        user = User(
+            username="benchmark_user",
+            email="benchmark_user@example.com",
+            hashed_password="x",
+            role=UserRole.USER,
+        )
+        session.add(user)
+        session.flush()
+        session.add_all(
+            Contact(
+                name=f"Name{i}",
+                surname=f"Surname{i}",
+                email=f"contact{i}@example.com",
+                phone=f"+38050{i:07d}",
+                birthday=date(1990, 1, 1) + timedelta(days=i % 10000),
+                info="Met at the conference" if i % 2 else None,
+                created_at=datetime(2024, 1, 1, 12, 30),
+                updated_at=datetime(2024, 6, 1, 8, 15),
+                user_id=user.id,
+            )
+            for i in range(count)
+        )
+        session.commit()
+        return list(session.scalars(select(Contact)))
+
+
+def cpu_time(render, rounds: int) -> float:
+    """
+    Returns the median CPU time of one render in milliseconds.
+    """
+    times = []
+    for _ in range(rounds):
+        started = time.process_time()
+        render()
+        times.append(time.process_time() - started)
+    return sorted(times)[len(times) // 2] * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    field = create_model_field("Response", List[ContactResponse], mode="serialization")
+    baseline_field = create_model_field(
+        "Response", List[EmailStrContactResponse], mode="serialization"
+    )
+    adapter = TypeAdapter(List[ContactResponse])
+    loop = asyncio.new_event_loop()
+
+    def fastapi_path(response_class, contacts, field=field):
+        content = loop.run_until_complete(
+            serialize_response(field=field, response_content=contacts)
+        )
+        return response_class(content)
+
+    paths = {
+        "emailstr + json": lambda c: fastapi_path(JSONResponse, c, baseline_field),
+        "fastapi + json": lambda c: fastapi_path(JSONResponse, c),
+        "fastapi + orjson": lambda c: fastapi_path(ORJSONResponse, c),
+        "pydantic-core": lambda c: model_response(adapter, c),
+    }
+
+    print(f"{'items':>8}{'path':>20}{'cpu, ms':>12}{'speedup':>10}{'bytes':>12}")
+    for size in args.sizes:
+        contacts = load_contacts(size)
+        baseline = None
+        for name, render in paths.items():
+            elapsed = cpu_time(lambda: render(contacts), args.rounds)
+            baseline = baseline or elapsed
+            print(
+                f"{size:>8}{name:>20}{elapsed:>12.2f}{baseline / elapsed:>9.1f}x"
+                f"{len(render(contacts).body):>12}"
+            )
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,62 @@
+import time
+
+# Imported first: starts the clock of the startup time measurement.
+from src.conf.startup_clock import IMPORT_STARTED
+
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse
 from starlette.responses import JSONResponse
-from slowapi.errors import RateLimitExceeded
+from src.conf.config import settings
+from src.conf.logging_config import RequestContextMiddleware, setup_logging
+from src.database.instrumentation import QueryStatsMiddleware
 from src.routes import utils, contacts, auth,  users
+from src.services.health import get_health_checker
+from src.services.image import get_image_processor
+from src.services.lifecycle import drain, record_startup, warm_up
+from src.services.limiter import RateLimitExceeded
+from src.services.loop_monitor import get_loop_monitor
+from src.services.metrics import MetricsMiddleware, mark_process_dead, metrics_endpoint
+from src.services.profiler import ProfilerMiddleware
+from src.services.tracing import TracingMiddleware
+from src.services.upload_file import get_upload_service
 
+setup_logging()
 logger = logging.getLogger("rate_limiter")
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application startup and shutdown hooks.
+    """
+    started = time.perf_counter()
+    # Configures the avatar upload service once per worker.
+    get_upload_service()
+    # Opens connections and primes statements before the first request.
+    steps = await warm_up() if settings.STARTUP_WARMUP else {}
+    if settings.LOOP_MONITOR_ENABLED:
+        # Reports calls blocking the event loop.
+        get_loop_monitor().start()
+    # Checks dependencies in the background for the readiness probe.
+    get_health_checker().start()
+    record_startup(IMPORT_SECONDS, time.perf_counter() - started, steps)
+    yield
+    await get_health_checker().stop()
+    await get_loop_monitor().stop()
+    # Closes the database pool and cache connections.
+    await drain()
+    # Stops the avatar processing worker processes.
+    get_image_processor().shutdown()
+    # Drops live gauges of this worker from the multiprocess metrics.
+    mark_process_dead()
+
+
+# Encodes the responses of routes returning plain data with orjson.
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 origins = ["http://localhost:*", "*"]
 
@@ -18,6 +67,14 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(ProfilerMiddleware)
+# Wraps the middleware added before it, so the measured duration includes them;
+# the tracing and request context middleware below wrap it and are not measured.
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
+# Outermost, so every log line of a request carries its ID.
+app.add_middleware(RequestContextMiddleware)
 
 
 @app.exception_handler(RateLimitExceeded)
@@ -26,6 +83,7 @@ async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
     return JSONResponse(
         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
         content={"error": "Request limit exceeded. Please try again later."},
+        headers=exc.headers,
     )
 
 
@@ -33,8 +91,23 @@ app.include_router(utils.router, prefix="/api")
 app.include_router(contacts.router, prefix="/api")
 app.include_router(auth.router, prefix="/api")
 app.include_router(users.router, prefix="/api")
+app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+
+if settings.AVATAR_STORAGE == "local":
+    # Serves avatars of the local storage backend (development and tests).
+    app.mount(
+        settings.AVATAR_LOCAL_URL,
+        StaticFiles(directory=settings.AVATAR_LOCAL_DIR, check_dir=False),
+        name="media",
+    )
+
+IMPORT_SECONDS = time.perf_counter() - IMPORT_STARTED
 
 if __name__ == "__main__":
-    import uvicorn
+    # python main.py: development server with reload.
+    # python main.py --production: multi-worker production server.
+    import sys
+
+    from src.conf.server import run
 
-    uvicorn.run("main:app", host="127.0.0.1", port=8000, reload=True)
+    run(production="--production" in sys.argv[1:])
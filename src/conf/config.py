@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic import ConfigDict, EmailStr
 from pydantic_settings import BaseSettings
 
@@ -10,6 +11,29 @@ class Settings(BaseSettings):
 
     Attributes:
     - DB_URL (str): URL for connecting to the database.
+    - LOG_LEVEL (str): Level of the application logs (default: INFO).
+    - LOG_FORMAT (str): Format of log lines: json or text (default: json).
+    - LOG_QUEUE_SIZE (int): Log records buffered for the writer thread; extra records are dropped (default: 10000).
+    - LOG_SAMPLE_RATES (dict): Share of DEBUG/INFO records kept by logger name, e.g. {"access": 0.1} (default: {}).
+    - DEBUG (bool): Whether debug information (e.g. X-DB-* SQL statistics headers) is added to responses (default: False).
+    - SQL_SLOW_QUERY_MS (float): Execution time from which a statement is logged as slow (default: 200).
+    - SQL_EXPLAIN_SLOW (bool): Whether slow SELECT statements are logged with their query plan (default: True).
+    - SQL_N_PLUS_ONE_THRESHOLD (int): Executions of one statement per request logged as a possible N+1 (default: 10).
+    - SERVER_HOST (str): Address the server listens on (default: 127.0.0.1).
+    - SERVER_PORT (int): Port the server listens on (default: 8000).
+    - SERVER_WORKERS (int): Worker processes of the production server, 0 for one per CPU
+      available to the process, within the CPU quota of a container (default: 0).
+    - SERVER_KEEP_ALIVE (int): Seconds an idle keep-alive connection stays open (default: 5).
+    - SERVER_BACKLOG (int): Maximum number of connections waiting to be accepted (default: 2048).
+    - SERVER_GRACEFUL_TIMEOUT (float): Seconds running requests may finish after SIGTERM (default: 30).
+    - SERVER_MAX_REQUESTS (int): Requests after which a worker is replaced, 0 to never replace it (default: 0).
+    - SERVER_FORWARDED_ALLOW_IPS (str): Proxies trusted for X-Forwarded-* headers (default: 127.0.0.1).
+      Must include the reverse proxy of the deployment: rate limits and auth throttling key on the
+      client IP, and an untrusted proxy makes all clients share its address.
+    - STARTUP_WARMUP (bool): Whether workers open connections and prime statements before serving (default: True).
+    - DB_WARMUP_CONNECTIONS (int): Database connections opened by the warmup (default: 5).
+    - HEALTH_CHECK_INTERVAL (float): Time between two background checks of the DB, cache and mail server in seconds (default: 10).
+    - HEALTH_CHECK_TIMEOUT (float): Maximum time of a single dependency check in seconds (default: 2).
     - JWT_SECRET (str): Secret key for signing JWT tokens.
     - JWT_ALGORITHM (str): Algorithm for generating JWT tokens (default: HS256).
     - JWT_EXPIRATION_SECONDS (int): Token lifetime in seconds (default: 3600).
@@ -23,9 +47,67 @@ class Settings(BaseSettings):
     - MAIL_SSL_TLS (bool): Whether to use SSL/TLS for SMTP (default: True).
     - USE_CREDENTIALS (bool): Whether to use credentials for SMTP (default: True).
     - VALIDATE_CERTS (bool): Whether to validate SSL certificates (default: True).
-    - CLOUDINARY_NAME (str): Cloudinary account name.
+    - CLOUDINARY_NAME (str): Cloudinary account name (required for the cloudinary storage).
     - CLOUDINARY_API_KEY (int): API key for Cloudinary.
     - CLOUDINARY_API_SECRET (str): Secret key for Cloudinary.
+    - AVATAR_STORAGE (str): Avatar storage backend: local, cloudinary or s3 (default: cloudinary).
+      The local disk is meant for development and tests: container disks do not survive redeploys.
+      s3 needs the optional boto3 dependency (poetry install --extras s3).
+    - AVATAR_LOCAL_DIR (str): Directory for avatars of the local storage (default: media).
+    - AVATAR_LOCAL_URL (str): URL prefix under which the local directory is served (default: /media).
+    - S3_BUCKET (str): Bucket of the s3 storage.
+    - S3_ENDPOINT_URL (str): Endpoint of an S3-compatible service (empty for AWS).
+    - S3_ACCESS_KEY (str): Access key id of the s3 storage.
+    - S3_SECRET_KEY (str): Secret access key of the s3 storage.
+    - S3_REGION (str): Region of the bucket.
+    - S3_PUBLIC_URL (str): URL prefix under which bucket objects are served.
+    - RATE_LIMIT_STORAGE_URI (str): Storage of rate limit counters, e.g. redis://redis:6379/1 (default: memory://).
+    - RATE_LIMIT_STRATEGY (str): Rate limiting strategy (default: moving-window).
+    - RATE_LIMIT_USERS_ME (str): Rate limit of the /users/me route (default: 10/minute).
+    - RATE_LIMIT_CONTACTS_READ (str): Rate limit of each contact read route (default: 120/minute).
+    - RATE_LIMIT_CONTACTS_WRITE (str): Rate limit of each contact write route (default: 30/minute).
+    - RATE_LIMIT_AVATAR (str): Rate limit of the avatar upload route (default: 5/minute).
+    - AUTH_THROTTLE_MAX_FAILURES (int): Failed auth attempts per account before backoff (default: 5).
+    - AUTH_THROTTLE_MAX_IP_ATTEMPTS (int): Auth attempts per client IP before backoff (default: 30).
+    - AUTH_THROTTLE_WINDOW_SECONDS (int): Lifetime of auth attempt counters (default: 900).
+    - AUTH_THROTTLE_BASE_DELAY (float): First backoff delay in seconds (default: 1).
+    - AUTH_THROTTLE_MAX_DELAY (float): Maximum backoff delay in seconds (default: 900).
+    - CACHE_BACKEND (str): Cache backend: redis or memory (default: memory).
+    - CACHE_REDIS_HOST (str): Redis host of the cache (default: localhost).
+    - CACHE_REDIS_PORT (int): Redis port of the cache (default: 6379).
+    - CACHE_REDIS_DB (int): Redis database of the cache (default: 0).
+    - CACHE_REDIS_PASSWORD (str): Redis password of the cache (optional).
+    - CACHE_TIMEOUT (float): Timeout of a single cache operation in seconds (default: 0.05).
+    - CACHE_SERIALIZER (str): Serializer of cached values: msgpack, json or pickle (default: msgpack).
+    - CACHE_TTL (int): Default lifetime of cached values in seconds (default: 300).
+    - CACHE_FALLBACK (str): Cache used while Redis is unavailable: memory or none (default: memory).
+    - CACHE_BREAKER_FAILURES (int): Consecutive Redis failures that open the circuit (default: 3).
+    - CACHE_BREAKER_RESET_SECONDS (float): Time before Redis is retried after the circuit opens (default: 30).
+    - CACHE_LOCK_ENABLED (bool): Whether cache misses are loaded by one process at a time (default: False).
+    - CACHE_LOCK_TIMEOUT (float): Lifetime of the loader lock in seconds (default: 2).
+    - CACHE_EARLY_REFRESH_BETA (float): Eagerness of probabilistic early refresh, 0 disables it (default: 1).
+    - RESPONSE_CACHE_TTL (int): Lifetime of cached GET responses in seconds, 0 disables them (default: 0).
+      Responses are cached only with the redis backend while its circuit is closed: invalidation
+      in a per-process cache does not reach the other workers, which would serve stale data.
+    - LOOP_MONITOR_ENABLED (bool): Whether the event loop lag is monitored (default: True).
+    - LOOP_LAG_INTERVAL (float): Time between two loop lag measurements in seconds (default: 0.1).
+    - LOOP_BLOCK_THRESHOLD (float): Blocking time after which the loop stack is logged (default: 0.25).
+    - PROFILER_ENABLED (bool): Whether administrators may profile requests with the X-Profile header (default: True).
+    - PROFILER_INTERVAL (float): Sampling interval of the request profiler in seconds (default: 0.001).
+    - PROFILE_DIR (str): Directory where request profiles are stored (default: profiles).
+    - PROFILE_MAX_FILES (int): Number of newest profiles kept in PROFILE_DIR (default: 50).
+    - TRACING_EXPORTER (str): Where request traces are written: none, console or file (default: none).
+    - TRACING_FILE (str): JSON lines file of the file trace exporter (default: traces.jsonl).
+    - TRACING_SAMPLE_RATE (float): Share of requests that are traced (default: 1).
+    - BCRYPT_WORKERS (int): Threads hashing and verifying passwords per worker (default: 4).
+    - UPLOAD_TIMEOUT_SECONDS (float): Maximum time for a single avatar upload (default: 30).
+    - UPLOAD_MAX_CONCURRENCY (int): Maximum number of simultaneous avatar uploads per worker (default: 4).
+    - AVATAR_SIZE (int): Width and height of stored avatars in pixels (default: 250).
+    - AVATAR_FORMAT (str): Output format of stored avatars, WEBP or JPEG (default: WEBP).
+    - AVATAR_QUALITY (int): Encoder quality of stored avatars (default: 85).
+    - AVATAR_MAX_UPLOAD_BYTES (int): Maximum size of an uploaded avatar file (default: 5 MB).
+    - AVATAR_MAX_PIXELS (int): Maximum number of decoded pixels of an uploaded avatar (default: 40 000 000).
+    - AVATAR_PROCESS_WORKERS (int): Number of worker processes for avatar processing (default: 2).
 
     Methods:
     - model_config: Configuration for loading settings from the `.env` file.
@@ -38,6 +120,27 @@ class Settings(BaseSettings):
     """
 
     DB_URL: str
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_SAMPLE_RATES: dict[str, float] = {}
+    DEBUG: bool = False
+    SQL_SLOW_QUERY_MS: float = 200.0
+    SQL_EXPLAIN_SLOW: bool = True
+    SQL_N_PLUS_ONE_THRESHOLD: int = 10
+
+    SERVER_HOST: str = "127.0.0.1"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0
+    SERVER_KEEP_ALIVE: int = 5
+    SERVER_BACKLOG: int = 2048
+    SERVER_GRACEFUL_TIMEOUT: float = 30.0
+    SERVER_MAX_REQUESTS: int = 0
+    SERVER_FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+    STARTUP_WARMUP: bool = True
+    DB_WARMUP_CONNECTIONS: int = 5
+    HEALTH_CHECK_INTERVAL: float = 10.0
+    HEALTH_CHECK_TIMEOUT: float = 2.0
 
     JWT_SECRET: str
     JWT_ALGORITHM: str = "HS256"
@@ -54,9 +157,74 @@ class Settings(BaseSettings):
     USE_CREDENTIALS: bool = True
     VALIDATE_CERTS: bool = True
 
-    CLOUDINARY_NAME: str
-    CLOUDINARY_API_KEY: int
-    CLOUDINARY_API_SECRET: str
+    CLOUDINARY_NAME: Optional[str] = None
+    CLOUDINARY_API_KEY: Optional[int] = None
+    CLOUDINARY_API_SECRET: Optional[str] = None
+
+    AVATAR_STORAGE: str = "cloudinary"
+    AVATAR_LOCAL_DIR: str = "media"
+    AVATAR_LOCAL_URL: str = "/media"
+
+    S3_BUCKET: Optional[str] = None
+    S3_ENDPOINT_URL: Optional[str] = None
+    S3_ACCESS_KEY: Optional[str] = None
+    S3_SECRET_KEY: Optional[str] = None
+    S3_REGION: Optional[str] = None
+    S3_PUBLIC_URL: Optional[str] = None
+
+    RATE_LIMIT_STORAGE_URI: str = "memory://"
+    RATE_LIMIT_STRATEGY: str = "moving-window"
+    RATE_LIMIT_USERS_ME: str = "10/minute"
+    RATE_LIMIT_CONTACTS_READ: str = "120/minute"
+    RATE_LIMIT_CONTACTS_WRITE: str = "30/minute"
+    RATE_LIMIT_AVATAR: str = "5/minute"
+
+    AUTH_THROTTLE_MAX_FAILURES: int = 5
+    AUTH_THROTTLE_MAX_IP_ATTEMPTS: int = 30
+    AUTH_THROTTLE_WINDOW_SECONDS: int = 900
+    AUTH_THROTTLE_BASE_DELAY: float = 1.0
+    AUTH_THROTTLE_MAX_DELAY: float = 900.0
+
+    CACHE_BACKEND: str = "memory"
+    CACHE_REDIS_HOST: str = "localhost"
+    CACHE_REDIS_PORT: int = 6379
+    CACHE_REDIS_DB: int = 0
+    CACHE_REDIS_PASSWORD: Optional[str] = None
+    CACHE_TIMEOUT: float = 0.05
+    CACHE_SERIALIZER: str = "msgpack"
+    CACHE_TTL: int = 300
+    CACHE_FALLBACK: str = "memory"
+    CACHE_BREAKER_FAILURES: int = 3
+    CACHE_BREAKER_RESET_SECONDS: float = 30.0
+    CACHE_LOCK_ENABLED: bool = False
+    CACHE_LOCK_TIMEOUT: float = 2.0
+    CACHE_EARLY_REFRESH_BETA: float = 1.0
+    RESPONSE_CACHE_TTL: int = 0
+
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_LAG_INTERVAL: float = 0.1
+    LOOP_BLOCK_THRESHOLD: float = 0.25
+
+    PROFILER_ENABLED: bool = True
+    PROFILER_INTERVAL: float = 0.001
+    PROFILE_DIR: str = "profiles"
+    PROFILE_MAX_FILES: int = 50
+
+    TRACING_EXPORTER: str = "none"
+    TRACING_FILE: str = "traces.jsonl"
+    TRACING_SAMPLE_RATE: float = 1.0
+
+    BCRYPT_WORKERS: int = 4
+
+    UPLOAD_TIMEOUT_SECONDS: float = 30.0
+    UPLOAD_MAX_CONCURRENCY: int = 4
+
+    AVATAR_SIZE: int = 250
+    AVATAR_FORMAT: str = "WEBP"
+    AVATAR_QUALITY: int = 85
+    AVATAR_MAX_UPLOAD_BYTES: int = 5 * 1024 * 1024
+    AVATAR_MAX_PIXELS: int = 40_000_000
+    AVATAR_PROCESS_WORKERS: int = 2
 
     model_config = ConfigDict(
         extra="ignore", env_file=".env", env_file_encoding="utf-8", case_sensitive=True
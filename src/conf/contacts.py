@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Sequence
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.openapi.models import Contact
@@ -6,6 +6,7 @@ from fastapi.openapi.models import Contact
 from src.entity.models import User
 from src.repository.contacts import ContactRepository
 from src.schemas.contacts import ContactModel
+from src.services.response_cache import invalidate_user_responses
 
 
 class ContactService:
@@ -27,6 +28,7 @@ class ContactService:
         Creates a new contact.
 
         It checks if a contact with the same email or phone number already exists. If such a contact exists, it raises an error.
+        Cached GET responses of the user are invalidated.
 
         Arguments:
             body: data model for creating the contact.
@@ -43,11 +45,21 @@ class ContactService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Contact with '{body.email}' email or '{body.phone}' phone number already exists.",
             )
-        return await self.repository.create_contact(body, user)
+        contact = await self.repository.create_contact(body, user)
+        await invalidate_user_responses(user.id)
+        return contact
 
     async def get_contacts(
-        self, name: str, surname: str, email: str, skip: int, limit: int, user: User
-    ) -> List[Contact]:
+        self,
+        name: str,
+        surname: str,
+        email: str,
+        skip: int,
+        limit: int,
+        user: User,
+        fields: Sequence[str] | None = None,
+        after: int | None = None,
+    ) -> List[dict]:
         """
         Retrieves a list of contacts with the option to filter by parameters.
 
@@ -58,12 +70,15 @@ class ContactService:
             skip: the number of contacts to skip (pagination).
             limit: the maximum number of contacts to retrieve.
             user: the current user to check access to contacts.
+            fields: the fields to retrieve (all fields of ContactResponse by default).
+            after: the ID after which to retrieve contacts (keyset pagination).
 
         Returns:
-            A list of contacts that satisfy the filtering conditions.
+            A list of contacts that satisfy the filtering conditions, ordered by
+            ID, as plain dicts with the requested fields.
         """
         return await self.repository.get_contacts(
-            name, surname, email, skip, limit, user
+            name, surname, email, skip, limit, user, fields, after
         )
 
     async def get_contact(self, contact_id: int, user: User) -> Contact | None:
@@ -93,7 +108,10 @@ class ContactService:
         Returns:
             The updated contact.
         """
-        return await self.repository.update_contact(contact_id, body, user)
+        contact = await self.repository.update_contact(contact_id, body, user)
+        if contact is not None:
+            await invalidate_user_responses(user.id)
+        return contact
 
     async def remove_contact(self, contact_id: int, user: User) -> Contact:
         """
@@ -106,9 +124,12 @@ class ContactService:
         Returns:
             The deleted contact.
         """
-        return await self.repository.remove_contact(contact_id, user)
+        contact = await self.repository.remove_contact(contact_id, user)
+        if contact is not None:
+            await invalidate_user_responses(user.id)
+        return contact
 
-    async def get_upcoming_birthdays(self, days: int, user: User) -> List[Contact]:
+    async def get_upcoming_birthdays(self, days: int, user: User) -> List[dict]:
         """
         Retrieves a list of contacts with upcoming birthdays (by number of days).
 
@@ -117,6 +138,7 @@ class ContactService:
             user: the current user to check access to the contacts.
 
         Returns:
-            A list of contacts with upcoming birthdays.
+            A list of contacts with upcoming birthdays, as plain dicts with
+            the fields of ContactResponse.
         """
         return await self.repository.get_upcoming_birthdays(days, user)
@@ -1,27 +1,66 @@
+import inspect
+import logging
+from functools import lru_cache
 from pathlib import Path
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
-from fastapi_mail.errors import ConnectionErrors
+from fastapi import BackgroundTasks
 from pydantic import EmailStr
 
 from src.services.auth import create_email_token
 from src.conf.config import settings
+from src.services.metrics import EMAIL_BACKLOG, EMAILS_SENT
+from src.services.tracing import traced
 
-# Configuration settings for connecting to the email server.
-conf = ConnectionConfig(
-    MAIL_USERNAME=settings.MAIL_USERNAME,
-    MAIL_PASSWORD=settings.MAIL_PASSWORD,
-    MAIL_FROM=settings.MAIL_FROM,
-    MAIL_PORT=settings.MAIL_PORT,
-    MAIL_SERVER=settings.MAIL_SERVER,
-    MAIL_FROM_NAME=settings.MAIL_FROM_NAME,
-    MAIL_STARTTLS=settings.MAIL_STARTTLS,
-    MAIL_SSL_TLS=settings.MAIL_SSL_TLS,
-    USE_CREDENTIALS=settings.USE_CREDENTIALS,
-    VALIDATE_CERTS=settings.VALIDATE_CERTS,
-    TEMPLATE_FOLDER=Path(__file__).parent / "templates",
-)
+logger = logging.getLogger("email")
 
 
+@lru_cache
+def get_mail_config():
+    """
+    Returns the configuration settings for connecting to the email server.
+
+    fastapi_mail (with httpx and jinja2) is imported on first use, not when
+    the application starts.
+    """
+    from fastapi_mail import ConnectionConfig
+
+    return ConnectionConfig(
+        MAIL_USERNAME=settings.MAIL_USERNAME,
+        MAIL_PASSWORD=settings.MAIL_PASSWORD,
+        MAIL_FROM=settings.MAIL_FROM,
+        MAIL_PORT=settings.MAIL_PORT,
+        MAIL_SERVER=settings.MAIL_SERVER,
+        MAIL_FROM_NAME=settings.MAIL_FROM_NAME,
+        MAIL_STARTTLS=settings.MAIL_STARTTLS,
+        MAIL_SSL_TLS=settings.MAIL_SSL_TLS,
+        USE_CREDENTIALS=settings.USE_CREDENTIALS,
+        VALIDATE_CERTS=settings.VALIDATE_CERTS,
+        TEMPLATE_FOLDER=Path(__file__).parent / "templates",
+    )
+
+
+def queue_email(background_tasks: BackgroundTasks, send, *args, **kwargs) -> None:
+    """
+    Schedules an email to be sent after the response, counting it in the email backlog.
+
+    Arguments:
+        background_tasks: The background tasks of the request.
+        send: The function sending the email.
+        args, kwargs: The arguments of the function.
+    """
+
+    async def task():
+        try:
+            result = send(*args, **kwargs)
+            if inspect.isawaitable(result):
+                await result
+        finally:
+            EMAIL_BACKLOG.dec()
+
+    EMAIL_BACKLOG.inc()
+    background_tasks.add_task(task)
+
+
+@traced("email.send_confirm_email")
 async def send_confirm_email(to_email: EmailStr, username: str, host: str) -> None:
     """
     Sends an email to confirm the email address.
@@ -37,6 +76,9 @@ async def send_confirm_email(to_email: EmailStr, username: str, host: str) -> No
     Raises:
         ConnectionErrors: If an error occurs while connecting to the email server.
     """
+    from fastapi_mail import FastMail, MessageSchema, MessageType
+    from fastapi_mail.errors import ConnectionErrors
+
     try:
         # Creates a token for email verification.
         token_verification = create_email_token({"sub": to_email})
@@ -53,12 +95,15 @@ async def send_confirm_email(to_email: EmailStr, username: str, host: str) -> No
         )
 
         # Initializes FastMail and sends the message.
-        fm = FastMail(conf)
+        fm = FastMail(get_mail_config())
         await fm.send_message(message, template_name="verify_email.html")
+        EMAILS_SENT.labels("sent").inc()
     except ConnectionErrors as err:
-        print(err)
+        EMAILS_SENT.labels("failed").inc()
+        logger.error(f"Cannot send email: {err}", extra={"to_email": to_email})
 
 
+@traced("email.send_reset_password_email")
 async def send_reset_password_email(
     to_email: EmailStr, username: str, host: str, reset_token: str
 ) -> None:
@@ -77,6 +122,9 @@ async def send_reset_password_email(
     Raises:
         ConnectionErrors: If an error occurs while connecting to the email server.
     """
+    from fastapi_mail import FastMail, MessageSchema, MessageType
+    from fastapi_mail.errors import ConnectionErrors
+
     try:
         # Composes a password reset link.
         reset_link = f"{host}api/auth/confirm_reset_password/{reset_token}"
@@ -91,7 +139,9 @@ async def send_reset_password_email(
         )
 
         # Initializes FastMail and sends the message.
-        fm = FastMail(conf)
+        fm = FastMail(get_mail_config())
         await fm.send_message(message, template_name="reset_password.html")
+        EMAILS_SENT.labels("sent").inc()
     except ConnectionErrors as err:
-        print(err)
+        EMAILS_SENT.labels("failed").inc()
+        logger.error(f"Cannot send email: {err}", extra={"to_email": to_email})
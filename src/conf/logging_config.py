@@ -0,0 +1,221 @@
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from src.conf.config import settings
+
+access_logger = logging.getLogger("access")
+
+# Context of the current request: request_id, user_id and start time.
+_log_context: ContextVar[dict | None] = ContextVar("log_context", default=None)
+
+# Attributes of every LogRecord; anything else was passed in `extra`.
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+_listener: QueueListener | None = None
+
+
+def bind_log_context(**values) -> None:
+    """
+    Adds values (e.g. user_id) to the log context of the current request.
+    """
+    context = _log_context.get()
+    if context is not None:
+        context.update(values)
+
+
+class ContextFilter(logging.Filter):
+    """
+    Adds the request ID, user ID, trace ID and time since the request start to log records.
+
+    Runs in the thread that logs, before the record is queued.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _log_context.get()
+        if context is not None:
+            record.request_id = context["request_id"]
+            record.user_id = context.get("user_id")
+            if "trace_id" in context:
+                record.trace_id = context["trace_id"]
+            elapsed = time.perf_counter() - context["started"]
+            record.elapsed_ms = round(elapsed * 1000, 2)
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    def __init__(self, rates: dict[str, float]):
+        """
+        Keeps only a share of DEBUG and INFO records of high-volume loggers.
+
+        Warnings and errors are always kept.
+
+        Arguments:
+            rates: The share of records kept (0 to 1) by logger name.
+        """
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(record.name)
+        return rate is None or random.random() < rate
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats log records as one JSON object per line.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Queue handler that drops records instead of blocking when the queue is full.
+    """
+
+    dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolves the message and exception before queuing (arguments may change
+        # later) and keeps the `extra` fields for the formatter.
+        record = copy.copy(record)
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            DroppingQueueHandler.dropped += 1
+
+
+def setup_logging() -> None:
+    """
+    Routes all logging through a queue to a background listener thread.
+
+    Application threads only put records to a bounded queue; the listener
+    formats them (JSON or text, LOG_FORMAT) and writes them to stdout. Records
+    of loggers listed in LOG_SAMPLE_RATES are sampled. Calling it again has no effect.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+        )
+
+    log_queue: queue.Queue = queue.Queue(settings.LOG_QUEUE_SIZE)
+    queue_handler = DroppingQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_RATES))
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(settings.LOG_LEVEL)
+    # Uvicorn's loggers go through the same pipeline.
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        logging.getLogger(name).handlers = []
+        logging.getLogger(name).propagate = True
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """
+    Writes the queued records and stops the listener thread.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class RequestContextMiddleware:
+    def __init__(self, app):
+        """
+        ASGI middleware binding a request ID to all log records of a request.
+
+        The ID is taken from the X-Request-ID header or generated, and returned in
+        the X-Request-ID response header. Each request is logged to the `access`
+        logger with its status and duration.
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        context = {
+            "request_id": request_id or uuid.uuid4().hex,
+            "user_id": None,
+            "started": time.perf_counter(),
+        }
+        _log_context.set(context)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-request-id", context["request_id"].encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            access_logger.info(
+                f"{scope['method']} {scope['path']} {status_code}",
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status_code,
+                    "duration_ms": round(
+                        (time.perf_counter() - context["started"]) * 1000, 2
+                    ),
+                },
+            )
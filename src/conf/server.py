@@ -0,0 +1,141 @@
+import logging
+import math
+import os
+import shutil
+import tempfile
+
+from src.conf.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def cgroup_cpu_limit(root: str = "/sys/fs/cgroup") -> float | None:
+    """
+    Returns the CPU quota of the process cgroup in CPUs, or None if it is unlimited.
+
+    Reads cpu.max of cgroup v2, or cpu.cfs_quota_us and cpu.cfs_period_us of
+    cgroup v1, as mounted in containers.
+    """
+    try:
+        with open(os.path.join(root, "cpu.max")) as f:
+            quota, period = f.read().split()
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open(os.path.join(root, "cpu", "cpu.cfs_quota_us")) as f:
+            quota = int(f.read())
+        with open(os.path.join(root, "cpu", "cpu.cfs_period_us")) as f:
+            period = int(f.read())
+        return None if quota <= 0 else quota / period
+    except (OSError, ValueError):
+        return None
+
+
+def available_cpus() -> int:
+    """
+    Returns the number of CPUs the process may use.
+
+    Unlike os.cpu_count, which reports the CPUs of the host, takes the CPU
+    affinity and the cgroup quota of a container into account.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    limit = cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, math.ceil(limit))
+    return max(1, cpus)
+
+
+def worker_count() -> int:
+    """
+    Returns the number of worker processes: SERVER_WORKERS, or one per available
+    CPU if it is 0.
+    """
+    return settings.SERVER_WORKERS or available_cpus()
+
+
+def prepare_metrics_dir(workers: int) -> None:
+    """
+    Gives the workers an empty shared directory for multiprocess metrics.
+
+    Uses PROMETHEUS_MULTIPROC_DIR if set, or a new temporary directory. Files
+    left by a previous run are removed, as they would be aggregated with the
+    new values. A single worker keeps the in-process registry.
+    """
+    if workers < 2:
+        return
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path is None:
+        path = tempfile.mkdtemp(prefix="prometheus-")
+    else:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+    # Inherited by the worker processes, which read it at import.
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = path
+
+
+def uvicorn_options(production: bool) -> dict:
+    """
+    Builds the keyword arguments of uvicorn.run.
+
+    In development the server reloads on code changes in a single process. In
+    production it runs SERVER_WORKERS processes with uvloop and httptools,
+    tuned keep-alive and backlog, a bounded graceful shutdown on SIGTERM and
+    recycling of workers after SERVER_MAX_REQUESTS requests.
+
+    Arguments:
+        production: whether to build the production configuration.
+
+    Returns:
+        Options for uvicorn.run("main:app", **options).
+    """
+    options = {
+        "host": settings.SERVER_HOST,
+        "port": settings.SERVER_PORT,
+        # Logging is configured by the application (setup_logging).
+        "log_config": None,
+    }
+    if not production:
+        return {**options, "reload": True}
+    return {
+        **options,
+        "workers": worker_count(),
+        "loop": "uvloop",
+        "http": "httptools",
+        # Requests are logged by RequestContextMiddleware.
+        "access_log": False,
+        "timeout_keep_alive": settings.SERVER_KEEP_ALIVE,
+        "backlog": settings.SERVER_BACKLOG,
+        # On SIGTERM, stops accepting connections and waits for running requests.
+        "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_TIMEOUT,
+        # A worker exits after this many requests and the supervisor replaces it.
+        "limit_max_requests": settings.SERVER_MAX_REQUESTS or None,
+        "proxy_headers": True,
+        "forwarded_allow_ips": settings.SERVER_FORWARDED_ALLOW_IPS,
+    }
+
+
+def run(production: bool = False) -> None:
+    """
+    Starts the server.
+
+    Called from main.py, after the application was imported by the launcher
+    process: configuration and import errors stop the launch before any
+    worker starts.
+
+    Arguments:
+        production: whether to start the production server.
+    """
+    import uvicorn
+
+    options = uvicorn_options(production)
+    if production:
+        prepare_metrics_dir(options["workers"])
+        logger.info(
+            f"Starting {options['workers']} workers on "
+            f"{options['host']}:{options['port']}"
+        )
+    uvicorn.run("main:app", **options)
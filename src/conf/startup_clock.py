@@ -0,0 +1,10 @@
+import time
+
+# Start of the application import, for the startup time measurement.
+#
+# main.py imports this module first. uvicorn starts production workers with the
+# spawn method, which executes main.py twice in each worker: as __mp_main__ when
+# the process starts, then as main when uvicorn loads the application. This
+# module is only executed by the first import, so the time also covers the
+# dependencies imported by the first execution.
+IMPORT_STARTED = time.perf_counter()
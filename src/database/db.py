@@ -1,4 +1,6 @@
+import asyncio
 import contextlib
+from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
@@ -7,6 +9,8 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from src.conf.config import settings
+from src.database.instrumentation import instrument_engine
+from src.services.metrics import instrument_pool
 
 
 class DatabaseSessionManager:
@@ -14,13 +18,17 @@ class DatabaseSessionManager:
     Class for managing asynchronous database sessions.
 
     This class creates an asynchronous engine and session maker for working with the database.
+    Both are created on first use, so importing the application does not load
+    the database driver.
 
     Attributes:
-    - _engine (AsyncEngine): Asynchronous engine for connecting to the database.
+    - engine (AsyncEngine): Asynchronous engine for connecting to the database.
     - _session_maker (async_sessionmaker): Factory for creating sessions.
 
     Methods:
     - session: Context manager for working with a database session.
+    - warmup: Opens pool connections ahead of the first requests.
+    - dispose: Closes all pool connections.
 
     Usage example:
     ```
@@ -28,27 +36,70 @@ class DatabaseSessionManager:
 
     def __init__(self, url: str):
         """
-        Initializes the engine and session factory for the database.
+        Initializes the manager for the database.
 
         Parameters:
         - url (str): URL for connecting to the database.
         """
-        self._engine: AsyncEngine = create_async_engine(url)
-        self._session_maker: async_sessionmaker = async_sessionmaker(
+        self._url = url
+        self._engine: AsyncEngine | None = None
+        self._session_maker: async_sessionmaker | None = None
+
+    def _create_engine(self) -> None:
+        """
+        Creates the engine and the session factory.
+        """
+        self._engine = create_async_engine(self._url)
+        # Records the count and timing of statements per request.
+        instrument_engine(self._engine)
+        instrument_pool(self._engine)
+        self._session_maker = async_sessionmaker(
             autoflush=False, autocommit=False, bind=self._engine
         )
 
+    @property
+    def engine(self) -> AsyncEngine:
+        """
+        Returns the engine, creating it on first use.
+        """
+        if self._engine is None:
+            self._create_engine()
+        return self._engine
+
+    async def warmup(self, connections: int) -> None:
+        """
+        Opens connections at once, so the pool keeps them for the first requests.
+
+        Parameters:
+        - connections (int): Number of connections to open; the pool keeps up to
+          its pool_size (5 by default) of them.
+        """
+        async with contextlib.AsyncExitStack() as stack:
+            opened = await asyncio.gather(
+                *[
+                    stack.enter_async_context(self.engine.connect())
+                    for _ in range(connections)
+                ]
+            )
+            await asyncio.gather(*[conn.execute(text("SELECT 1")) for conn in opened])
+
+    async def dispose(self) -> None:
+        """
+        Closes all pool connections, e.g. on shutdown.
+        """
+        if self._engine is not None:
+            await self._engine.dispose()
+
     @contextlib.asynccontextmanager
     async def session(self):
         """
         Context manager for creating and managing a database session.
 
         Raises:
-        - Exception: If the session factory is not initialized.
         - SQLAlchemyError: If an error occurs while working with the session.
         """
         if self._session_maker is None:
-            raise Exception("Database session is not initialized")
+            self._create_engine()
         session = self._session_maker()
         try:
             yield session
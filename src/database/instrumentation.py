@@ -0,0 +1,176 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.conf.config import settings
+from src.services.metrics import DB_QUERIES_PER_REQUEST, DB_TIME_PER_REQUEST
+
+logger = logging.getLogger("sql")
+
+# Totals over all requests of this worker.
+query_metrics: Counter = Counter()
+
+
+@dataclass
+class QueryStats:
+    """
+    SQL statistics of one request.
+
+    Attributes:
+    - count: Number of executed statements.
+    - total_time: Total execution time in seconds.
+    - slowest_time: Execution time of the slowest statement in seconds.
+    - slowest_statement: SQL of the slowest statement.
+    - statements: Number of executions of each distinct statement.
+    """
+
+    count: int = 0
+    total_time: float = 0.0
+    slowest_time: float = 0.0
+    slowest_statement: str | None = None
+    statements: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_time += elapsed
+        self.statements[statement] += 1
+        if elapsed > self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """
+        Returns statements executed at least `threshold` times (likely N+1 queries).
+        """
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def start_query_stats() -> QueryStats:
+    """
+    Starts collecting SQL statistics for the current request.
+    """
+    stats = QueryStats()
+    _query_stats.set(stats)
+    return stats
+
+
+def get_query_stats() -> QueryStats | None:
+    """
+    Returns SQL statistics of the current request (None outside of a request).
+    """
+    return _query_stats.get()
+
+
+def explain(connection, statement: str, parameters) -> list | None:
+    """
+    Returns the query plan of a SELECT statement, or None if it cannot be built.
+
+    The plan is read with a separate DBAPI cursor, so the results of the
+    original statement are not affected. It runs on the connection of the
+    request, under a savepoint: a failing EXPLAIN is rolled back to it, so it
+    does not abort the transaction of the request on PostgreSQL.
+    """
+    if not statement.lstrip().upper().startswith("SELECT"):
+        return None
+    prefix = "EXPLAIN QUERY PLAN " if connection.dialect.name == "sqlite" else "EXPLAIN "
+    try:
+        cursor = connection.connection.cursor()
+        try:
+            cursor.execute("SAVEPOINT explain_slow_query")
+            try:
+                cursor.execute(prefix + statement, parameters)
+                return cursor.fetchall()
+            except Exception:
+                cursor.execute("ROLLBACK TO SAVEPOINT explain_slow_query")
+                raise
+            finally:
+                cursor.execute("RELEASE SAVEPOINT explain_slow_query")
+        finally:
+            cursor.close()
+    except Exception as e:
+        logger.warning(f"Cannot explain slow query: {e!r}")
+        return None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    query_metrics["queries"] += 1
+    query_metrics["time_ms"] += elapsed * 1000
+
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+    if elapsed * 1000 >= settings.SQL_SLOW_QUERY_MS:
+        query_metrics["slow_queries"] += 1
+        plan = explain(conn, statement, parameters) if settings.SQL_EXPLAIN_SLOW else None
+        logger.warning(
+            f"Slow query ({elapsed * 1000:.1f} ms): {statement}"
+            + (f"\nPlan: {plan}" if plan else "")
+        )
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Registers event hooks recording the count and timing of executed statements.
+    """
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app):
+        """
+        ASGI middleware collecting SQL statistics per HTTP request.
+
+        Records the statement count and database time of each request by route
+        in Prometheus and logs repeated statements (likely N+1 queries). With
+        DEBUG enabled, adds X-DB-Query-Count, X-DB-Time-Ms and X-DB-Slowest-Ms
+        response headers.
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = start_query_stats()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                if settings.DEBUG:
+                    headers = list(message.get("headers", []))
+                    headers += [
+                        (b"x-db-query-count", str(stats.count).encode()),
+                        (b"x-db-time-ms", f"{stats.total_time * 1000:.2f}".encode()),
+                        (b"x-db-slowest-ms", f"{stats.slowest_time * 1000:.2f}".encode()),
+                    ]
+                    message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            query_metrics["requests"] += 1
+            route = getattr(scope.get("route"), "path", "unmatched")
+            DB_QUERIES_PER_REQUEST.labels(route).observe(stats.count)
+            DB_TIME_PER_REQUEST.labels(route).observe(stats.total_time)
+            for statement, count in stats.repeated(settings.SQL_N_PLUS_ONE_THRESHOLD):
+                query_metrics["n_plus_one"] += 1
+                logger.warning(
+                    f"Statement executed {count} times in {scope['method']} "
+                    f"{scope['path']} (possible N+1): {statement}"
+                )
@@ -0,0 +1,73 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from src.entity.models import UserRole
+
+# Version of the cached layout. Bump it whenever the fields below change:
+# entries with another version are treated as cache misses.
+USER_SNAPSHOT_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class UserSnapshot:
+    """
+    Read-only copy of a user row, used for cached users.
+
+    Unlike an ORM instance it carries no session state, lazy relationships
+    or password hash, and it cannot be changed or flushed by accident.
+
+    Attributes:
+    - id: Primary key.
+    - username: Unique username.
+    - email: Unique email address.
+    - avatar: URL of the user's avatar.
+    - confirmed: Whether the user is confirmed.
+    - role: User role (USER or ADMIN).
+    - created_at: Record creation date.
+    """
+
+    id: int
+    username: str
+    email: str
+    avatar: str | None
+    confirmed: bool
+    role: UserRole
+    created_at: datetime | None
+
+
+def dump_user(user) -> list:
+    """
+    Projects a user (ORM instance or snapshot) to a compact list of plain values.
+
+    The result can be encoded with msgpack or JSON.
+    """
+    return [
+        USER_SNAPSHOT_VERSION,
+        user.id,
+        user.username,
+        user.email,
+        user.avatar,
+        bool(user.confirmed),
+        UserRole(user.role).value,
+        user.created_at.isoformat() if user.created_at else None,
+    ]
+
+
+def load_user(data) -> UserSnapshot | None:
+    """
+    Rehydrates a user snapshot from `dump_user` output.
+
+    Returns None if the data has another layout version.
+    """
+    if not isinstance(data, (list, tuple)) or not data or data[0] != USER_SNAPSHOT_VERSION:
+        return None
+    _, id, username, email, avatar, confirmed, role, created_at = data
+    return UserSnapshot(
+        id=id,
+        username=username,
+        email=email,
+        avatar=avatar,
+        confirmed=confirmed,
+        role=UserRole(role),
+        created_at=datetime.fromisoformat(created_at) if created_at else None,
+    )
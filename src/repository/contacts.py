@@ -1,39 +1,72 @@
 from datetime import date, timedelta
-from typing import List
-from sqlalchemy import select, func, and_, or_
+from typing import List, Sequence
+from sqlalchemy import Result, select, func, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.entity.models import Contact, User
-from src.schemas.contacts import ContactModel
+from src.schemas.contacts import ContactModel, ContactResponse
+from src.services.tracing import trace_methods
 
+# Columns of a contact in responses. Read-only listings select them as plain
+# rows: no ORM entities are built, tracked in the session or given relationships.
+CONTACT_COLUMNS = [getattr(Contact, name) for name in ContactResponse.model_fields]
 
+
+def as_dicts(result: Result) -> List[dict]:
+    """
+    Returns the rows of a result as dicts, which pydantic validates without the
+    attribute lookups of Row objects.
+    """
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result.all()]
+
+
+@trace_methods("repository.contacts")
 class ContactRepository:
     def __init__(self, session: AsyncSession):
         self.db = session
 
     async def get_contacts(
-        self, name: str, surname: str, email: str, skip: int, limit: int, user: User
-    ) -> List[Contact]:
+        self,
+        name: str,
+        surname: str,
+        email: str,
+        skip: int,
+        limit: int,
+        user: User,
+        fields: Sequence[str] | None = None,
+        after: int | None = None,
+    ) -> List[dict]:
         """
-        Get the list of a user's contacts with filtering options.
+        Get the list of a user's contacts with filtering options, as plain dicts.
+
+        Only the given fields are selected (all response fields by default).
+        Contacts are ordered by ID; `after` returns the ones following that ID
+        (keyset pagination).
         """
+        columns = (
+            [getattr(Contact, field) for field in fields] if fields else CONTACT_COLUMNS
+        )
         stmt = (
-            select(Contact)
-            .filter_by(user=user)
+            select(*columns)
+            .filter_by(user_id=user.id)
             .where(Contact.name.contains(name))
             .where(Contact.surname.contains(surname))
             .where(Contact.email.contains(email))
+            .order_by(Contact.id)
             .offset(skip)
             .limit(limit)
         )
+        if after is not None:
+            stmt = stmt.where(Contact.id > after)
         contacts = await self.db.execute(stmt)
-        return contacts.scalars().all()
+        return as_dicts(contacts)
 
     async def get_contact_by_id(self, contact_id: int, user: User) -> Contact | None:
         """
         Get a contact by ID, associated with a specific user.
         """
-        stmt = select(Contact).filter_by(id=contact_id, user=user)
+        stmt = select(Contact).filter_by(id=contact_id, user_id=user.id)
         contact = await self.db.execute(stmt)
         return contact.scalar_one_or_none()
 
@@ -41,7 +74,7 @@ class ContactRepository:
         """
         Create a new contact for a user.
         """
-        contact = Contact(**body.model_dump(exclude_unset=True), user=user)
+        contact = Contact(**body.model_dump(exclude_unset=True), user_id=user.id)
         self.db.add(contact)
         await self.db.commit()
         await self.db.refresh(contact)
@@ -77,22 +110,22 @@ class ContactRepository:
         """
         query = (
             select(Contact)
-            .filter_by(user=user)
+            .filter_by(user_id=user.id)
             .where((Contact.email == email) | (Contact.phone == phone))
         )
         result = await self.db.execute(query)
         return result.scalars().first() is not None
 
-    async def get_upcoming_birthdays(self, days: int, user: User) -> List[Contact]:
+    async def get_upcoming_birthdays(self, days: int, user: User) -> List[dict]:
         """
-        Get a list of contacts with upcoming birthdays.
+        Get a list of contacts with upcoming birthdays, as plain dicts.
         """
         today = date.today()
         end_date = today + timedelta(days=days)
 
         query = (
-            select(Contact)
-            .filter_by(user=user)
+            select(*CONTACT_COLUMNS)
+            .filter_by(user_id=user.id)
             .where(
                 or_(
                     func.date_part("day", Contact.birthday).between(
@@ -113,4 +146,4 @@ class ContactRepository:
         )
 
         result = await self.db.execute(query)
-        return result.scalars().all()
+        return as_dicts(result)
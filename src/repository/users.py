@@ -3,8 +3,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.entity.models import User
 from src.schemas.user import UserCreate
+from src.services.tracing import trace_methods
 
 
+@trace_methods("repository.users")
 class UserRepository:
     def __init__(self, session: AsyncSession):
         self.db = session
@@ -47,7 +49,7 @@ class UserRepository:
         await self.db.refresh(user)
         return user
 
-    async def confirmed_email(self, email: str) -> None:
+    async def confirmed_email(self, email: str) -> User | None:
         """
         Confirm a user's email.
         """
@@ -55,6 +57,8 @@ class UserRepository:
         if user:
             user.confirmed = True
             await self.db.commit()
+            await self.db.refresh(user)
+        return user
 
     async def update_avatar_url(self, email: str, url: str) -> User:
         """
@@ -3,13 +3,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordRequestForm
 
 from src.schemas.user import UserCreate, Token, User, RequestEmail, ResetPassword
-from src.conf.email import send_confirm_email, send_reset_password_email
+from src.conf.email import queue_email, send_confirm_email, send_reset_password_email
 from src.services.auth import (
     create_access_token,
     Hash,
     get_email_from_token,
     get_password_from_token,
 )
+from src.services.throttle import ThrottleGuard, auth_throttle
 from src.services.users import UserService
 from src.database.db import get_db
 
@@ -21,6 +22,7 @@ async def register_user(
     user_data: UserCreate,
     background_tasks: BackgroundTasks,
     request: Request,
+    guard: ThrottleGuard = Depends(auth_throttle("register")),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -30,6 +32,7 @@ async def register_user(
         - user_data (UserCreate): Data of the new user.
         - background_tasks (BackgroundTasks): Object for executing background tasks.
         - request (Request): Request for obtaining the base URL.
+        - guard (ThrottleGuard): Throttling of attempts by client IP and email.
         - db (AsyncSession): Database session.
 
         Returns:
@@ -37,7 +40,9 @@ async def register_user(
 
         Raises:
         - HTTPException (409): If a user with the same email or username already exists.
+        - HTTPException (429): If there were too many attempts.
     """
+    await guard.check_account(user_data.email, count_attempt=True)
     user_service = UserService(db)
     email_user = await user_service.get_user_by_email(user_data.email)
     if email_user:
@@ -52,23 +57,30 @@ async def register_user(
             status_code=status.HTTP_409_CONFLICT,
             detail="A user with this name already exists.",
         )
-    user_data.password = Hash().get_password_hash(user_data.password)
+    user_data.password = await Hash().get_password_hash_async(user_data.password)
     new_user = await user_service.create_user(user_data)
-    background_tasks.add_task(
-        send_confirm_email, new_user.email, new_user.username, request.base_url
+    queue_email(
+        background_tasks,
+        send_confirm_email,
+        new_user.email,
+        new_user.username,
+        request.base_url,
     )
     return new_user
 
 
 @router.post("/login", response_model=Token)
 async def login_user(
-    form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    guard: ThrottleGuard = Depends(auth_throttle("login", failures_only=True)),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     User authorization.
 
     Parameters:
     - form_data (OAuth2PasswordRequestForm): Data for authorization.
+    - guard (ThrottleGuard): Throttling of attempts by client IP and username.
     - db (AsyncSession): Database session.
 
     Returns:
@@ -76,10 +88,15 @@ async def login_user(
 
     Raises:
     - HTTPException (401): If the login or password is incorrect, or the email is not verified.
+    - HTTPException (429): If there were too many attempts.
     """
+    await guard.check_account(form_data.username)
     user_service = UserService(db)
     user = await user_service.get_user_by_username(form_data.username)
-    if not user or not Hash().verify_password(form_data.password, user.hashed_password):
+    if not user or not await Hash().verify_password_async(
+        form_data.password, user.hashed_password
+    ):
+        await guard.failed()
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Wrong email or password",
@@ -90,6 +107,7 @@ async def login_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Email not verified.",
         )
+    await guard.succeeded()
     access_token = await create_access_token(data={"sub": user.username})
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -146,8 +164,12 @@ async def request_email(
     if user and user.confirmed:
         return {"message": "Your email is already confirmed"}
     if user:
-        background_tasks.add_task(
-            send_confirm_email, user.email, user.username, request.base_url
+        queue_email(
+            background_tasks,
+            send_confirm_email,
+            user.email,
+            user.username,
+            request.base_url,
         )
     return {"message": "Check your email for confirmation."}
 
@@ -157,6 +179,7 @@ async def reset_password_request(
     body: ResetPassword,
     background_tasks: BackgroundTasks,
     request: Request,
+    guard: ThrottleGuard = Depends(auth_throttle("reset_password")),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -166,6 +189,7 @@ async def reset_password_request(
     - body (ResetPassword): Data for the request (email and new password).
     - background_tasks (BackgroundTasks): Object for executing background tasks.
     - request (Request): Request for obtaining the base URL.
+    - guard (ThrottleGuard): Throttling of attempts by client IP and email.
     - db (AsyncSession): Database session.
 
     Returns:
@@ -173,7 +197,9 @@ async def reset_password_request(
 
     Raises:
     - HTTPException (400): If the email is not verified.
+    - HTTPException (429): If there were too many attempts.
     """
+    await guard.check_account(body.email, count_attempt=True)
     user_service = UserService(db)
     user = await user_service.get_user_by_email(body.email)
     if not user:
@@ -183,11 +209,12 @@ async def reset_password_request(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Your email is not verified.",
         )
-    hashed_password = Hash().get_password_hash(body.password)
+    hashed_password = await Hash().get_password_hash_async(body.password)
     reset_token = await create_access_token(
         data={"sub": user.email, "password": hashed_password}
     )
-    background_tasks.add_task(
+    queue_email(
+        background_tasks,
         send_reset_password_email,
         to_email=body.email,
         username=user.username,
@@ -1,18 +1,63 @@
 from typing import List
-from fastapi import APIRouter, HTTPException, Depends, status, Query
+from fastapi import APIRouter, HTTPException, Depends, Request, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.db import get_db
 from src.schemas.contacts import ContactModel, ContactResponse
 from src.schemas.user import User
+from src.conf.config import settings
+from src.services.limiter import limiter
 from src.services.auth import get_current_user
+from src.services.response_cache import cache_response
+from src.services.serialization import serialize_response
 from src.conf.contacts import ContactService
 
 router = APIRouter(prefix="/contacts", tags=["contacts"])
 
 
+def contact_fields(
+    fields: str | None = Query(
+        default=None,
+        description="Comma-separated fields to return, e.g. `id,name,surname,phone`. "
+        "The id is always returned.",
+    ),
+) -> tuple[str, ...] | None:
+    """
+    Parses the sparse fieldset of contact responses.
+
+    Parameters:
+    - fields (str): Comma-separated names of ContactResponse fields (optional).
+
+    Returns:
+    - tuple[str, ...] | None: The requested fields and the id, in the order of
+      ContactResponse, or None for all fields.
+
+    Raises:
+    - HTTPException (422): If a field is unknown.
+    """
+    if not fields:
+        return None
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - ContactResponse.model_fields.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}. "
+            f"Available fields: {', '.join(ContactResponse.model_fields)}.",
+        )
+    # The id is the cursor of keyset pagination.
+    return tuple(
+        field
+        for field in ContactResponse.model_fields
+        if field == "id" or field in requested
+    )
+
+
 @router.get("/birthdays", response_model=List[ContactResponse])
+@limiter.limit(settings.RATE_LIMIT_CONTACTS_READ)
+@cache_response(List[ContactResponse])
 async def get_upcoming_birthdays(
+    request: Request,
     days: int = Query(default=7, ge=1),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -20,7 +65,11 @@ async def get_upcoming_birthdays(
     """
     Getting a list of contacts with birthdays within the specified number of days.
 
+    Limits:
+    - No more than RATE_LIMIT_CONTACTS_READ requests (120 per minute by default).
+
     Parameters:
+    - request (Request): The request, used as the response cache key and to track the limit.
     - days (int): Number of days for the search (minimum 1).
     - db (AsyncSession): Database session.
     - user (User): The currently authorized user.
@@ -33,39 +82,60 @@ async def get_upcoming_birthdays(
 
 
 @router.get("/", response_model=List[ContactResponse])
+@limiter.limit(settings.RATE_LIMIT_CONTACTS_READ)
+@cache_response(List[ContactResponse], sparse=True)
 async def get_contacts(
+    request: Request,
     name: str = "",
     surname: str = "",
     email: str = "",
     skip: int = 0,
     limit: int = 100,
+    after: int | None = None,
+    fields: tuple[str, ...] | None = Depends(contact_fields),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
     """
     Searching contacts by filters.
 
+    Contacts are ordered by ID. For keyset pagination, pass the ID of the last
+    contact of a page as `after` to get the next one.
+
+    Limits:
+    - No more than RATE_LIMIT_CONTACTS_READ requests (120 per minute by default).
+
     Parameters:
+    - request (Request): The request, used as the response cache key and to track the limit.
     - name (str): Contact's first name (optional).
     - surname (str): Contact's last name (optional).
     - email (str): Contact's email (optional).
     - skip (int): Number of records to skip (default is 0).
     - limit (int): Maximum number of records to return (default is 100).
+    - after (int): ID after which to return contacts (optional).
+    - fields (tuple[str, ...]): Fields to return, parsed by `contact_fields` (optional).
     - db (AsyncSession): Database session.
     - user (User): The currently authorized user.
 
     Returns:
-    - List[ContactResponse]: A list of contacts that match the search criteria.
+    - List[ContactResponse]: A list of contacts that match the search criteria,
+      with only the requested fields if `fields` is given.
+
+    Raises:
+    - HTTPException (422): If `fields` contains an unknown field.
     """
     contact_service = ContactService(db)
     contacts = await contact_service.get_contacts(
-        name, surname, email, skip, limit, user
+        name, surname, email, skip, limit, user, fields=fields, after=after
     )
     return contacts
 
 
 @router.get("/{contact_id}", response_model=ContactResponse)
+@limiter.limit(settings.RATE_LIMIT_CONTACTS_READ)
+@cache_response(ContactResponse)
 async def get_contact(
+    request: Request,
     contact_id: int,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -73,7 +143,11 @@ async def get_contact(
     """
     Getting contact information by its ID.
 
+    Limits:
+    - No more than RATE_LIMIT_CONTACTS_READ requests (120 per minute by default).
+
     Parameters:
+    - request (Request): The request, used as the response cache key and to track the limit.
     - contact_id (int): Contact ID.
     - db (AsyncSession): Database session.
     - user (User): The currently authorized user.
@@ -94,7 +168,10 @@ async def get_contact(
 
 
 @router.post("/", response_model=ContactResponse, status_code=status.HTTP_201_CREATED)
+@limiter.limit(settings.RATE_LIMIT_CONTACTS_WRITE)
+@serialize_response(ContactResponse, status.HTTP_201_CREATED)
 async def create_contact(
+    request: Request,
     body: ContactModel,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -102,7 +179,11 @@ async def create_contact(
     """
     Creating a new contact.
 
+    Limits:
+    - No more than RATE_LIMIT_CONTACTS_WRITE requests (30 per minute by default).
+
     Parameters:
+    - request (Request): HTTP request to track the limit.
     - body (ContactModel): Data of the new contact.
     - db (AsyncSession): Database session.
     - user (User): The currently authorized user.
@@ -115,7 +196,10 @@ async def create_contact(
 
 
 @router.put("/{contact_id}", response_model=ContactResponse)
+@limiter.limit(settings.RATE_LIMIT_CONTACTS_WRITE)
+@serialize_response(ContactResponse)
 async def update_contact(
+    request: Request,
     body: ContactModel,
     contact_id: int,
     db: AsyncSession = Depends(get_db),
@@ -124,7 +208,11 @@ async def update_contact(
     """
     Updating contact information by its ID.
 
+    Limits:
+    - No more than RATE_LIMIT_CONTACTS_WRITE requests (30 per minute by default).
+
     Parameters:
+    - request (Request): HTTP request to track the limit.
     - body (ContactModel): New contact data.
     - contact_id (int): Contact ID.
     - db (AsyncSession): Database session.
@@ -146,7 +234,10 @@ async def update_contact(
 
 
 @router.delete("/{contact_id}", response_model=ContactResponse)
+@limiter.limit(settings.RATE_LIMIT_CONTACTS_WRITE)
+@serialize_response(ContactResponse)
 async def remove_contact(
+    request: Request,
     contact_id: int,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -154,7 +245,11 @@ async def remove_contact(
     """
     Deleting a contact by its ID.
 
+    Limits:
+    - No more than RATE_LIMIT_CONTACTS_WRITE requests (30 per minute by default).
+
     Parameters:
+    - request (Request): HTTP request to track the limit.
     - contact_id (int): Contact ID.
     - db (AsyncSession): Database session.
     - user (User): The currently authorized user.
@@ -1,32 +1,35 @@
-from fastapi import APIRouter, Depends, Request, UploadFile, File
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from fastapi import APIRouter, Depends, Request, Response, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.conf.config import settings
 from src.database.db import get_db
 from src.schemas.user import User
 from src.services.auth import get_current_user, get_current_admin_user
-from src.services.upload_file import UploadFileService
+from src.services.limiter import limiter
+from src.services.upload_file import UploadFileService, get_upload_service
 from src.services.users import UserService
 
 router = APIRouter(prefix="/users", tags=["users"])
-limiter = Limiter(key_func=get_remote_address)
 
 
 @router.get(
-    "/me", response_model=User, description="No more than 10 requests per minute"
+    "/me",
+    response_model=User,
+    description=f"No more than {settings.RATE_LIMIT_USERS_ME} requests",
 )
-@limiter.limit("10 per minute")
-async def me(request: Request, user: User = Depends(get_current_user)):
+@limiter.limit(settings.RATE_LIMIT_USERS_ME)
+async def me(
+    request: Request, response: Response, user: User = Depends(get_current_user)
+):
     """
     Getting information about the currently authorized user.
 
     Limits:
-    - No more than 10 requests per minute.
+    - No more than RATE_LIMIT_USERS_ME requests (10 per minute by default).
 
     Parameters:
     - request (Request): HTTP request to track the limit.
+    - response (Response): HTTP response that receives the rate limit headers.
     - user (User): The currently authorized user.
 
     Returns:
@@ -35,28 +38,39 @@ async def me(request: Request, user: User = Depends(get_current_user)):
     return user
 
 
-@router.patch("/avatar", response_model=User)
+@router.patch(
+    "/avatar",
+    response_model=User,
+    description=f"No more than {settings.RATE_LIMIT_AVATAR} requests",
+)
+@limiter.limit(settings.RATE_LIMIT_AVATAR)
 async def update_avatar_user(
+    request: Request,
+    response: Response,
     file: UploadFile = File(),
     user: User = Depends(get_current_admin_user),
     db: AsyncSession = Depends(get_db),
+    avatar_service: UploadFileService = Depends(get_upload_service),
 ):
     """
     Updating avatar for the current administrator.
 
+    Limits:
+    - No more than RATE_LIMIT_AVATAR requests (5 per minute by default).
+
     Parameters:
+    - request (Request): HTTP request to track the limit.
+    - response (Response): HTTP response that receives the rate limit headers.
     - file (UploadFile): Uploaded avatar file.
     - user (User): The currently authorized administrator.
     - db (AsyncSession): Database session.
+    - avatar_service (UploadFileService): Service for uploading avatars.
 
     Returns:
     - User: Updated user data with the new avatar URL.
     """
-    # Upload ava to cloud
-    avatar_service = UploadFileService(
-        settings.CLD_NAME, settings.CLD_API_KEY, settings.CLD_API_SECRET
-    )
-    avatar_url = avatar_service.upload_file(file, user.username)
+    # Upload ava to storage
+    avatar_url = await avatar_service.upload_file(file, user.avatar)
 
     # Update ava's URL in DB
     user_service = UserService(db)
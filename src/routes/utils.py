@@ -1,10 +1,20 @@
+import logging
+
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse, JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
 from src.database.db import get_db
+from src.database.instrumentation import query_metrics
+from src.schemas.user import User
+from src.services.auth import get_current_admin_user
+from src.services.cache import CacheService, get_cache
+from src.services.health import HealthChecker, get_health_checker
+from src.services.profiler import profile_path
 
 router = APIRouter(tags=["utils"])
+logger = logging.getLogger("healthchecker")
 
 
 @router.get("/healthchecker")
@@ -13,7 +23,8 @@ async def healthchecker(db: AsyncSession = Depends(get_db)):
     Service health check and database connection verification.
 
     This endpoint performs a simple query to the database to check if the database is configured correctly
-    and whether the application can successfully connect to it.
+    and whether the application can successfully connect to it. Probes should use
+    /healthchecker/live and /healthchecker/ready, which do not take a pool connection.
 
     Parameters:
     - db (AsyncSession): Asynchronous database session obtained via dependency.
@@ -40,8 +51,108 @@ async def healthchecker(db: AsyncSession = Depends(get_db)):
 
     except Exception as e:
         # Error logging and returning a failure message.
-        print(e)
+        logger.error(f"Database health check failed: {e!r}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error connecting to the database",
         )
+
+
+@router.get("/healthchecker/live")
+async def liveness():
+    """
+    Liveness probe: answers as long as the worker's event loop serves requests.
+
+    It never touches the database, cache or mail server, so failing dependencies
+    do not get a healthy worker restarted.
+
+    Returns:
+    - dict: {"status": "alive"}.
+    """
+    return {"status": "alive"}
+
+
+@router.get("/healthchecker/ready")
+async def readiness(checker: HealthChecker = Depends(get_health_checker)):
+    """
+    Readiness probe: the last results of the background dependency checks.
+
+    The DB, cache and mail server are checked every HEALTH_CHECK_INTERVAL seconds
+    by a background task; the probe only reads the results, so probe traffic
+    never takes pool connections.
+
+    Parameters:
+    - checker (HealthChecker): The background dependency checker.
+
+    Returns:
+    - dict: Readiness status, age of the results and status, latency and error of each check.
+
+    Error cases:
+    - 503 SERVICE_UNAVAILABLE: The database is down, the results are stale, or
+      the first checks have not finished yet.
+    """
+    report = checker.report()
+    status_code = (
+        status.HTTP_200_OK
+        if report["status"] == "ready"
+        else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+    return JSONResponse(report, status_code=status_code)
+
+
+@router.get("/healthchecker/cache")
+async def cache_healthchecker(cache: CacheService = Depends(get_cache)):
+    """
+    Cache health check and cache metrics.
+
+    Parameters:
+    - cache (CacheService): The application cache.
+
+    Returns:
+    - dict: Backend status, latency of the check, hit/miss/error counters and circuit state.
+    """
+    return await cache.health()
+
+
+@router.get("/healthchecker/db")
+async def db_healthchecker():
+    """
+    SQL statistics of this worker.
+
+    Returns:
+    - dict: Numbers of requests, statements, slow statements and possible N+1 patterns,
+      total and average statement time.
+    """
+    queries = query_metrics["queries"]
+    return {
+        "requests": query_metrics["requests"],
+        "queries": queries,
+        "slow_queries": query_metrics["slow_queries"],
+        "n_plus_one": query_metrics["n_plus_one"],
+        "time_ms": round(query_metrics["time_ms"], 2),
+        "avg_query_ms": round(query_metrics["time_ms"] / queries, 3) if queries else 0.0,
+    }
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str, user: User = Depends(get_current_admin_user)):
+    """
+    Downloading a request profile taken with the X-Profile header.
+
+    Parameters:
+    - profile_id (str): Profile ID from the X-Profile-Id response header.
+    - user (User): The currently authorized administrator.
+
+    Returns:
+    - FileResponse: Speedscope JSON (open at https://www.speedscope.app) or HTML profile.
+
+    Raises:
+    - HTTPException (404): If the profile is not found.
+    """
+    path = profile_path(profile_id)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found"
+        )
+    media_type = "text/html" if path.suffix == ".html" else "application/json"
+    return FileResponse(path, media_type=media_type)
@@ -32,8 +32,12 @@ class ContactResponse(ContactModel):
         id: Unique identifier of the contact
         created_at: Date and time when the contact was created
         updated_at: Date and time when the contact was last updated (optional)
+
+    The email is validated on input, so the stored value is not validated again
+    when serializing responses (it is the most expensive check of the model).
     """
 
+    email: str = Field(max_length=100, json_schema_extra={"format": "email"})
     id: int
     created_at: datetime
     updated_at: Optional[datetime]
@@ -1,32 +1,86 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional
-from aiocache import cached
 from fastapi import Depends, HTTPException, status
-from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError, jwt
 
 from src.database.db import get_db
-from src.entity.models import User, UserRole
+from src.entity.models import UserRole
+from src.entity.snapshots import UserSnapshot, dump_user, load_user
 from src.conf.config import settings
-from src.services.users import UserService
+from src.conf.logging_config import bind_log_context
+from src.services.cache import cached
+from src.services.metrics import BCRYPT_DURATION, BCRYPT_QUEUE_TIME
+from src.services.tracing import span
+from src.services.users import UserService, user_cache_key
+
+logger = logging.getLogger("auth")
+
+
+@lru_cache
+def get_pwd_context():
+    """
+    Returns the password hashing context; passlib is imported on first use.
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 class Hash:
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    # bcrypt is CPU-bound by design, so async callers run it in these threads.
+    executor = ThreadPoolExecutor(
+        max_workers=settings.BCRYPT_WORKERS, thread_name_prefix="bcrypt"
+    )
 
     def verify_password(self, plain_password, hashed_password) -> bool:
         """
         Checks if the entered password matches the hashed password.
         """
-        return self.pwd_context.verify(plain_password, hashed_password)
+        return get_pwd_context().verify(plain_password, hashed_password)
 
     def get_password_hash(self, password: str) -> str:
         """
         Generates a hash for the password.
         """
-        return self.pwd_context.hash(password)
+        return get_pwd_context().hash(password)
+
+    async def verify_password_async(self, plain_password, hashed_password) -> bool:
+        """
+        Checks the password in a worker thread without blocking the event loop.
+        """
+        return await self._run(
+            "verify", self.verify_password, plain_password, hashed_password
+        )
+
+    async def get_password_hash_async(self, password: str) -> str:
+        """
+        Generates a hash for the password in a worker thread.
+        """
+        return await self._run("hash", self.get_password_hash, password)
+
+    async def _run(self, operation: str, func, *args):
+        """
+        Runs a bcrypt call in the executor, recording its queue and run time.
+        """
+        queued = time.perf_counter()
+
+        def job():
+            started = time.perf_counter()
+            BCRYPT_QUEUE_TIME.observe(started - queued)
+            try:
+                return func(*args)
+            finally:
+                BCRYPT_DURATION.labels(operation).observe(time.perf_counter() - started)
+
+        with span(f"bcrypt.{operation}"):
+            return await asyncio.get_running_loop().run_in_executor(self.executor, job)
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
@@ -54,15 +108,17 @@ def cache_key_builder(func, args, kwargs) -> str:
     """
     Generates a cache key using the username.
     """
-    return f"username: {args[0]}"
+    return user_cache_key(args[0])
 
 
-@cached(ttl=300, key_builder=cache_key_builder)
-async def get_user_from_db(username: str, db: AsyncSession) -> User:
+@cached(key_builder=cache_key_builder, dump=dump_user, load=load_user)
+async def get_user_from_db(username: str, db: AsyncSession) -> UserSnapshot:
     """
     Retrieves a user from the database using caching.
+
+    The user is cached as a compact projection and returned as a read-only snapshot.
     """
-    print("NOT CACHED USER")
+    logger.debug("User cache miss", extra={"username": username})
     user_service = UserService(db)
     user = await user_service.get_user_by_username(username)
 
@@ -71,7 +127,7 @@ async def get_user_from_db(username: str, db: AsyncSession) -> User:
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
-) -> User:
+) -> UserSnapshot:
     """
     Retrieves the current user based on the provided token.
     """
@@ -90,14 +146,16 @@ async def get_current_user(
             raise credentials_exception
     except JWTError as e:
         raise credentials_exception
-    user_service = UserService(db)
-    user = await user_service.get_user_by_username(username)
+    user = await get_user_from_db(username, db)
     if user is None:
         raise credentials_exception
+    bind_log_context(user_id=user.id)
     return user
 
 
-def get_current_admin_user(current_user: User = Depends(get_current_user)) -> User:
+def get_current_admin_user(
+    current_user: UserSnapshot = Depends(get_current_user),
+) -> UserSnapshot:
     """
     Checks if the current user is an administrator.
     """
@@ -1,17 +1,431 @@
+import asyncio
+import logging
+import math
+import random
+import time
+from collections import Counter
+from functools import lru_cache, wraps
 
-from aiocache import caches
-
-# Cache configuration settings for using Redis
-caches.set_config(
-    {
-        "default": {
-            "cache": "aiocache.RedisCache",  # Cache type - Redis
-            "endpoint": "localhost",  # Redis server address
-            "port": 6379,  # Redis server port
-            "timeout": 10,  # Timeout for waiting for a response
-            "serializer": {
-                "class": "aiocache.serializers.PickleSerializer"
-            },  # Serializer for caching data
+from src.conf.config import settings
+from src.services.metrics import CACHE_ERRORS, CACHE_LOOKUPS
+from src.services.tracing import span
+
+logger = logging.getLogger("cache")
+
+# Serializers of aiocache.serializers that can be selected with the CACHE_SERIALIZER setting.
+SERIALIZERS = {
+    "msgpack": "MsgPackSerializer",
+    "json": "JsonSerializer",
+    "pickle": "PickleSerializer",
+}
+
+# Result of an in-flight load whose caller was cancelled: the waiters retry the load.
+_ABANDONED = object()
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        """
+        Initializes a circuit breaker for a remote dependency.
+
+        After `failure_threshold` consecutive failures the circuit opens and calls
+        are skipped for `reset_timeout` seconds. Then a single trial call is let
+        through (half-open) while other callers keep skipping the dependency: a
+        success closes the circuit, a failure opens it again. A trial that records
+        no result within `reset_timeout` is given up, and another one is allowed.
+
+        Arguments:
+            failure_threshold: The number of consecutive failures that opens the circuit.
+            reset_timeout: The time in seconds before a trial call is allowed.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        # Start of the trial call in the half-open state.
+        self.trial_started: float | None = None
+
+    @property
+    def state(self) -> str:
+        """
+        Returns the state of the circuit: closed, open or half-open.
+        """
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        """
+        Checks whether a call to the dependency may be made.
+
+        Every allowed call must be followed by record_success or record_failure.
+        """
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "open":
+            return False
+        now = time.monotonic()
+        if self.trial_started is not None and now - self.trial_started < self.reset_timeout:
+            return False
+        self.trial_started = now
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.trial_started = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.trial_started = None
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class CacheService:
+    def __init__(
+        self,
+        backend,
+        fallback=None,
+        breaker: CircuitBreaker | None = None,
+        lock_enabled: bool = False,
+        lock_timeout: float = 2.0,
+        early_refresh_beta: float = 1.0,
+    ):
+        """
+        Initializes the cache with graceful degradation.
+
+        Every operation is sent to the backend while its circuit is closed. If the
+        backend fails or times out, the operation goes to the in-process fallback
+        cache (or is skipped when there is none, so callers go straight to the
+        database).
+
+        Arguments:
+            backend: The aiocache instance used as the main cache.
+            fallback: The aiocache instance used while the backend is unavailable.
+            breaker: The circuit breaker guarding the backend.
+            lock_enabled: Whether loaders are serialized across processes with a lock in the backend.
+            lock_timeout: The lifetime of the loader lock and the maximum wait for it.
+            early_refresh_beta: The eagerness of probabilistic early refresh (0 disables it).
+        """
+        self.backend = backend
+        self.fallback = fallback
+        self.breaker = breaker or CircuitBreaker()
+        self.lock_enabled = lock_enabled
+        self.lock_timeout = lock_timeout
+        self.early_refresh_beta = early_refresh_beta
+        # Loaders in progress in this process, by key.
+        self._inflight: dict[str, asyncio.Future] = {}
+        # Numbers of hits, misses, errors and fallback operations.
+        self.stats: Counter = Counter()
+
+    async def _call(self, method: str, *args, **kwargs):
+        """
+        Calls the backend or, if it is unavailable, the fallback cache.
+        """
+        if self.breaker.allow():
+            try:
+                result = await getattr(self.backend, method)(*args, **kwargs)
+                self.breaker.record_success()
+                return result
+            except Exception as e:
+                self.stats["errors"] += 1
+                CACHE_ERRORS.inc()
+                self.breaker.record_failure()
+                logger.warning(f"Cache backend error on '{method}': {e!r}")
+        self.stats["fallback"] += 1
+        if self.fallback is None:
+            return None
+        return await getattr(self.fallback, method)(*args, **kwargs)
+
+    async def get(self, key: str):
+        """
+        Returns the cached value or None if the key is missing.
+        """
+        with span("cache.get", key=key):
+            value = await self._call("get", key)
+        self.stats["hits" if value is not None else "misses"] += 1
+        CACHE_LOOKUPS.labels("hit" if value is not None else "miss").inc()
+        return value
+
+    async def set(self, key: str, value, ttl: int | None = None) -> None:
+        """
+        Stores the value for `ttl` seconds.
+        """
+        with span("cache.set", key=key):
+            await self._call("set", key, value, ttl=ttl)
+
+    async def delete(self, key: str) -> None:
+        """
+        Removes the key from the backend and from the fallback cache.
+        """
+        with span("cache.delete", key=key):
+            await self._call("delete", key)
+        if self.fallback is not None:
+            await self.fallback.delete(key)
+
+    async def clear(self) -> None:
+        """
+        Removes all keys from the backend and from the fallback cache.
+        """
+        await self._call("clear")
+        if self.fallback is not None:
+            await self.fallback.clear()
+
+    async def get_or_load(self, key: str, loader, ttl: int, dump=None, load=None):
+        """
+        Returns the cached value or loads it, with single-flight protection.
+
+        Concurrent callers that miss the same key in this process await one
+        loader call. If the caller running the loader is cancelled, one of the
+        waiters takes the load over instead of being cancelled with it. With `lock_enabled`, a lock in the backend also lets only one
+        process load the key while the others wait for the stored result. Values
+        are stored with their load time, so a hit may trigger an early refresh
+        shortly before expiry (XFetch), spreading out the expiry of hot keys.
+
+        With `dump` and `load`, values are stored as plain projections (e.g. lists
+        of primitives) and rehydrated on every read, including the first one, so
+        callers always get the same type. `load` may return None for a projection
+        of an outdated layout, which is treated as a miss.
+
+        Arguments:
+            key: The cache key.
+            loader: An async function without arguments returning the value.
+            ttl: The lifetime of the value in seconds.
+            dump: A function converting a loaded value to its stored projection.
+            load: A function converting a stored projection back to a value.
+
+        Returns:
+            The cached or loaded value (None values are not cached).
+        """
+        entry = await self.get(key)
+        value = self._decode(entry, load)
+        if value is None:
+            entry = None
+        elif not self._should_refresh(entry):
+            return value
+
+        while (future := self._inflight.get(key)) is not None:
+            result = await asyncio.shield(future)
+            if result is not _ABANDONED:
+                return result
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._load(key, loader, ttl, entry, dump, load)
+        except asyncio.CancelledError:
+            future.set_result(_ABANDONED)
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Marks the exception as retrieved when nobody else awaits it.
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            del self._inflight[key]
+
+    @staticmethod
+    def _decode(entry, load=None):
+        """
+        Extracts the value from a stored entry (None if the entry is not usable).
+        """
+        if not isinstance(entry, dict) or "expires" not in entry or "value" not in entry:
+            return None
+        return load(entry["value"]) if load is not None else entry["value"]
+
+    def _should_refresh(self, entry: dict) -> bool:
+        """
+        Decides whether to refresh a value before it expires.
+
+        The probability grows as expiry approaches and with the load time.
+        """
+        if self.early_refresh_beta <= 0:
+            return False
+        gap = -entry["delta"] * self.early_refresh_beta * math.log(1.0 - random.random())
+        return time.time() + gap >= entry["expires"]
+
+    async def _load(
+        self, key: str, loader, ttl: int, stale: dict | None, dump=None, load=None
+    ):
+        """
+        Runs the loader under the backend lock and stores the result.
+        """
+        locked = await self._acquire_lock(key)
+        if not locked:
+            # Another process is loading the value.
+            if stale is not None:
+                return self._decode(stale, load)
+            deadline = time.monotonic() + self.lock_timeout
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.02)
+                value = self._decode(await self._call("get", key), load)
+                if value is not None:
+                    return value
+        try:
+            started = time.perf_counter()
+            value = await loader()
+            delta = time.perf_counter() - started
+            if value is None:
+                return None
+            if dump is not None:
+                value = dump(value)
+            entry = {"value": value, "delta": delta, "expires": time.time() + ttl}
+            await self.set(key, entry, ttl=ttl)
+            return load(value) if load is not None else value
+        finally:
+            if locked and self.lock_enabled:
+                await self._call("delete", f"{key}:lock")
+
+    async def _acquire_lock(self, key: str) -> bool:
+        """
+        Takes the loader lock in the backend.
+
+        Returns False only if another process holds the lock. Without locking, or
+        while the backend is unavailable, the caller proceeds as the owner.
+        """
+        if not self.lock_enabled or not self.breaker.allow():
+            return True
+        try:
+            await self.backend.add(f"{key}:lock", 1, ttl=self.lock_timeout)
+            self.breaker.record_success()
+            return True
+        except ValueError:
+            # aiocache raises ValueError when the key already exists.
+            self.breaker.record_success()
+            return False
+        except Exception as e:
+            self.breaker.record_failure()
+            logger.warning(f"Cache lock error: {e!r}")
+            return True
+
+    def metrics(self) -> dict:
+        """
+        Returns the operation counters, the hit ratio and the circuit state.
+        """
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "hits": self.stats["hits"],
+            "misses": self.stats["misses"],
+            "errors": self.stats["errors"],
+            "fallback": self.stats["fallback"],
+            "hit_ratio": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+            "circuit": self.breaker.state,
+        }
+
+    async def close(self) -> None:
+        """
+        Closes the connections of the backend and the fallback cache.
+        """
+        for cache in (self.backend, self.fallback):
+            if cache is not None:
+                try:
+                    await cache.close()
+                except Exception as e:
+                    logger.warning(f"Cannot close cache connections: {e!r}")
+
+    async def health(self) -> dict:
+        """
+        Checks the backend with a cheap request and returns its status and metrics.
+        """
+        started = time.perf_counter()
+        try:
+            await self.backend.exists("cache:health")
+            status = "ok"
+        except Exception as e:
+            logger.warning(f"Cache health check failed: {e!r}")
+            status = "degraded" if self.fallback is not None else "unavailable"
+        return {
+            "backend": type(self.backend).__name__,
+            "status": status,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+            **self.metrics(),
         }
+
+
+@lru_cache
+def get_cache() -> CacheService:
+    """
+    Returns the cache configured from the settings.
+
+    aiocache (and redis) are imported on first use, not when the application starts.
+
+    Raises:
+        ValueError: If the configured backend or serializer is unknown.
+    """
+    import aiocache.serializers
+    from aiocache import RedisCache, SimpleMemoryCache
+
+    serializer_name = SERIALIZERS.get(settings.CACHE_SERIALIZER)
+    if serializer_name is None:
+        raise ValueError(f"Unknown cache serializer: '{settings.CACHE_SERIALIZER}'")
+    serializer_class = getattr(aiocache.serializers, serializer_name)
+
+    options = {
+        "lock_enabled": settings.CACHE_LOCK_ENABLED,
+        "lock_timeout": settings.CACHE_LOCK_TIMEOUT,
+        "early_refresh_beta": settings.CACHE_EARLY_REFRESH_BETA,
     }
-)
\ No newline at end of file
+    if settings.CACHE_BACKEND == "memory":
+        return CacheService(SimpleMemoryCache(serializer=serializer_class()), **options)
+    if settings.CACHE_BACKEND == "redis":
+        backend = RedisCache(
+            serializer=serializer_class(),
+            endpoint=settings.CACHE_REDIS_HOST,
+            port=settings.CACHE_REDIS_PORT,
+            db=settings.CACHE_REDIS_DB,
+            password=settings.CACHE_REDIS_PASSWORD,
+            timeout=settings.CACHE_TIMEOUT,
+            create_connection_timeout=settings.CACHE_TIMEOUT,
+        )
+        fallback = (
+            SimpleMemoryCache(serializer=serializer_class())
+            if settings.CACHE_FALLBACK == "memory"
+            else None
+        )
+        breaker = CircuitBreaker(
+            settings.CACHE_BREAKER_FAILURES, settings.CACHE_BREAKER_RESET_SECONDS
+        )
+        return CacheService(backend, fallback, breaker, **options)
+    raise ValueError(f"Unknown cache backend: '{settings.CACHE_BACKEND}'")
+
+
+def cached(ttl: int | None = None, key_builder=None, dump=None, load=None):
+    """
+    Caches the result of an async function.
+
+    Concurrent misses of the same key share one call (see CacheService.get_or_load).
+    None results are not cached.
+
+    Arguments:
+        ttl: The lifetime of cached values (default: CACHE_TTL).
+        key_builder: A function (func, args, kwargs) -> str building the cache key.
+        dump: A function converting a result to its stored projection.
+        load: A function rehydrating a result from its stored projection.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            cache = get_cache()
+            if key_builder is not None:
+                key = key_builder(func, args, kwargs)
+            else:
+                key = f"{func.__module__}.{func.__qualname__}:{args}:{kwargs}"
+            return await cache.get_or_load(
+                key,
+                lambda: func(*args, **kwargs),
+                ttl or settings.CACHE_TTL,
+                dump=dump,
+                load=load,
+            )
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import time
+from functools import lru_cache
+
+from sqlalchemy import text
+
+from src.conf.config import settings
+from src.database.db import sessionmanager
+from src.services.cache import get_cache
+
+logger = logging.getLogger("healthchecker")
+
+# Dependencies without which the worker cannot serve requests. The cache falls
+# back to memory and emails are sent in the background, so they are reported
+# but do not make the worker unready.
+REQUIRED = ("db",)
+
+
+async def check_db() -> str:
+    async with sessionmanager.engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    return "ok"
+
+
+async def check_cache() -> str:
+    return (await get_cache().health())["status"]
+
+
+async def check_mail() -> str:
+    # Opens a TCP connection only: logging in would cost an SMTP session per check.
+    _, writer = await asyncio.open_connection(settings.MAIL_SERVER, settings.MAIL_PORT)
+    writer.close()
+    await writer.wait_closed()
+    return "ok"
+
+
+class HealthChecker:
+    def __init__(self, checks: dict, interval: float = 10.0, timeout: float = 2.0):
+        """
+        Initializes the background dependency checker.
+
+        A task runs all checks every `interval` seconds and keeps their last
+        results, so health probes read them without touching the dependencies.
+
+        Arguments:
+            checks: Async functions returning the status ("ok", "degraded", ...) by name.
+            interval: The time between two rounds of checks in seconds.
+            timeout: The maximum time of a single check in seconds.
+        """
+        self.checks = checks
+        self.interval = interval
+        self.timeout = timeout
+        # Last result of each check: status, latency and error.
+        self.results: dict[str, dict] = {}
+        self.checked_at: float | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """
+        Starts the checks in the running event loop.
+        """
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stops the checks.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await self.check_all()
+            await asyncio.sleep(self.interval)
+
+    async def _check(self, name: str, check) -> dict:
+        started = time.perf_counter()
+        try:
+            result = {"status": await asyncio.wait_for(check(), self.timeout)}
+        except Exception as e:
+            result = {"status": "down", "error": repr(e)}
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        previous = self.results.get(name, {}).get("status", "ok")
+        # Logs changes only, including dependencies failing from the start.
+        if previous != result["status"]:
+            logger.warning(
+                f"Dependency '{name}' is {result['status']} (was {previous})",
+                extra={"error": result.get("error")},
+            )
+        return result
+
+    async def check_all(self) -> None:
+        """
+        Runs all checks concurrently and stores their results.
+        """
+        names = list(self.checks)
+        results = await asyncio.gather(
+            *[self._check(name, self.checks[name]) for name in names]
+        )
+        self.results = dict(zip(names, results))
+        self.checked_at = time.monotonic()
+
+    def report(self) -> dict:
+        """
+        Returns the readiness of the worker and the last result of each check.
+
+        The worker is ready when the required dependencies were "ok" in a round
+        of checks no older than three intervals.
+        """
+        if self.checked_at is None:
+            return {"status": "starting", "checks": {}}
+        age = time.monotonic() - self.checked_at
+        ready = age <= self.interval * 3 and all(
+            self.results.get(name, {}).get("status") == "ok" for name in REQUIRED
+        )
+        return {
+            "status": "ready" if ready else "not_ready",
+            "checked_seconds_ago": round(age, 2),
+            "checks": self.results,
+        }
+
+
+@lru_cache
+def get_health_checker() -> HealthChecker:
+    """
+    Returns the dependency checker configured from the settings.
+    """
+    return HealthChecker(
+        {"db": check_db, "cache": check_cache, "mail": check_mail},
+        interval=settings.HEALTH_CHECK_INTERVAL,
+        timeout=settings.HEALTH_CHECK_TIMEOUT,
+    )
@@ -0,0 +1,206 @@
+import asyncio
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+
+from fastapi import HTTPException, UploadFile, status
+
+from src.conf.config import settings
+
+# Size of the chunks used to read the uploaded file.
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class InvalidImageError(ValueError):
+    """
+    Raised when an uploaded file cannot be decoded as a supported image.
+    """
+
+
+def normalize_avatar(
+    data: bytes, size: int, image_format: str, quality: int, max_pixels: int
+) -> bytes:
+    """
+    Decodes an image, crops it to a square, resizes and re-encodes it.
+
+    Runs in a worker process, so it only takes and returns plain bytes.
+
+    Arguments:
+        data: The raw bytes of the uploaded image.
+        size: The width and height of the resulting image in pixels.
+        image_format: The output format (e.g. WEBP or JPEG).
+        quality: The encoder quality (1-100).
+        max_pixels: The maximum allowed number of decoded pixels.
+
+    Returns:
+        bytes: The encoded square image.
+
+    Raises:
+        InvalidImageError: If the data is not an image or the image is too large.
+    """
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    Image.MAX_IMAGE_PIXELS = max_pixels
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            # Only the header is parsed at this point, so the pixel limit is
+            # checked before any decoding happens.
+            if img.width * img.height > max_pixels:
+                raise InvalidImageError("Image dimensions are too large.")
+            # Lets the JPEG decoder downscale while decoding.
+            img.draft("RGB", (size * 2, size * 2))
+            img = ImageOps.exif_transpose(img).convert("RGB")
+            img = ImageOps.fit(img, (size, size), Image.Resampling.LANCZOS)
+            output = io.BytesIO()
+            img.save(output, format=image_format, quality=quality)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        raise InvalidImageError(str(e)) from e
+    return output.getvalue()
+
+
+class AvatarImageProcessor:
+    def __init__(
+        self,
+        size: int = 250,
+        image_format: str = "WEBP",
+        quality: int = 85,
+        max_upload_bytes: int = 5 * 1024 * 1024,
+        max_pixels: int = 40_000_000,
+        workers: int = 2,
+    ):
+        """
+        Initializes the processor that normalizes avatars before storage.
+
+        Arguments:
+            size: The width and height of the stored avatar.
+            image_format: The output format (WEBP or JPEG).
+            quality: The encoder quality.
+            max_upload_bytes: The maximum size of the uploaded file.
+            max_pixels: The maximum number of decoded pixels.
+            workers: The number of worker processes for image decoding.
+        """
+        self.size = size
+        self.image_format = image_format.upper()
+        self.quality = quality
+        self.max_upload_bytes = max_upload_bytes
+        self.max_pixels = max_pixels
+        self.workers = workers
+        self._executor: ProcessPoolExecutor | None = None
+
+    @property
+    def extension(self) -> str:
+        """
+        Returns the file extension of the produced images.
+        """
+        return "jpg" if self.image_format == "JPEG" else self.image_format.lower()
+
+    @property
+    def content_type(self) -> str:
+        """
+        Returns the MIME type of the produced images.
+        """
+        return f"image/{'jpeg' if self.image_format == 'JPEG' else self.image_format.lower()}"
+
+    async def read_upload(self, file: UploadFile) -> bytes:
+        """
+        Reads the uploaded file, rejecting it as soon as it exceeds the size limit.
+
+        Arguments:
+            file: The uploaded file.
+
+        Returns:
+            bytes: The content of the file.
+
+        Raises:
+            HTTPException (415): If the file is not declared as an image.
+            HTTPException (413): If the file is larger than the allowed size.
+        """
+        if file.content_type and not file.content_type.startswith("image/"):
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Avatar must be an image.",
+            )
+        chunks = []
+        total = 0
+        while chunk := await file.read(READ_CHUNK_SIZE):
+            total += len(chunk)
+            if total > self.max_upload_bytes:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail="Avatar file is too large.",
+                )
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    async def process(self, file: UploadFile) -> bytes:
+        """
+        Reads and normalizes the uploaded avatar in a worker process.
+
+        Arguments:
+            file: The uploaded file.
+
+        Returns:
+            bytes: The normalized avatar image.
+
+        Raises:
+            HTTPException (400): If the file is not a valid image.
+        """
+        data = await self.read_upload(file)
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self._get_executor(),
+                partial(
+                    normalize_avatar,
+                    data,
+                    self.size,
+                    self.image_format,
+                    self.quality,
+                    self.max_pixels,
+                ),
+            )
+        except InvalidImageError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid or unsupported image.",
+            )
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """
+        Creates the process pool on first use.
+        """
+        if self._executor is None:
+            # Forking a process that already runs threads (log listener, bcrypt
+            # pool, loop watchdog) can copy their held locks into the workers.
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context(
+                "forkserver" if "forkserver" in methods else "spawn"
+            )
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=context
+            )
+        return self._executor
+
+    def shutdown(self) -> None:
+        """
+        Stops the worker processes.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+@lru_cache
+def get_image_processor() -> AvatarImageProcessor:
+    """
+    Returns the avatar image processor configured from the settings.
+    """
+    return AvatarImageProcessor(
+        size=settings.AVATAR_SIZE,
+        image_format=settings.AVATAR_FORMAT,
+        quality=settings.AVATAR_QUALITY,
+        max_upload_bytes=settings.AVATAR_MAX_UPLOAD_BYTES,
+        max_pixels=settings.AVATAR_MAX_PIXELS,
+        workers=settings.AVATAR_PROCESS_WORKERS,
+    )
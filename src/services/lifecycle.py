@@ -0,0 +1,102 @@
+import logging
+import time
+
+from src.conf.config import settings
+from src.conf.email import get_mail_config
+from src.database.db import sessionmanager
+from src.entity.models import User
+from src.repository.contacts import ContactRepository
+from src.repository.users import UserRepository
+from src.services.auth import get_pwd_context
+from src.services.cache import get_cache
+from src.services.metrics import STARTUP_TIME
+
+logger = logging.getLogger(__name__)
+
+
+async def load_modules() -> None:
+    """
+    Loads the subsystems that are imported on first use (email, password hashing).
+    """
+    get_mail_config()
+    get_pwd_context()
+
+
+async def prime_statements() -> None:
+    """
+    Runs the hot repository queries once with IDs that match no rows.
+
+    SQLAlchemy compiles each statement on first use and caches it, so the
+    first requests do not pay for the compilation.
+    """
+    nobody = User(id=0)
+    async with sessionmanager.session() as db:
+        users = UserRepository(db)
+        await users.get_user_by_id(0)
+        await users.get_user_by_username("")
+        await users.get_user_by_email("")
+        contacts = ContactRepository(db)
+        await contacts.get_contacts("", "", "", 0, 1, nobody)
+        await contacts.get_contact_by_id(0, nobody)
+        await contacts.is_contact_exists("", "", nobody)
+        # Uses PostgreSQL date functions.
+        if db.get_bind().dialect.name == "postgresql":
+            await contacts.get_upcoming_birthdays(7, nobody)
+
+
+async def warm_up() -> dict[str, float]:
+    """
+    Prepares the worker for its first requests.
+
+    Loads the lazily imported subsystems, opens DB_WARMUP_CONNECTIONS database
+    connections, primes the compiled statements and connects to the cache
+    (importing aiocache). A failing step is logged and skipped:
+    the worker then starts cold instead of not at all.
+
+    Returns:
+        The duration of each step in milliseconds.
+    """
+    steps = {
+        "modules": load_modules,
+        "db_pool": lambda: sessionmanager.warmup(settings.DB_WARMUP_CONNECTIONS),
+        "statements": prime_statements,
+        "cache": lambda: get_cache().health(),
+    }
+    timings = {}
+    for name, step in steps.items():
+        started = time.perf_counter()
+        try:
+            await step()
+        except Exception as e:
+            logger.warning(f"Warmup step '{name}' failed: {e!r}")
+        timings[name] = round((time.perf_counter() - started) * 1000, 2)
+    return timings
+
+
+def record_startup(import_seconds: float, lifespan_seconds: float, steps: dict) -> None:
+    """
+    Logs the startup time of the worker and exports it as a metric.
+
+    Arguments:
+        import_seconds: time to import the application.
+        lifespan_seconds: time of the lifespan startup, including the warmup.
+        steps: durations of the warmup steps in milliseconds.
+    """
+    STARTUP_TIME.labels("import").set(import_seconds)
+    STARTUP_TIME.labels("lifespan").set(lifespan_seconds)
+    logger.info(
+        f"Worker ready in {(import_seconds + lifespan_seconds) * 1000:.0f} ms "
+        f"(import {import_seconds * 1000:.0f} ms, "
+        f"startup {lifespan_seconds * 1000:.0f} ms)",
+        extra={"warmup_ms": steps},
+    )
+
+
+async def drain() -> None:
+    """
+    Closes the database pool and the cache connections on shutdown.
+    """
+    await sessionmanager.dispose()
+    # Not created if nothing used the cache.
+    if get_cache.cache_info().currsize:
+        await get_cache().close()
@@ -0,0 +1,276 @@
+import logging
+import math
+import time
+from functools import wraps
+
+from fastapi import Request, Response
+from limits import RateLimitItem, parse
+from limits.aio.storage import MemoryStorage, MovingWindowSupport, Storage
+from limits.aio.strategies import STRATEGIES
+
+from src.conf.config import settings
+from src.services.cache import CircuitBreaker
+
+logger = logging.getLogger("rate_limiter")
+
+# Adds `amount` entries to the moving window list unless it is full.
+ACQUIRE_MOVING_WINDOW = """
+local timestamp = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local expiry = tonumber(ARGV[3])
+local amount = tonumber(ARGV[4])
+if amount > limit then
+    return false
+end
+local entry = redis.call('lindex', KEYS[1], limit - amount)
+if entry and tonumber(entry) >= timestamp - expiry then
+    return false
+end
+for i = 1, amount do
+    redis.call('lpush', KEYS[1], timestamp)
+end
+redis.call('ltrim', KEYS[1], 0, limit - 1)
+redis.call('expire', KEYS[1], expiry)
+return true
+"""
+
+# Returns the oldest entry in the moving window and the number of entries.
+MOVING_WINDOW = """
+local items = redis.call('lrange', KEYS[1], 0, tonumber(ARGV[2]))
+local start = tonumber(ARGV[1])
+local count = 0
+local oldest = nil
+for idx = 1, #items do
+    local value = tonumber(items[idx])
+    if value < start then
+        break
+    end
+    count = count + 1
+    if oldest == nil or value < oldest then
+        oldest = value
+    end
+end
+return {oldest or 0, count}
+"""
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, limit: RateLimitItem, headers: dict[str, str]):
+        """
+        Raised when a request is over the rate limit of its route.
+
+        Arguments:
+            limit: The exceeded limit.
+            headers: The X-RateLimit-* and Retry-After headers of the response.
+        """
+        super().__init__(str(limit))
+        self.limit = limit
+        self.headers = headers
+
+
+class AsyncRedisStorage(Storage, MovingWindowSupport):
+    """
+    Rate limit storage on a redis.asyncio client.
+
+    Keeps the moving window layout of the limits Redis storages (a list of
+    timestamps per key) and works with the redis client the application
+    already has, so no call blocks the event loop.
+    """
+
+    # Not registered for a URI scheme: instances are created by create_limiter.
+    STORAGE_SCHEME = None
+    PREFIX = "LIMITS"
+
+    def __init__(self, client):
+        super().__init__()
+        self.client = client
+        self._moving_window = client.register_script(MOVING_WINDOW)
+        self._acquire_moving_window = client.register_script(ACQUIRE_MOVING_WINDOW)
+
+    @property
+    def base_exceptions(self):
+        from redis.exceptions import RedisError
+
+        return RedisError
+
+    def _key(self, key: str) -> str:
+        return f"{self.PREFIX}:{key}"
+
+    async def incr(
+        self, key: str, expiry: int, elastic_expiry: bool = False, amount: int = 1
+    ) -> int:
+        key = self._key(key)
+        value = await self.client.incrby(key, amount)
+        if elastic_expiry or value == amount:
+            await self.client.expire(key, expiry)
+        return value
+
+    async def get(self, key: str) -> int:
+        return int(await self.client.get(self._key(key)) or 0)
+
+    async def get_expiry(self, key: str) -> int:
+        return int(max(await self.client.ttl(self._key(key)), 0) + time.time())
+
+    async def check(self) -> bool:
+        try:
+            return await self.client.ping()
+        except Exception:
+            return False
+
+    async def reset(self) -> int:
+        keys = [key async for key in self.client.scan_iter(f"{self.PREFIX}:*")]
+        return await self.client.delete(*keys) if keys else 0
+
+    async def clear(self, key: str) -> None:
+        await self.client.delete(self._key(key))
+
+    async def acquire_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> bool:
+        acquired = await self._acquire_moving_window(
+            keys=[self._key(key)], args=[time.time(), limit, expiry, amount]
+        )
+        return bool(acquired)
+
+    async def get_moving_window(self, key: str, limit: int, expiry: int) -> tuple:
+        timestamp = int(time.time())
+        oldest, count = await self._moving_window(
+            keys=[self._key(key)], args=[timestamp - expiry, limit]
+        )
+        return (int(oldest), count) if count else (timestamp, 0)
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        storage: Storage | None = None,
+        strategy: str = "moving-window",
+        breaker: CircuitBreaker | None = None,
+        key_prefix: str = "ratelimit",
+    ):
+        """
+        Initializes the rate limiter of the API routes.
+
+        Requests are counted per client IP and route. Storage calls are awaited,
+        so a slow Redis never blocks the event loop. If the storage fails, the
+        limiter counts in memory until the circuit of the storage closes again.
+
+        Arguments:
+            storage: The storage of the counters (in-memory by default).
+            strategy: The rate limiting strategy (moving-window, fixed-window, ...).
+            breaker: The circuit breaker guarding the storage.
+            key_prefix: The prefix of the counter keys.
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown rate limiting strategy: '{strategy}'")
+        self.strategy = STRATEGIES[strategy](storage or MemoryStorage())
+        self._fallback = STRATEGIES[strategy](MemoryStorage())
+        self.breaker = breaker or CircuitBreaker()
+        self.key_prefix = key_prefix
+        # Turns limiting off, e.g. for load tests.
+        self.enabled = True
+
+    async def hit(self, limit: RateLimitItem, *identifiers: str) -> tuple[bool, int, int]:
+        """
+        Counts a request against the limit.
+
+        Returns:
+            Whether the request is allowed, the remaining requests and the reset time.
+        """
+        if self.breaker.allow():
+            try:
+                allowed = await self.strategy.hit(limit, *identifiers)
+                stats = await self.strategy.get_window_stats(limit, *identifiers)
+                self.breaker.record_success()
+                return allowed, stats.remaining, stats.reset_time
+            except Exception as e:
+                self.breaker.record_failure()
+                logger.warning(f"Rate limit storage is unavailable: {e!r}")
+        allowed = await self._fallback.hit(limit, *identifiers)
+        stats = await self._fallback.get_window_stats(limit, *identifiers)
+        return allowed, stats.remaining, stats.reset_time
+
+    def limit(self, limit_value: str):
+        """
+        Limits the number of requests of a client IP to the decorated route.
+
+        The route must have a `request: Request` parameter. The X-RateLimit-*
+        headers are added to returned responses, or to the `response: Response`
+        parameter of routes returning plain data.
+
+        Arguments:
+            limit_value: The limit, e.g. "10/minute".
+
+        Raises:
+            RateLimitExceeded: If the client is over the limit.
+        """
+        limit = parse(limit_value)
+
+        def decorator(func):
+            endpoint = f"{func.__module__}.{func.__name__}"
+
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return await func(*args, **kwargs)
+                request: Request = kwargs["request"]
+                client = request.client.host if request.client else "127.0.0.1"
+                allowed, remaining, reset = await self.hit(
+                    limit, self.key_prefix, client, endpoint
+                )
+                headers = {
+                    "X-RateLimit-Limit": str(limit.amount),
+                    "X-RateLimit-Remaining": str(max(0, remaining)),
+                    "X-RateLimit-Reset": str(reset),
+                }
+                if not allowed:
+                    retry_after = max(1, math.ceil(reset - time.time()))
+                    raise RateLimitExceeded(
+                        limit, {**headers, "Retry-After": str(retry_after)}
+                    )
+
+                result = await func(*args, **kwargs)
+                target = result if isinstance(result, Response) else kwargs.get("response")
+                if target is not None:
+                    target.headers.update(headers)
+                return result
+
+            return wrapper
+
+        return decorator
+
+
+def create_limiter(
+    storage_uri: str, strategy: str, client=None
+) -> RateLimiter:
+    """
+    Creates a rate limiter that keeps its counters in a shared storage.
+
+    With a ``redis://`` storage all worker processes share the same counters,
+    and the moving-window strategy is applied atomically by a Lua script on the
+    Redis server. Redis calls time out after 0.5 s, like the auth throttle.
+
+    Arguments:
+        storage_uri: The storage URI, e.g. ``redis://redis:6379/1`` or ``memory://``.
+        strategy: The rate limiting strategy (moving-window, fixed-window, ...).
+        client: An existing redis.asyncio client (used instead of creating one).
+
+    Returns:
+        RateLimiter: The configured limiter.
+    """
+    storage = None
+    if storage_uri.startswith(("redis://", "rediss://")):
+        if client is None:
+            from redis.asyncio import Redis
+
+            client = Redis.from_url(
+                storage_uri, socket_timeout=0.5, socket_connect_timeout=0.5
+            )
+        storage = AsyncRedisStorage(client)
+    elif storage_uri != "memory://":
+        raise ValueError(f"Unknown rate limit storage: '{storage_uri}'")
+    return RateLimiter(storage, strategy)
+
+
+# The limiter shared by all routers.
+limiter = create_limiter(settings.RATE_LIMIT_STORAGE_URI, settings.RATE_LIMIT_STRATEGY)
@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from functools import lru_cache
+
+from src.conf.config import settings
+from src.services.metrics import LOOP_BLOCKS, LOOP_LAG
+
+logger = logging.getLogger("loop_monitor")
+
+
+class LoopLagMonitor:
+    def __init__(self, interval: float = 0.1, threshold: float = 0.25):
+        """
+        Initializes the event loop lag monitor.
+
+        A task in the event loop wakes up every `interval` seconds and records
+        how late it was woken up (the loop lag). A watchdog thread checks the
+        time the task is due to wake up: when the loop is `threshold` seconds
+        late to run it, the stack of the loop thread is captured while it is
+        still blocked, so the log points to the function that blocks the loop.
+        The idle sleep itself is not counted as blocking.
+
+        Arguments:
+            interval: The time between two lag measurements in seconds.
+            threshold: The blocking time that triggers a stack capture.
+        """
+        self.interval = interval
+        self.threshold = threshold
+        # Stacks of recent blocking calls, newest last.
+        self.reports: deque[str] = deque(maxlen=20)
+        # The time the measuring task is due to wake up.
+        self._wakeup = time.monotonic()
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """
+        Starts the monitor in the running event loop.
+        """
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._wakeup = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._measure())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """
+        Stops the measuring task and the watchdog thread.
+        """
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=self.interval * 2)
+            self._watchdog = None
+
+    async def _measure(self) -> None:
+        """
+        Measures the loop lag until cancelled.
+        """
+        while True:
+            expected = time.monotonic() + self.interval
+            self._wakeup = expected
+            await asyncio.sleep(self.interval)
+            LOOP_LAG.observe(max(0.0, time.monotonic() - expected))
+
+    def _watch(self) -> None:
+        """
+        Captures the loop thread stack once per blocking period.
+        """
+        reported = None
+        while not self._stopped.wait(self.interval / 2):
+            wakeup = self._wakeup
+            blocked = time.monotonic() - wakeup
+            if blocked < self.threshold or reported == wakeup:
+                continue
+            reported = wakeup
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            self.reports.append(stack)
+            LOOP_BLOCKS.inc()
+            logger.warning(
+                f"Event loop blocked for more than {blocked:.3f}s at:\n{stack}"
+            )
+
+
+@lru_cache
+def get_loop_monitor() -> LoopLagMonitor:
+    """
+    Returns the event loop lag monitor configured from the settings.
+    """
+    return LoopLagMonitor(settings.LOOP_LAG_INTERVAL, settings.LOOP_BLOCK_THRESHOLD)
@@ -0,0 +1,177 @@
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.requests import Request
+from starlette.responses import Response
+
+# With several worker processes, PROMETHEUS_MULTIPROC_DIR must point to an empty
+# directory shared by the workers (set before start). Each process then writes
+# its values to memory-mapped files there, and /metrics aggregates them.
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route.",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests being processed.",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_connections_checked_out",
+    "Database connections currently in use.",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections_open",
+    "Database connections opened by the pool.",
+    multiprocess_mode="livesum",
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements executed per HTTP request, by route.",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds",
+    "Time spent executing SQL statements per HTTP request, by route.",
+    ["route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Cache lookups by result (hit or miss).",
+    ["result"],
+)
+CACHE_ERRORS = Counter(
+    "cache_backend_errors_total",
+    "Failed cache backend operations.",
+)
+BCRYPT_QUEUE_TIME = Histogram(
+    "bcrypt_queue_seconds",
+    "Time password hashing tasks wait for a free worker thread.",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+BCRYPT_DURATION = Histogram(
+    "bcrypt_duration_seconds",
+    "Time spent hashing or verifying a password.",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0),
+)
+LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay of scheduled event loop callbacks.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+LOOP_BLOCKS = Counter(
+    "event_loop_blocks_total",
+    "Times the event loop was blocked longer than the threshold.",
+)
+STARTUP_TIME = Gauge(
+    "app_startup_seconds",
+    "Time to start a worker, by phase (import, lifespan).",
+    ["phase"],
+    multiprocess_mode="max",
+)
+EMAIL_BACKLOG = Gauge(
+    "email_backlog",
+    "Emails queued for sending and not sent yet.",
+    multiprocess_mode="livesum",
+)
+EMAILS_SENT = Counter(
+    "emails_total",
+    "Processed emails by result (sent or failed).",
+    ["result"],
+)
+AUTH_THROTTLE_REJECTIONS = Counter(
+    "auth_throttle_rejections_total",
+    "Auth attempts rejected by the throttle, by scope (ip or account).",
+    ["scope"],
+)
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        """
+        ASGI middleware recording request latency, status codes and in-flight requests.
+
+        Requests are labelled with the route template (e.g. /api/contacts/{contact_id}),
+        not the raw path, to keep the number of time series bounded.
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            # The router stores the matched route in the scope.
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status_code),
+            ).observe(time.perf_counter() - started)
+
+
+def instrument_pool(engine: AsyncEngine) -> None:
+    """
+    Tracks opened and checked out connections of the engine pool.
+    """
+    pool = engine.sync_engine.pool
+    event.listen(pool, "connect", lambda *args: DB_POOL_CONNECTIONS.inc())
+    event.listen(pool, "close", lambda *args: DB_POOL_CONNECTIONS.dec())
+    event.listen(pool, "checkout", lambda *args: DB_POOL_CHECKED_OUT.inc())
+    event.listen(pool, "checkin", lambda *args: DB_POOL_CHECKED_OUT.dec())
+
+
+def mark_process_dead() -> None:
+    """
+    Removes live gauges of the current worker process from the aggregation.
+    """
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    """
+    Returns all metrics in the Prometheus text format.
+
+    In multiprocess mode the values of all worker processes are aggregated.
+    """
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,139 @@
+import logging
+import re
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+
+from src.conf.config import settings
+from src.database.db import get_db
+from src.services.auth import get_current_admin_user, get_current_user
+
+logger = logging.getLogger("profiler")
+
+PROFILE_HEADER = "x-profile"
+# Output formats: file suffix and pyinstrument renderer.
+PROFILE_FORMATS = {
+    "speedscope": ("speedscope.json", "SpeedscopeRenderer"),
+    "html": ("html", "HTMLRenderer"),
+}
+PROFILE_ID = re.compile(r"^[\w.-]+$")
+
+
+def profile_path(profile_id: str) -> Path | None:
+    """
+    Returns the path of a stored profile, or None if the ID is not valid or unknown.
+    """
+    if not PROFILE_ID.match(profile_id):
+        return None
+    path = Path(settings.PROFILE_DIR) / profile_id
+    return path if path.is_file() else None
+
+
+def store_profile(profiler, renderer: str, profile_id: str) -> None:
+    """
+    Renders and stores a profile, removing the oldest ones over PROFILE_MAX_FILES.
+
+    Runs in a worker thread: rendering and writing large profiles would block the loop.
+    """
+    from pyinstrument import renderers
+
+    directory = Path(settings.PROFILE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    output = profiler.output(getattr(renderers, renderer)())
+    (directory / profile_id).write_text(output, encoding="utf-8")
+
+    profiles = sorted(
+        (path for path in directory.iterdir() if path.is_file()),
+        key=lambda path: (path.stat().st_mtime_ns, path.name),
+    )
+    for path in profiles[: max(0, len(profiles) - settings.PROFILE_MAX_FILES)]:
+        path.unlink(missing_ok=True)
+
+
+class ProfilerMiddleware:
+    def __init__(self, app):
+        """
+        ASGI middleware profiling single requests on demand.
+
+        A request with the `X-Profile: speedscope` (or `html`) header from an
+        administrator is run under the pyinstrument sampling profiler. The profile
+        is stored in PROFILE_DIR (keeping the newest PROFILE_MAX_FILES) and its ID is returned in the `X-Profile-Id`
+        response header; it can be downloaded from /api/profiles/{profile_id}.
+
+        Requests without the header are passed through untouched, and pyinstrument
+        is only imported when the first profile is taken.
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.PROFILER_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        profile_format = headers.get(PROFILE_HEADER)
+        if profile_format is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            if profile_format not in PROFILE_FORMATS:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown profile format: '{profile_format}'",
+                )
+            await self._authorize(scope, headers)
+        except HTTPException as e:
+            response = JSONResponse(
+                {"detail": e.detail}, status_code=e.status_code, headers=e.headers
+            )
+            await response(scope, receive, send)
+            return
+
+        from pyinstrument import Profiler
+
+        suffix, renderer = PROFILE_FORMATS[profile_format]
+        path = re.sub(r"[^\w.-]+", "_", scope["path"]).strip("_") or "root"
+        profile_id = f"{time.time_ns() // 1000}-{scope['method']}-{path}.{suffix}"
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", profile_id.encode())
+                ]
+            await send(message)
+
+        profiler = Profiler(interval=settings.PROFILER_INTERVAL, async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            await run_in_threadpool(store_profile, profiler, renderer, profile_id)
+            logger.info(f"Stored profile '{profile_id}'")
+
+    async def _authorize(self, scope, headers: Headers) -> None:
+        """
+        Checks that the request comes from an administrator.
+
+        Uses the same checks as the `get_current_admin_user` dependency (and the
+        application's override of `get_db`, if any).
+
+        Raises:
+            HTTPException: 401 without valid credentials, 403 for other users.
+        """
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Not authenticated",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        db_dependency = scope["app"].dependency_overrides.get(get_db, get_db)
+        async with asynccontextmanager(db_dependency)() as db:
+            user = await get_current_user(token, db)
+        get_current_admin_user(user)
@@ -0,0 +1,102 @@
+import uuid
+from functools import wraps
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from src.conf.config import settings
+from src.services.cache import CacheService, get_cache
+from src.services.serialization import model_response, sparse_adapter
+
+
+def user_version_key(user_id: int) -> str:
+    """
+    Returns the key of the version token of a user's cached responses.
+    """
+    return f"response-version:{user_id}"
+
+
+def is_shared(cache: CacheService) -> bool:
+    """
+    Checks whether cached responses are seen and invalidated by all workers.
+
+    The memory backend and the fallback used while the Redis circuit is not
+    closed live in one process, so an invalidation would not reach the others.
+    """
+    return settings.CACHE_BACKEND == "redis" and cache.breaker.state == "closed"
+
+
+async def invalidate_user_responses(user_id: int) -> None:
+    """
+    Makes all cached responses of the user stale.
+
+    A new version token is stored, so later lookups use new keys and the old
+    entries simply expire. The token lives longer than any response entry.
+
+    Arguments:
+        user_id: The ID of the user whose data has changed.
+    """
+    if settings.RESPONSE_CACHE_TTL:
+        await get_cache().set(
+            user_version_key(user_id),
+            uuid.uuid4().hex,
+            ttl=settings.RESPONSE_CACHE_TTL * 2,
+        )
+
+
+def cache_response(response_model, ttl: int | None = None, sparse: bool = False):
+    """
+    Caches the serialized JSON body of a GET route per user, path and query.
+
+    On a hit the stored bytes are returned directly, skipping the route handler,
+    response validation and JSON encoding. On a miss the handler result is
+    validated and serialized once with pydantic-core (`model_response`) and
+    stored. Cached entries of a user are invalidated with `invalidate_user_responses`.
+
+    The route must have `request: Request` and `user` parameters. Caching is off
+    when RESPONSE_CACHE_TTL is 0 or the cache is not shared by the workers (see
+    `is_shared`); results are then still serialized by `model_response`.
+
+    Arguments:
+        response_model: The type of the response (same as in the route decorator).
+        ttl: The lifetime of cached responses (default: RESPONSE_CACHE_TTL).
+        sparse: Serializes only the fields in the `fields` argument of the route
+            (a tuple of field names, or None for all of them).
+    """
+    adapter = TypeAdapter(response_model)
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            fields = kwargs["fields"] if sparse else None
+            serializer = sparse_adapter(response_model, fields) if fields else adapter
+            lifetime = ttl or settings.RESPONSE_CACHE_TTL
+            cache = get_cache()
+            if not lifetime or not is_shared(cache):
+                result = await func(*args, **kwargs)
+                if isinstance(result, Response):
+                    return result
+                return model_response(serializer, result)
+
+            request: Request = kwargs["request"]
+            user_id = kwargs["user"].id
+            version = await cache.get(user_version_key(user_id)) or "0"
+            query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+            key = f"response:{user_id}:{version}:{request.url.path}?{query}"
+
+            body = await cache.get(key)
+            if body is not None:
+                return Response(
+                    content=body, media_type="application/json", headers={"X-Cache": "HIT"}
+                )
+
+            result = await func(*args, **kwargs)
+            if isinstance(result, Response):
+                return result
+            response = model_response(serializer, result, headers={"X-Cache": "MISS"})
+            await cache.set(key, response.body.decode(), ttl=lifetime)
+            return response
+
+        return wrapper
+
+    return decorator
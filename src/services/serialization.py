@@ -0,0 +1,89 @@
+from functools import lru_cache, wraps
+from typing import List, get_args, get_origin
+
+from fastapi import Response, status
+from pydantic import TypeAdapter, create_model
+
+
+def model_response(
+    adapter: TypeAdapter,
+    content,
+    status_code: int = status.HTTP_200_OK,
+    headers: dict | None = None,
+) -> Response:
+    """
+    Validates the content once and returns it serialized to JSON by pydantic-core.
+
+    FastAPI validates the result of a route against its response model, converts
+    it to Python primitives and then encodes them to JSON. Dumping the validated
+    model straight to bytes skips the intermediate objects, which dominate the
+    time of large lists.
+
+    Arguments:
+        adapter: The adapter of the response type.
+        content: ORM objects, models or dicts matching the response type.
+        status_code: The status code of the response.
+        headers: Additional headers of the response.
+
+    Returns:
+        The JSON response.
+    """
+    body = adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+    return Response(
+        content=body,
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
+
+
+def serialize_response(response_model, status_code: int = status.HTTP_200_OK):
+    """
+    Serializes the result of a route with `model_response`.
+
+    The route decorator keeps its `response_model` for the OpenAPI schema; FastAPI
+    skips its own validation because the route returns a ready response.
+    Responses returned by the route (e.g. errors) are passed through.
+
+    Arguments:
+        response_model: The type of the response (same as in the route decorator).
+        status_code: The status code of the response (same as in the route decorator).
+    """
+    adapter = TypeAdapter(response_model)
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            result = await func(*args, **kwargs)
+            if isinstance(result, Response):
+                return result
+            return model_response(adapter, result, status_code)
+
+        return wrapper
+
+    return decorator
+
+
+@lru_cache
+def sparse_adapter(response_model, fields: tuple[str, ...]) -> TypeAdapter:
+    """
+    Returns the adapter of the response type narrowed to the given fields.
+
+    The narrowed model keeps the annotations and constraints of the original
+    fields. Adapters are cached per response type and fieldset.
+
+    Arguments:
+        response_model: A pydantic model or a list of them.
+        fields: The names of the fields kept.
+    """
+    is_list = get_origin(response_model) is list
+    model = get_args(response_model)[0] if is_list else response_model
+    sparse = create_model(
+        model.__name__,
+        __config__=model.model_config,
+        **{
+            name: (model.model_fields[name].annotation, model.model_fields[name])
+            for name in fields
+        },
+    )
+    return TypeAdapter(List[sparse] if is_list else sparse)
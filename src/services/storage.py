@@ -0,0 +1,221 @@
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from pathlib import Path
+
+from src.conf.config import settings
+
+
+class AvatarStorage(ABC):
+    """
+    Interface of a storage backend for avatar images.
+
+    Methods are blocking and are expected to be called from a worker thread.
+    Keys are relative paths such as ``avatars/<sha256>.webp``.
+    """
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """
+        Checks whether an object with the given key is already stored.
+        """
+
+    @abstractmethod
+    def save(self, key: str, data: bytes, content_type: str) -> str:
+        """
+        Stores the data under the given key and returns its public URL.
+        """
+
+    @abstractmethod
+    def url(self, key: str) -> str:
+        """
+        Returns the public URL of the object with the given key.
+        """
+
+
+class LocalStorage(AvatarStorage):
+    def __init__(self, root: str | Path, base_url: str):
+        """
+        Initializes the storage that keeps avatars on the local disk.
+
+        Arguments:
+            root: The directory where files are written.
+            base_url: The URL prefix under which the directory is served.
+        """
+        self.root = Path(root)
+        self.base_url = base_url.rstrip("/")
+
+    def exists(self, key: str) -> bool:
+        return (self.root / key).is_file()
+
+    def save(self, key: str, data: bytes, content_type: str) -> str:
+        path = self.root / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Writes to a temporary file first, so readers never see partial data.
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return self.url(key)
+
+    def url(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+
+class CloudinaryStorage(AvatarStorage):
+    def __init__(self, cloud_name, api_key, api_secret, timeout: float = 30.0):
+        """
+        Initializes the storage that keeps avatars in Cloudinary.
+
+        Arguments:
+            cloud_name: The cloud name in Cloudinary.
+            api_key: The API key for accessing Cloudinary.
+            api_secret: The API secret for accessing Cloudinary.
+            timeout: The timeout of a single Cloudinary API call.
+        """
+        import cloudinary
+
+        self.timeout = timeout
+        # Configures Cloudinary once for the whole process.
+        cloudinary.config(
+            cloud_name=cloud_name,
+            api_key=api_key,
+            api_secret=api_secret,
+            secure=True,
+        )
+
+    @staticmethod
+    def _split(key: str) -> tuple[str, str]:
+        """
+        Splits a key into a Cloudinary public_id and a file format.
+        """
+        public_id, _, image_format = key.rpartition(".")
+        return public_id, image_format
+
+    def exists(self, key: str) -> bool:
+        # Lookups go through the Admin API, which is rate-limited per hour, so
+        # none is made: `save` uploads with overwrite=False, which keeps an
+        # already stored object.
+        return False
+
+    def save(self, key: str, data: bytes, content_type: str) -> str:
+        import io
+        import cloudinary.uploader
+
+        public_id, _ = self._split(key)
+        cloudinary.uploader.upload(
+            io.BytesIO(data), public_id=public_id, overwrite=False, timeout=self.timeout
+        )
+        return self.url(key)
+
+    def url(self, key: str) -> str:
+        import cloudinary
+
+        public_id, image_format = self._split(key)
+        return cloudinary.CloudinaryImage(public_id).build_url(format=image_format)
+
+
+class S3Storage(AvatarStorage):
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: str | None = None,
+        access_key: str | None = None,
+        secret_key: str | None = None,
+        region: str | None = None,
+        public_url: str | None = None,
+        timeout: float = 30.0,
+        client=None,
+    ):
+        """
+        Initializes the storage that keeps avatars in an S3-compatible bucket.
+
+        Arguments:
+            bucket: The bucket name.
+            endpoint_url: The endpoint of an S3-compatible service (None for AWS).
+            access_key: The access key id.
+            secret_key: The secret access key.
+            region: The bucket region.
+            public_url: The URL prefix under which bucket objects are served.
+            timeout: The connect and read timeout of S3 calls.
+            client: An existing boto3 S3 client (used instead of creating one).
+        """
+        self.bucket = bucket
+        if client is None:
+            try:
+                import boto3
+                from botocore.config import Config
+            except ImportError as e:
+                raise RuntimeError(
+                    "The 'boto3' package is required for the S3 avatar storage "
+                    "(poetry install --extras s3)."
+                ) from e
+            client = boto3.client(
+                "s3",
+                endpoint_url=endpoint_url,
+                aws_access_key_id=access_key,
+                aws_secret_access_key=secret_key,
+                region_name=region,
+                config=Config(connect_timeout=timeout, read_timeout=timeout),
+            )
+        self.client = client
+        if public_url is None:
+            base = endpoint_url or f"https://{bucket}.s3.amazonaws.com"
+            public_url = f"{base}/{bucket}" if endpoint_url else base
+        self.public_url = public_url.rstrip("/")
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+        except Exception as e:
+            status_code = getattr(e, "response", {}).get("Error", {}).get("Code")
+            if status_code in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    def save(self, key: str, data: bytes, content_type: str) -> str:
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=key,
+            Body=data,
+            ContentType=content_type,
+            # Keys are content hashes, so objects never change.
+            CacheControl="public, max-age=31536000, immutable",
+        )
+        return self.url(key)
+
+    def url(self, key: str) -> str:
+        return f"{self.public_url}/{key}"
+
+
+@lru_cache
+def get_avatar_storage() -> AvatarStorage:
+    """
+    Returns the avatar storage backend selected by ``settings.AVATAR_STORAGE``.
+
+    Raises:
+        ValueError: If the configured backend is unknown.
+    """
+    backend = settings.AVATAR_STORAGE.lower()
+    if backend == "local":
+        return LocalStorage(settings.AVATAR_LOCAL_DIR, settings.AVATAR_LOCAL_URL)
+    if backend == "cloudinary":
+        return CloudinaryStorage(
+            settings.CLOUDINARY_NAME,
+            settings.CLOUDINARY_API_KEY,
+            settings.CLOUDINARY_API_SECRET,
+            timeout=settings.UPLOAD_TIMEOUT_SECONDS,
+        )
+    if backend == "s3":
+        return S3Storage(
+            settings.S3_BUCKET,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            access_key=settings.S3_ACCESS_KEY,
+            secret_key=settings.S3_SECRET_KEY,
+            region=settings.S3_REGION,
+            public_url=settings.S3_PUBLIC_URL,
+            timeout=settings.UPLOAD_TIMEOUT_SECONDS,
+        )
+    raise ValueError(f"Unknown avatar storage backend: '{settings.AVATAR_STORAGE}'")
@@ -0,0 +1,294 @@
+import logging
+import math
+import time
+from functools import lru_cache
+
+from fastapi import Depends, HTTPException, Request, status
+
+from src.conf.config import settings
+from src.services.cache import CircuitBreaker
+from src.services.metrics import AUTH_THROTTLE_REJECTIONS
+
+logger = logging.getLogger("auth_throttle")
+
+
+class MemoryCounterStore:
+    """
+    In-process store of expiring counters.
+
+    Used when no Redis is configured and as a fallback while Redis is unavailable.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self._data: dict[str, tuple[int, float]] = {}
+        self.max_keys = max_keys
+
+    def _purge(self) -> None:
+        """
+        Drops expired counters, so the store does not grow without bound.
+        """
+        now = time.monotonic()
+        self._data = {k: v for k, v in self._data.items() if v[1] > now}
+
+    def _get(self, key: str) -> tuple[int, float] | None:
+        item = self._data.get(key)
+        if item is not None and item[1] <= time.monotonic():
+            del self._data[key]
+            return None
+        return item
+
+    async def incr(self, key: str, ttl: int) -> int:
+        item = self._get(key)
+        if item is None:
+            if len(self._data) >= self.max_keys:
+                self._purge()
+            item = (0, time.monotonic() + ttl)
+        self._data[key] = (item[0] + 1, item[1])
+        return item[0] + 1
+
+    async def set(self, key: str, ttl: int) -> None:
+        self._data[key] = (1, time.monotonic() + ttl)
+
+    async def ttl(self, key: str) -> float:
+        item = self._get(key)
+        return item[1] - time.monotonic() if item else 0.0
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+
+class RedisCounterStore:
+    """
+    Store of expiring counters shared by all workers through Redis.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    async def incr(self, key: str, ttl: int) -> int:
+        # Creates the counter with its expiry and increments it in one transaction.
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.set(key, 0, ex=ttl, nx=True)
+            pipe.incr(key)
+            _, value = await pipe.execute()
+        return int(value)
+
+    async def set(self, key: str, ttl: int) -> None:
+        await self.client.set(key, 1, ex=ttl)
+
+    async def ttl(self, key: str) -> float:
+        pttl = await self.client.pttl(key)
+        return pttl / 1000 if pttl > 0 else 0.0
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(key)
+
+
+class AuthThrottle:
+    def __init__(
+        self,
+        store=None,
+        breaker: CircuitBreaker | None = None,
+        max_failures: int = 5,
+        max_ip_attempts: int = 30,
+        window: int = 900,
+        base_delay: float = 1.0,
+        max_delay: float = 900.0,
+    ):
+        """
+        Initializes the throttle for credential-checking endpoints.
+
+        Every key gets a counter of attempts within the window. When the counter
+        reaches its threshold, the key is locked for an exponentially growing
+        delay: base_delay * 2 ** (attempts - threshold), at most max_delay.
+
+        Arguments:
+            store: The counter store (Redis or in-memory).
+            breaker: The circuit breaker guarding the store.
+            max_failures: Failed attempts per account before locking.
+            max_ip_attempts: Attempts per client IP before locking.
+            window: The lifetime of attempt counters in seconds.
+            base_delay: The first lock delay in seconds.
+            max_delay: The maximum lock delay in seconds.
+        """
+        self.store = store or MemoryCounterStore()
+        self._fallback = MemoryCounterStore()
+        # Skips a hanging store, so each attempt does not wait for its timeouts.
+        self.breaker = breaker or CircuitBreaker()
+        self.max_failures = max_failures
+        self.max_ip_attempts = max_ip_attempts
+        self.window = window
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    async def _call(self, method: str, *args):
+        """
+        Calls the store, falling back to in-memory counters on errors and while
+        the circuit of the store is open.
+        """
+        if self.breaker.allow():
+            try:
+                result = await getattr(self.store, method)(*args)
+                self.breaker.record_success()
+                return result
+            except Exception as e:
+                self.breaker.record_failure()
+                logger.warning(f"Throttle store is unavailable: {e!r}")
+        return await getattr(self._fallback, method)(*args)
+
+    async def retry_after(self, key: str) -> int:
+        """
+        Returns the number of seconds the key stays locked (0 if not locked).
+        """
+        ttl = await self._call("ttl", f"throttle:lock:{key}")
+        return math.ceil(ttl)
+
+    async def hit(self, key: str, threshold: int) -> None:
+        """
+        Counts an attempt for the key and locks the key when over the threshold.
+        """
+        attempts = await self._call("incr", f"throttle:count:{key}", self.window)
+        if attempts >= threshold:
+            delay = min(
+                self.base_delay * 2 ** (attempts - threshold), self.max_delay
+            )
+            await self._call("set", f"throttle:lock:{key}", max(1, math.ceil(delay)))
+
+    async def reset(self, key: str) -> None:
+        """
+        Clears the attempt counter of the key.
+        """
+        await self._call("delete", f"throttle:count:{key}")
+
+    async def check(self, scope: str, key: str) -> None:
+        """
+        Rejects the request if the key is locked.
+
+        Raises:
+            HTTPException (429): If the key is locked.
+        """
+        retry_after = await self.retry_after(f"{scope}:{key}")
+        if retry_after > 0:
+            AUTH_THROTTLE_REJECTIONS.labels(scope).inc()
+            logger.warning(f"Throttled auth attempt for {scope} '{key}'.")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many attempts. Please try again later.",
+                headers={"Retry-After": str(retry_after)},
+            )
+
+
+class ThrottleGuard:
+    def __init__(
+        self, throttle: AuthThrottle, action: str, ip: str, count_ip_failures: bool = False
+    ):
+        """
+        Per-request helper bound to an auth action and a client IP.
+
+        Arguments:
+            throttle: The shared throttle.
+            action: The name of the endpoint (login, register, reset_password).
+            ip: The client IP address.
+            count_ip_failures: Whether failed attempts also count against the IP.
+        """
+        self.throttle = throttle
+        self.action = action
+        self.ip = ip
+        self.count_ip_failures = count_ip_failures
+        self.account: str | None = None
+
+    async def check_account(self, account: str, count_attempt: bool = False) -> None:
+        """
+        Rejects the request if the account is locked.
+
+        Must be called before any database lookup or password hashing.
+
+        Arguments:
+            account: The username or email the request refers to.
+            count_attempt: Whether to count this request as an attempt right away.
+
+        Raises:
+            HTTPException (429): If the account is locked.
+        """
+        self.account = f"{self.action}:{account.lower()}"
+        await self.throttle.check("account", self.account)
+        if count_attempt:
+            await self.failed()
+
+    async def failed(self) -> None:
+        """
+        Counts a failed attempt for the account (and the IP, if enabled).
+        """
+        if self.count_ip_failures:
+            await self.throttle.hit(f"ip:{self.ip}", self.throttle.max_ip_attempts)
+        if self.account is not None:
+            await self.throttle.hit(
+                f"account:{self.account}", self.throttle.max_failures
+            )
+
+    async def succeeded(self) -> None:
+        """
+        Clears the failed attempts of the account.
+        """
+        if self.account is not None:
+            await self.throttle.reset(f"account:{self.account}")
+
+
+@lru_cache
+def get_auth_throttle() -> AuthThrottle:
+    """
+    Returns the auth throttle that shares the storage of the rate limiter.
+    """
+    store = None
+    if settings.RATE_LIMIT_STORAGE_URI.startswith(("redis://", "rediss://")):
+        from redis.asyncio import Redis
+
+        store = RedisCounterStore(
+            Redis.from_url(
+                settings.RATE_LIMIT_STORAGE_URI,
+                socket_timeout=0.5,
+                socket_connect_timeout=0.5,
+            )
+        )
+    return AuthThrottle(
+        store,
+        max_failures=settings.AUTH_THROTTLE_MAX_FAILURES,
+        max_ip_attempts=settings.AUTH_THROTTLE_MAX_IP_ATTEMPTS,
+        window=settings.AUTH_THROTTLE_WINDOW_SECONDS,
+        base_delay=settings.AUTH_THROTTLE_BASE_DELAY,
+        max_delay=settings.AUTH_THROTTLE_MAX_DELAY,
+    )
+
+
+def auth_throttle(action: str, failures_only: bool = False):
+    """
+    Creates a dependency that throttles an auth endpoint by client IP.
+
+    The IP check runs before the endpoint body, and every request counts as an
+    attempt, since each of these endpoints runs bcrypt. With `failures_only`
+    only failed attempts count against the IP, so users sharing an address
+    (e.g. behind a NAT) are not locked out by successful logins. The returned
+    guard is used by the endpoint to check and count attempts per account.
+
+    The IP is the client address as seen by uvicorn: behind a reverse proxy,
+    SERVER_FORWARDED_ALLOW_IPS must trust the proxy, or every client shares
+    the proxy's address.
+
+    Arguments:
+        action: The name of the endpoint.
+        failures_only: Whether only failed attempts count against the IP.
+
+    Returns:
+        A FastAPI dependency returning a ThrottleGuard.
+    """
+
+    async def dependency(
+        request: Request, throttle: AuthThrottle = Depends(get_auth_throttle)
+    ) -> ThrottleGuard:
+        ip = request.client.host if request.client else "unknown"
+        await throttle.check("ip", ip)
+        if not failures_only:
+            await throttle.hit(f"ip:{ip}", throttle.max_ip_attempts)
+        return ThrottleGuard(throttle, action, ip, count_ip_failures=failures_only)
+
+    return dependency
@@ -0,0 +1,276 @@
+import inspect
+import json
+import logging
+import queue
+import random
+import secrets
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache, wraps
+
+from src.conf.config import settings
+from src.conf.logging_config import bind_log_context
+
+logger = logging.getLogger("tracing")
+
+
+@dataclass
+class Span:
+    """
+    A timed operation within a trace.
+
+    Attributes:
+    - name: Operation name (e.g. repository.users.get_user_by_email).
+    - trace_id: ID of the trace (one per request).
+    - span_id: ID of the span.
+    - parent_id: ID of the enclosing span, None for the root span.
+    - start: Start time (Unix timestamp).
+    - duration_ms: Duration in milliseconds, set when the span ends.
+    - attributes: Additional data (e.g. cache key, HTTP status).
+    - error: Exception raised inside the span, if any.
+    """
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start: float
+    duration_ms: float | None = None
+    attributes: dict = field(default_factory=dict)
+    error: str | None = None
+
+
+@dataclass
+class Trace:
+    """
+    Spans of one request, exported together when the root span ends.
+    """
+
+    trace_id: str
+    spans: list[Span] = field(default_factory=list)
+
+
+# Trace and span of the current task; copied into tasks and worker threads.
+_current: ContextVar[tuple[Trace, Span] | None] = ContextVar("current_span", default=None)
+
+
+class span:
+    def __init__(self, name: str, **attributes):
+        """
+        Measures a block of code as a child of the current span.
+
+        Outside of a trace (or with tracing disabled) it does nothing, so it is
+        cheap to leave around hot calls. Works as `with` and `async with`.
+
+        Arguments:
+            name: The operation name.
+            attributes: Additional data stored with the span.
+        """
+        self.name = name
+        self.attributes = attributes
+        self._token = None
+        self._span: Span | None = None
+        self._started = 0.0
+
+    def __enter__(self) -> Span | None:
+        current = _current.get()
+        if current is None:
+            return None
+        trace, parent = current
+        self._span = Span(
+            name=self.name,
+            trace_id=trace.trace_id,
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id,
+            start=time.time(),
+            attributes=self.attributes,
+        )
+        self._started = time.perf_counter()
+        self._token = _current.set((trace, self._span))
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._span is None:
+            return
+        self._span.duration_ms = round((time.perf_counter() - self._started) * 1000, 3)
+        if exc is not None:
+            self._span.error = repr(exc)
+        trace, _ = _current.get()
+        trace.spans.append(self._span)
+        _current.reset(self._token)
+
+    async def __aenter__(self) -> Span | None:
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.__exit__(exc_type, exc, tb)
+
+
+def traced(name: str | None = None):
+    """
+    Runs each call of a function (sync or async) in a span.
+
+    Arguments:
+        name: The span name (default: module and qualified name of the function).
+    """
+
+    def decorator(func):
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def trace_methods(prefix: str):
+    """
+    Class decorator running every public async method in a span named `prefix.method`.
+    """
+
+    def decorator(cls):
+        for attr, value in list(vars(cls).items()):
+            if not attr.startswith("_") and inspect.iscoroutinefunction(value):
+                setattr(cls, attr, traced(f"{prefix}.{attr}")(value))
+        return cls
+
+    return decorator
+
+
+class ConsoleExporter:
+    """
+    Writes each trace as an indented latency breakdown to the `tracing` logger.
+    """
+
+    def export(self, trace: Trace) -> None:
+        spans = sorted(trace.spans, key=lambda s: s.start)
+        depth = {}
+        lines = []
+        for item in spans:
+            depth[item.span_id] = depth.get(item.parent_id, -1) + 1
+            lines.append(
+                f"{'  ' * depth[item.span_id]}{item.name} {item.duration_ms:.2f} ms"
+                + (f" !{item.error}" if item.error else "")
+            )
+        logger.info(f"Trace {trace.trace_id}\n" + "\n".join(lines))
+
+
+class FileExporter:
+    def __init__(self, path: str):
+        """
+        Appends each trace as a JSON line to a file.
+
+        Writing happens in a background thread, so requests never wait for disk.
+
+        Arguments:
+            path: The path of the JSON lines file.
+        """
+        self.path = path
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._write, name="trace-writer", daemon=True
+        )
+        self._thread.start()
+
+    def export(self, trace: Trace) -> None:
+        self._queue.put(trace)
+
+    def _write(self) -> None:
+        while True:
+            trace = self._queue.get()
+            line = json.dumps(
+                {"trace_id": trace.trace_id, "spans": [asdict(s) for s in trace.spans]},
+                default=str,
+            )
+            try:
+                with open(self.path, "a", encoding="utf-8") as file:
+                    file.write(line + "\n")
+            except OSError as e:
+                logger.warning(f"Cannot write trace: {e!r}")
+
+
+@lru_cache
+def get_exporter():
+    """
+    Returns the trace exporter configured from the settings (None if disabled).
+
+    Raises:
+        ValueError: If the configured exporter is unknown.
+    """
+    if settings.TRACING_EXPORTER == "none":
+        return None
+    if settings.TRACING_EXPORTER == "console":
+        return ConsoleExporter()
+    if settings.TRACING_EXPORTER == "file":
+        return FileExporter(settings.TRACING_FILE)
+    raise ValueError(f"Unknown trace exporter: '{settings.TRACING_EXPORTER}'")
+
+
+class TracingMiddleware:
+    def __init__(self, app):
+        """
+        ASGI middleware starting a trace for each sampled HTTP request.
+
+        The root span covers the whole request, including background tasks run
+        after the response. Its trace ID is returned in the X-Trace-Id header
+        and added to the log context.
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        exporter = get_exporter()
+        if (
+            scope["type"] != "http"
+            or exporter is None
+            or random.random() >= settings.TRACING_SAMPLE_RATE
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace(trace_id=secrets.token_hex(16))
+        root = Span(
+            name=f"{scope['method']} {scope['path']}",
+            trace_id=trace.trace_id,
+            span_id=secrets.token_hex(8),
+            parent_id=None,
+            start=time.time(),
+        )
+        token = _current.set((trace, root))
+        bind_log_context(trace_id=trace.trace_id)
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                root.attributes["status"] = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-trace-id", trace.trace_id.encode())
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            root.error = repr(e)
+            raise
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            if route is not None:
+                root.name = f"{scope['method']} {route.path}"
+            root.duration_ms = round((time.perf_counter() - started) * 1000, 3)
+            trace.spans.append(root)
+            exporter.export(trace)
@@ -1,49 +1,142 @@
-import cloudinary
-import cloudinary.uploader
+import asyncio
+import hashlib
+import mimetypes
+from functools import lru_cache
+
+from fastapi import HTTPException, UploadFile, status
+from starlette.concurrency import run_in_threadpool
+
+from src.conf.config import settings
+from src.services.image import AvatarImageProcessor, get_image_processor
+from src.services.storage import AvatarStorage, get_avatar_storage
+from src.services.tracing import span, traced
 
 
 class UploadFileService:
-    def __init__(self, cloud_name, api_key, api_secret):
+    def __init__(
+        self,
+        storage: AvatarStorage,
+        processor: AvatarImageProcessor | None = None,
+        timeout: float = 30.0,
+        max_concurrency: int = 4,
+    ):
         """
-        Initializes the service for uploading files to Cloudinary.
+        Initializes the service for uploading avatars to a storage backend.
 
         Arguments:
-            cloud_name: The cloud name in Cloudinary.
-            api_key: The API key for accessing Cloudinary.
-            api_secret: The API secret for accessing Cloudinary.
-        """
-        self.cloud_name = cloud_name
-        self.api_key = api_key
-        self.api_secret = api_secret
-        # Configures Cloudinary for file uploads.
-        cloudinary.config(
-            cloud_name=self.cloud_name,
-            api_key=self.api_key,
-            api_secret=self.api_secret,
-            secure=True,
-        )
+            storage: The backend where avatars are stored.
+            processor: Optional processor that normalizes images before upload.
+            timeout: The maximum time in seconds for a single upload, including
+                the wait for a free upload slot.
+            max_concurrency: The maximum number of uploads running at the same time.
+        """
+        self.storage = storage
+        self.processor = processor
+        self.timeout = timeout
+        # Limits the number of worker threads busy with uploads, including the
+        # ones still running after their request timed out.
+        self._semaphore = asyncio.Semaphore(max_concurrency)
 
-    @staticmethod
-    def upload_file(file, username) -> str:
+    @traced("upload.avatar")
+    async def upload_file(self, file: UploadFile, current_url: str | None = None) -> str:
         """
-        Завантажує файл на Cloudinary і генерує URL для доступу до зображення.
+        Uploads an avatar to the storage and returns its URL.
+
+        When a processor is set, the image is cropped, resized and re-encoded
+        locally first, so only the small normalized avatar is sent. Avatars are
+        stored under the hash of their content: if the result matches the current
+        avatar or the storage reports it as stored, nothing is uploaded. Blocking
+        storage calls run in a worker thread, so the event loop keeps serving
+        other requests.
 
-        Формує унікальний ідентифікатор для користувача і завантажує файл на сервер.
-        Після успішного завантаження повертає URL зображення з певними параметрами (розмір, обрізка).
+        Arguments:
+            file: The file to upload.
+            current_url: The URL of the user's current avatar, if any.
 
-        Аргументи:
-            file: Файл для завантаження.
-            username: Ім'я користувача для формування унікального public_id.
+        Returns:
+            str: The URL of the stored avatar.
 
-        Повертає:
-            str: URL зображення, доступного на Cloudinary.
+        Raises:
+            HTTPException (400, 413, 415): If the processor rejects the image.
+            HTTPException (503): If no upload slot frees up within the timeout.
+            HTTPException (504): If the upload does not finish within the timeout.
         """
-        # Creates a unique public_id for the user.
-        public_id = f"RestApp/{username}"
-        # Uploads a file to the Cloudinary server.
-        r = cloudinary.uploader.upload(file.file, public_id=public_id, overwrite=True)
-        # Forms a URL to access the image with the appropriate dimensions.
-        src_url = cloudinary.CloudinaryImage(public_id).build_url(
-            width=250, height=250, crop="fill", version=r.get("version")
+        if self.processor is not None:
+            with span("upload.process"):
+                data = await self.processor.process(file)
+            extension = self.processor.extension
+            content_type = self.processor.content_type
+        else:
+            data = await file.read()
+            content_type = file.content_type or "application/octet-stream"
+            extension = (mimetypes.guess_extension(content_type) or ".bin")[1:]
+
+        # Forms a content-addressed key, so identical avatars share one object.
+        key = f"avatars/{hashlib.sha256(data).hexdigest()}.{extension}"
+        url = self.storage.url(key)
+        if url == current_url:
+            return url
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many avatar uploads in progress, try again later.",
+            )
+        store = asyncio.ensure_future(
+            run_in_threadpool(self._store, key, data, content_type)
         )
-        return src_url
+        # A timed out request stops waiting, but the thread keeps running: the
+        # slot is freed only when the thread finishes.
+        store.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(store), timeout=max(0.0, deadline - loop.time())
+            )
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail="Avatar upload timed out.",
+            )
+
+    def _release(self, store: asyncio.Future) -> None:
+        """
+        Frees the upload slot of a finished store call.
+        """
+        self._semaphore.release()
+        # Marks the error of an abandoned call as retrieved.
+        if not store.cancelled():
+            store.exception()
+
+    @traced("upload.store")
+    def _store(self, key: str, data: bytes, content_type: str) -> str:
+        """
+        Stores the avatar unless an identical one already exists (blocking).
+
+        Arguments:
+            key: The content-addressed key of the avatar.
+            data: The avatar bytes.
+            content_type: The MIME type of the avatar.
+
+        Returns:
+            str: The URL of the stored avatar.
+        """
+        if self.storage.exists(key):
+            return self.storage.url(key)
+        return self.storage.save(key, data, content_type)
+
+
+@lru_cache
+def get_upload_service() -> UploadFileService:
+    """
+    Returns the upload service, configuring the storage backend once per process.
+    """
+    return UploadFileService(
+        get_avatar_storage(),
+        processor=get_image_processor(),
+        timeout=settings.UPLOAD_TIMEOUT_SECONDS,
+        max_concurrency=settings.UPLOAD_MAX_CONCURRENCY,
+    )
@@ -1,9 +1,22 @@
+import logging
+
 from sqlalchemy.ext.asyncio import AsyncSession
 from libgravatar import Gravatar
 
 from src.entity.models import User
 from src.repository.users import UserRepository
 from src.schemas.user import UserCreate
+from src.services.cache import get_cache
+from src.services.tracing import span
+
+logger = logging.getLogger("users")
+
+
+def user_cache_key(username: str) -> str:
+    """
+    Returns the cache key of a user looked up by username.
+    """
+    return f"username: {username}"
 
 
 class UserService:
@@ -33,11 +46,12 @@ class UserService:
         # Creates an avatar using Gravatar.
         avatar = None
         try:
-            g = Gravatar(body.email)
-            avatar = g.get_image()
+            with span("gravatar"):
+                g = Gravatar(body.email)
+                avatar = g.get_image()
         except Exception as e:
             # Logs an error if there is an issue with Gravatar.
-            print(e)
+            logger.warning(f"Gravatar error: {e!r}", extra={"email": body.email})
 
         # Creates a user in the database through the repository.
         return await self.repository.create_user(body, avatar)
@@ -92,7 +106,8 @@ class UserService:
             None
         """
         # Confirms the user's email.
-        return await self.repository.confirmed_email(email)
+        user = await self.repository.confirmed_email(email)
+        await self._invalidate(user)
 
     async def update_avatar_url(self, email: str, url: str) -> User:
         """
@@ -106,7 +121,9 @@ class UserService:
             User: The updated user.
         """
         # Updates the user's avatar URL.
-        return await self.repository.update_avatar_url(email, url)
+        user = await self.repository.update_avatar_url(email, url)
+        await self._invalidate(user)
+        return user
 
     async def reset_password(self, user_id: int, password: str) -> User:
         """
@@ -120,4 +137,16 @@ class UserService:
             User: The updated user.
         """
         # Resets the user's password.
-        return await self.repository.reset_password(user_id, password)
+        user = await self.repository.reset_password(user_id, password)
+        await self._invalidate(user)
+        return user
+
+    async def _invalidate(self, user: User | None) -> None:
+        """
+        Removes the cached copy of a changed user.
+
+        Arguments:
+            user: The changed user (nothing is done for None).
+        """
+        if user is not None:
+            await get_cache().delete(user_cache_key(user.username))
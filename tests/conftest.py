@@ -1,11 +1,21 @@
 import asyncio
+import os
+from contextvars import ContextVar
 from unittest.mock import MagicMock
 import pytest
 import pytest_asyncio
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from sqlalchemy.pool import StaticPool
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+# Route tests mock the current user, so response caching is enabled per test only.
+os.environ.setdefault("RESPONSE_CACHE_TTL", "0")
+# Keeps avatars of the tests on the local disk.
+os.environ.setdefault("AVATAR_STORAGE", "local")
+
 from main import app
 from src.entity.models import Base, User, Contact
 from src.database.db import get_db
@@ -53,6 +63,47 @@ user_data_unique = {
 }
 
 
+_request_statements: ContextVar[list | None] = ContextVar(
+    "request_statements", default=None
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    statements = _request_statements.get()
+    if statements is not None:
+        statements.append((statement, parameters))
+
+
+class QueryRecorder:
+    """
+    ASGI wrapper recording the SQL statements executed by each request.
+
+    Requests are recorded as (endpoint, statements), where endpoint is the
+    method and route template, e.g. "GET /api/contacts/{contact_id}", and
+    statements are (sql, parameters) tuples of any engine.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.requests = []
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        statements = []
+        token = _request_statements.set(statements)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_statements.reset(token)
+            # The router stores the matched route in the scope.
+            route = scope.get("route")
+            path = route.path if route is not None else scope["path"]
+            self.requests.append((f"{scope['method']} {path}", statements))
+
+
 @pytest.fixture
 def user():
     return User(id=1, username="testuser", role="user")
@@ -124,7 +175,8 @@ def client():
 
     app.dependency_overrides[get_db] = override_get_db
 
-    yield TestClient(app)
+    # Route tests check the recorded statements against query budgets.
+    yield TestClient(QueryRecorder(app))
 
 
 @pytest.fixture
@@ -3,7 +3,7 @@ from unittest.mock import AsyncMock, MagicMock
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.entity.models import Contact, User
 from src.repository.contacts import ContactRepository
-from src.schemas.contacts import ContactModel
+from src.schemas.contacts import ContactModel, ContactResponse
 
 
 @pytest.fixture
@@ -54,7 +54,8 @@ def contact_body():
 @pytest.mark.asyncio
 async def test_get_contacts(contact_repository, mock_session, user, contact):
     mock_result = MagicMock()
-    mock_result.scalars.return_value.all.return_value = [contact]
+    mock_result.keys.return_value = ["id", "name"]
+    mock_result.all.return_value = [(contact.id, contact.name)]
     mock_session.execute = AsyncMock(return_value=mock_result)
 
     contacts = await contact_repository.get_contacts(
@@ -66,8 +67,31 @@ async def test_get_contacts(contact_repository, mock_session, user, contact):
         email="",
     )
 
-    assert len(contacts) == 1
-    assert contacts[0].name == "Charlie"
+    assert contacts == [{"id": 1, "name": "Charlie"}]
+    # Selects the response columns, not ORM entities.
+    stmt = mock_session.execute.call_args.args[0]
+    assert [c["name"] for c in stmt.column_descriptions] == list(
+        ContactResponse.model_fields
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_contacts_fields_after(contact_repository, mock_session, user):
+    mock_result = MagicMock()
+    mock_result.keys.return_value = ["id", "phone"]
+    mock_result.all.return_value = [(5, "123-456-7890")]
+    mock_session.execute = AsyncMock(return_value=mock_result)
+
+    contacts = await contact_repository.get_contacts(
+        "", "", "", 0, 10, user, fields=("id", "phone"), after=4
+    )
+
+    assert contacts == [{"id": 5, "phone": "123-456-7890"}]
+    stmt = mock_session.execute.call_args.args[0]
+    assert [c["name"] for c in stmt.column_descriptions] == ["id", "phone"]
+    sql = str(stmt)
+    assert "contacts.id > :id_1" in sql
+    assert "ORDER BY contacts.id" in sql
 
 
 @pytest.mark.asyncio
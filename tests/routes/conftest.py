@@ -0,0 +1,68 @@
+import pytest
+
+# Maximum number of SQL statements per API call, by endpoint. Calls of
+# endpoints without a budget are not checked. Authenticated endpoints include
+# the lookup of the current user on a cache miss.
+QUERY_BUDGETS = {
+    "GET /api/contacts/birthdays": 2,
+    "GET /api/contacts/": 2,
+    "GET /api/contacts/{contact_id}": 2,
+    "POST /api/contacts/": 4,
+    "PUT /api/contacts/{contact_id}": 4,
+    "DELETE /api/contacts/{contact_id}": 3,
+    "GET /api/users/me": 1,
+    "PATCH /api/users/avatar": 4,
+}
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "query_budget(endpoint, budget): overrides the query budget of an endpoint",
+    )
+
+
+def over_budget(requests: list, budgets: dict) -> list[str]:
+    """
+    Describes the recorded requests that executed more statements than budgeted.
+    """
+    violations = []
+    for endpoint, statements in requests:
+        budget = budgets.get(endpoint)
+        if budget is None or len(statements) <= budget:
+            continue
+        listing = "\n".join(
+            f"  {n}. {' '.join(sql.split())}  {parameters}"
+            for n, (sql, parameters) in enumerate(statements, 1)
+        )
+        violations.append(
+            f"{endpoint} executed {len(statements)} statements "
+            f"(budget {budget}):\n{listing}"
+        )
+    return violations
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """
+    Fails a test whose API calls execute more SQL statements than budgeted.
+
+    The failure lists the offending statements of every call over budget.
+    Only calls made with the `client` fixture, which records them, are checked.
+    """
+    recorder = getattr(item.funcargs.get("client"), "app", None)
+    if not hasattr(recorder, "requests"):
+        return (yield)
+
+    budgets = dict(QUERY_BUDGETS)
+    # Markers closest to the test come first and take precedence.
+    for marker in reversed(list(item.iter_markers("query_budget"))):
+        endpoint, budget = marker.args
+        budgets[endpoint] = budget
+
+    recorder.requests.clear()
+    result = yield
+    violations = over_budget(recorder.requests, budgets)
+    if violations:
+        pytest.fail("Query budget exceeded\n" + "\n".join(violations), pytrace=False)
+    return result
@@ -0,0 +1,93 @@
+from unittest.mock import AsyncMock, Mock
+from prometheus_client import REGISTRY
+
+from main import app
+from src.services.throttle import AuthThrottle, get_auth_throttle
+
+
+def rejections(scope: str) -> float:
+    return REGISTRY.get_sample_value(
+        "auth_throttle_rejections_total", {"scope": scope}
+    ) or 0.0
+
+
+def test_login_throttled_before_db_lookup(client, monkeypatch):
+    throttle = AuthThrottle(max_failures=1, base_delay=60)
+    rejected = rejections("account")
+    app.dependency_overrides[get_auth_throttle] = lambda: throttle
+    mock_user_service = Mock()
+    mock_user_service.return_value.get_user_by_username = AsyncMock(return_value=None)
+    monkeypatch.setattr("src.routes.auth.UserService", mock_user_service)
+
+    try:
+        response = client.post(
+            "api/auth/login", data={"username": "victim", "password": "guess"}
+        )
+        assert response.status_code == 401, response.text
+
+        mock_user_service.reset_mock()
+        response = client.post(
+            "api/auth/login", data={"username": "Victim", "password": "guess"}
+        )
+    finally:
+        app.dependency_overrides.pop(get_auth_throttle)
+
+    assert response.status_code == 429, response.text
+    assert response.headers["Retry-After"] == "60"
+    assert rejections("account") == rejected + 1
+    mock_user_service.assert_not_called()
+
+
+def test_register_throttled_by_ip(client, monkeypatch):
+    throttle = AuthThrottle(max_ip_attempts=1, base_delay=30)
+    rejected = rejections("ip")
+    app.dependency_overrides[get_auth_throttle] = lambda: throttle
+    mock_user_service = Mock()
+    mock_user_service.return_value.get_user_by_email = AsyncMock(return_value=Mock())
+    monkeypatch.setattr("src.routes.auth.UserService", mock_user_service)
+    payload = {
+        "username": "spammer",
+        "email": "spammer@example.com",
+        "password": "password",
+        "role": "user",
+    }
+
+    try:
+        response = client.post("api/auth/register", json=payload)
+        assert response.status_code == 409, response.text
+
+        mock_user_service.reset_mock()
+        response = client.post("api/auth/register", json=payload)
+    finally:
+        app.dependency_overrides.pop(get_auth_throttle)
+
+    assert response.status_code == 429, response.text
+    assert rejections("ip") == rejected + 1
+    mock_user_service.assert_not_called()
+
+
+def test_login_counts_only_failures_against_ip(client, monkeypatch):
+    throttle = AuthThrottle(max_ip_attempts=1, base_delay=30)
+    app.dependency_overrides[get_auth_throttle] = lambda: throttle
+    user = Mock(username="shared", confirmed=True, hashed_password="hash")
+    mock_user_service = Mock()
+    mock_user_service.return_value.get_user_by_username = AsyncMock(return_value=user)
+    monkeypatch.setattr("src.routes.auth.UserService", mock_user_service)
+    mock_hash = Mock()
+    mock_hash.return_value.verify_password_async = AsyncMock(return_value=True)
+    monkeypatch.setattr("src.routes.auth.Hash", mock_hash)
+    form = {"username": "shared", "password": "password"}
+
+    try:
+        for _ in range(3):
+            response = client.post("api/auth/login", data=form)
+            assert response.status_code == 200, response.text
+
+        mock_hash.return_value.verify_password_async.return_value = False
+        response = client.post("api/auth/login", data=form)
+        assert response.status_code == 401, response.text
+        response = client.post("api/auth/login", data=form)
+    finally:
+        app.dependency_overrides.pop(get_auth_throttle)
+
+    assert response.status_code == 429, response.text
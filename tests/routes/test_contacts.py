@@ -79,7 +79,7 @@ async def test_get_contacts_no_filters(client, monkeypatch, headers):
     assert response.status_code == 200
     assert len(response.json()) == len(contacts)
     assert response.json()[0]["email"] == contacts[0]["email"]
-    mock_get_contacts.assert_called_once_with("", "", "", 0, 100, user_data)
+    mock_get_contacts.assert_called_once_with("", "", "", 0, 100, user_data, fields=None, after=None)
 
 @pytest.mark.asyncio
 async def test_get_contacts_with_filters(client, monkeypatch, headers):
@@ -92,7 +92,7 @@ async def test_get_contacts_with_filters(client, monkeypatch, headers):
     assert response.status_code == 200
     assert len(response.json()) == len(filtered_contacts)
     assert response.json()[0]["name"] == "Charlie"
-    mock_get_contacts.assert_called_once_with("Charlie", "Smith", "", 0, 100, user_data)
+    mock_get_contacts.assert_called_once_with("Charlie", "Smith", "", 0, 100, user_data, fields=None, after=None)
 
 @pytest.mark.asyncio
 async def test_get_contacts_pagination(client, monkeypatch, headers):
@@ -116,7 +116,49 @@ async def test_get_contacts_pagination(client, monkeypatch, headers):
     assert response.status_code == 200
     assert len(response.json()) == len(paginated_contacts)
     assert response.json()[0]["id"] == 3
-    mock_get_contacts.assert_called_once_with("", "", "", 2, 1, user_data)
+    mock_get_contacts.assert_called_once_with("", "", "", 2, 1, user_data, fields=None, after=None)
+
+@pytest.mark.asyncio
+async def test_get_contacts_sparse_fields_after_cursor(client, monkeypatch, headers):
+    sparse_contacts = [
+        {"id": 4, "name": "Dana", "surname": "Brown", "phone": "555-000-1111"}
+    ]
+    mock_get_contacts = AsyncMock(return_value=sparse_contacts)
+    monkeypatch.setattr("src.conf.contacts.ContactService.get_contacts", mock_get_contacts)
+
+    response = client.get(
+        "/api/contacts/?fields=phone, name,surname&after=3&name=Da", headers=headers
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json() == sparse_contacts
+    mock_get_contacts.assert_called_once_with(
+        "Da", "", "", 0, 100, user_data,
+        fields=("name", "surname", "phone", "id"), after=3,
+    )
+
+@pytest.mark.asyncio
+async def test_get_contacts_rate_limit_headers(client, monkeypatch, headers):
+    monkeypatch.setattr(
+        "src.conf.contacts.ContactService.get_contacts", AsyncMock(return_value=[])
+    )
+
+    response = client.get("/api/contacts/", headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["X-RateLimit-Limit"] == "120"
+    assert int(response.headers["X-RateLimit-Remaining"]) < 120
+
+@pytest.mark.asyncio
+async def test_get_contacts_unknown_fields(client, monkeypatch, headers):
+    mock_get_contacts = AsyncMock(return_value=[])
+    monkeypatch.setattr("src.conf.contacts.ContactService.get_contacts", mock_get_contacts)
+
+    response = client.get("/api/contacts/?fields=name,password", headers=headers)
+
+    assert response.status_code == 422
+    assert "Unknown fields: password" in response.json()["detail"]
+    mock_get_contacts.assert_not_called()
 
 @pytest.mark.asyncio
 async def test_get_contact_success(client, monkeypatch, headers):
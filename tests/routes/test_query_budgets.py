@@ -0,0 +1,71 @@
+import pytest
+
+from tests.routes.conftest import QUERY_BUDGETS, over_budget
+
+payload = {
+    "name": "Budget",
+    "surname": "Queries",
+    "email": "budget.queries@example.com",
+    "phone": "050-111-22-33",
+    "birthday": "1990-03-15",
+}
+
+
+@pytest.fixture
+def headers(get_token):
+    return {"Authorization": f"Bearer {get_token}"}
+
+
+def statements_of(client, endpoint):
+    return [statements for name, statements in client.app.requests if name == endpoint]
+
+
+def test_contact_endpoints_within_budget(client, headers):
+    response = client.post("/api/contacts/", json=payload, headers=headers)
+    assert response.status_code == 201, response.text
+    contact_id = response.json()["id"]
+
+    assert client.get("/api/contacts/", headers=headers).status_code == 200
+    assert client.get(f"/api/contacts/{contact_id}", headers=headers).status_code == 200
+    response = client.put(
+        f"/api/contacts/{contact_id}", json={**payload, "info": "Updated"}, headers=headers
+    )
+    assert response.status_code == 200, response.text
+    assert client.delete(f"/api/contacts/{contact_id}", headers=headers).status_code == 200
+
+    # Every call was recorded; the budgets themselves are checked by the plugin.
+    recorded = [endpoint for endpoint, _ in client.app.requests]
+    assert recorded == [
+        "POST /api/contacts/",
+        "GET /api/contacts/",
+        "GET /api/contacts/{contact_id}",
+        "PUT /api/contacts/{contact_id}",
+        "DELETE /api/contacts/{contact_id}",
+    ]
+    assert all(endpoint in QUERY_BUDGETS for endpoint in recorded)
+
+
+def test_statements_are_recorded_per_endpoint(client, headers):
+    client.get("/api/contacts/", headers=headers)
+
+    [statements] = statements_of(client, "GET /api/contacts/")
+    assert any("FROM contacts" in sql for sql, _ in statements)
+
+
+def test_over_budget_lists_statements():
+    requests = [
+        ("GET /api/contacts/", [("SELECT 1", ())]),
+        (
+            "PUT /api/contacts/{contact_id}",
+            [("SELECT  *\n FROM contacts", (1,)), ("UPDATE contacts", ("x", 1))],
+        ),
+    ]
+
+    budgets = {"GET /api/contacts/": 1, "PUT /api/contacts/{contact_id}": 1}
+    violations = over_budget(requests, budgets)
+
+    assert violations == [
+        "PUT /api/contacts/{contact_id} executed 2 statements (budget 1):\n"
+        "  1. SELECT * FROM contacts  (1,)\n"
+        "  2. UPDATE contacts  ('x', 1)"
+    ]
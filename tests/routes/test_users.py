@@ -59,3 +59,41 @@ async def test_me_unauthenticated(client, monkeypatch):
 
     assert response.status_code == 401
     assert response.json()["detail"] == "Not authenticated"
+
+
+@pytest.mark.asyncio
+async def test_update_avatar(client, auth_headers, monkeypatch):
+    from main import app
+    from src.services.auth import get_current_admin_user
+    from src.services.upload_file import get_upload_service
+
+    avatar_url = "https://example.com/new-avatar.png"
+    mock_upload_service = MagicMock()
+    mock_upload_service.upload_file = AsyncMock(return_value=avatar_url)
+    mock_update_avatar_url = AsyncMock(
+        return_value={**user_data_admin, "avatar": avatar_url}
+    )
+    monkeypatch.setattr(
+        "src.routes.users.UserService.update_avatar_url", mock_update_avatar_url
+    )
+
+    app.dependency_overrides[get_current_admin_user] = lambda: MagicMock(
+        **user_data_admin
+    )
+    app.dependency_overrides[get_upload_service] = lambda: mock_upload_service
+
+    try:
+        response = client.patch(
+            "/api/users/avatar",
+            headers=auth_headers,
+            files={"file": ("avatar.png", b"image-bytes", "image/png")},
+        )
+    finally:
+        # Keeps the get_db override of the client fixture.
+        app.dependency_overrides.pop(get_current_admin_user)
+        app.dependency_overrides.pop(get_upload_service)
+
+    assert response.status_code == 200, response.text
+    assert response.json()["avatar"] == avatar_url
+    mock_upload_service.upload_file.assert_awaited_once()
+    mock_update_avatar_url.assert_awaited_once_with(user_data_admin["email"], avatar_url)
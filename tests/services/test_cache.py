@@ -0,0 +1,287 @@
+import asyncio
+import time
+from dataclasses import FrozenInstanceError
+from datetime import datetime
+import msgpack
+import pytest
+from unittest.mock import AsyncMock
+from aiocache import SimpleMemoryCache
+from aiocache.serializers import MsgPackSerializer
+
+from src.entity.models import User, UserRole
+from src.entity.snapshots import UserSnapshot, dump_user, load_user
+from src.services.auth import get_user_from_db
+from src.services.cache import CacheService, CircuitBreaker, cached, get_cache
+
+
+class BrokenBackend:
+    def __init__(self):
+        self.calls = 0
+
+    async def get(self, key):
+        self.calls += 1
+        raise asyncio.TimeoutError()
+
+    async def set(self, key, value, ttl=None):
+        self.calls += 1
+        raise ConnectionError("Redis is down")
+
+    async def exists(self, key):
+        raise ConnectionError("Redis is down")
+
+
+def test_circuit_breaker_opens_and_half_opens(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("src.services.cache.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    now[0] += 10
+    assert breaker.state == "half-open"
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_circuit_breaker_allows_one_trial_call(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("src.services.cache.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    now[0] += 10
+
+    # Concurrent callers: only the first one probes the dependency.
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    now[0] += 10
+    assert breaker.allow()
+
+    # The trial never recorded a result: another one is allowed later.
+    now[0] += 10
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.allow() and breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_cache_falls_back_to_memory():
+    backend = BrokenBackend()
+    cache = CacheService(
+        backend, SimpleMemoryCache(), CircuitBreaker(failure_threshold=1)
+    )
+
+    await cache.set("key", "value")
+    assert await cache.get("key") == "value"
+
+    # The circuit is open, so the backend is not called again.
+    assert backend.calls == 1
+    metrics = cache.metrics()
+    assert metrics["circuit"] == "open"
+    assert metrics["errors"] == 1
+    assert metrics["fallback"] == 2
+    assert metrics["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_without_fallback_misses():
+    cache = CacheService(BrokenBackend())
+
+    assert await cache.get("key") is None
+    assert cache.metrics()["misses"] == 1
+
+    health = await cache.health()
+    assert health["status"] == "unavailable"
+
+
+@pytest.mark.asyncio
+async def test_cached_decorator(monkeypatch):
+    cache = CacheService(SimpleMemoryCache())
+    monkeypatch.setattr("src.services.cache.get_cache", lambda: cache)
+    loader = AsyncMock(return_value={"id": 1})
+
+    @cached(ttl=60, key_builder=lambda func, args, kwargs: f"item:{args[0]}")
+    async def load(item_id):
+        return await loader(item_id)
+
+    assert await load(1) == {"id": 1}
+    assert await load(1) == {"id": 1}
+    loader.assert_awaited_once_with(1)
+    assert (await cache.get("item:1"))["value"] == {"id": 1}
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_single_flight():
+    cache = CacheService(SimpleMemoryCache(), early_refresh_beta=0)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "user"
+
+    results = await asyncio.gather(
+        *[cache.get_or_load("user:1", loader, ttl=60) for _ in range(10)]
+    )
+
+    assert results == ["user"] * 10
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_error_shared_by_waiters():
+    cache = CacheService(SimpleMemoryCache())
+
+    async def loader():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("database is down")
+
+    results = await asyncio.gather(
+        *[cache.get_or_load("user:1", loader, ttl=60) for _ in range(3)],
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert await cache.get("user:1") is None
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_waiter_takes_over_cancelled_load():
+    cache = CacheService(SimpleMemoryCache(), early_refresh_beta=0)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "user"
+
+    leader = asyncio.create_task(cache.get_or_load("user:1", loader, ttl=60))
+    await asyncio.sleep(0.01)
+    waiters = [
+        asyncio.create_task(cache.get_or_load("user:1", loader, ttl=60)) for _ in range(3)
+    ]
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    assert await asyncio.gather(*waiters) == ["user"] * 3
+    assert leader.cancelled()
+    assert calls == 2
+    assert (await cache.get("user:1"))["value"] == "user"
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_lock_across_processes():
+    # Two services over one backend imitate two worker processes.
+    backend = SimpleMemoryCache()
+    first = CacheService(backend, lock_enabled=True, early_refresh_beta=0)
+    second = CacheService(backend, lock_enabled=True, early_refresh_beta=0)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "user"
+
+    results = await asyncio.gather(
+        first.get_or_load("user:1", loader, ttl=60),
+        second.get_or_load("user:1", loader, ttl=60),
+    )
+
+    assert results == ["user", "user"]
+    assert calls == 1
+    assert not await backend.exists("user:1:lock")
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_early_refresh():
+    cache = CacheService(SimpleMemoryCache(), early_refresh_beta=1_000_000)
+    loader = AsyncMock(return_value="fresh")
+    await cache.set("user:1", {"value": "stale", "delta": 1.0, "expires": time.time() + 5})
+
+    assert await cache.get_or_load("user:1", loader, ttl=60) == "fresh"
+    loader.assert_awaited_once()
+
+    cache.early_refresh_beta = 0
+    assert await cache.get_or_load("user:1", loader, ttl=60) == "fresh"
+    loader.assert_awaited_once()
+
+
+def test_cache_healthchecker(client):
+    get_cache.cache_clear()
+
+    response = client.get("/api/healthchecker/cache")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "ok"
+    assert data["circuit"] == "closed"
+    assert "hit_ratio" in data
+
+
+def test_user_snapshot_roundtrip():
+    user = User(
+        id=5,
+        username="kate",
+        email="kate@example.com",
+        hashed_password="secret-hash",
+        avatar=None,
+        confirmed=True,
+        role=UserRole.ADMIN,
+        created_at=datetime(2024, 5, 1, 10, 0),
+    )
+
+    data = msgpack.loads(msgpack.dumps(dump_user(user)))
+    snapshot = load_user(data)
+
+    assert snapshot == UserSnapshot(
+        id=5,
+        username="kate",
+        email="kate@example.com",
+        avatar=None,
+        confirmed=True,
+        role=UserRole.ADMIN,
+        created_at=datetime(2024, 5, 1, 10, 0),
+    )
+    assert "secret-hash" not in data
+    with pytest.raises(FrozenInstanceError):
+        snapshot.avatar = "changed"
+
+
+def test_user_snapshot_other_version():
+    assert load_user([0, 1, "kate"]) is None
+    assert load_user({"id": 1}) is None
+
+
+@pytest.mark.asyncio
+async def test_get_user_from_db_returns_snapshots(monkeypatch):
+    cache = CacheService(SimpleMemoryCache(serializer=MsgPackSerializer()))
+    monkeypatch.setattr("src.services.cache.get_cache", lambda: cache)
+    orm_user = User(
+        id=7,
+        username="max",
+        email="max@example.com",
+        avatar="https://example.com/max.png",
+        confirmed=False,
+        role=UserRole.USER,
+    )
+    mock_get_user = AsyncMock(return_value=orm_user)
+    monkeypatch.setattr(
+        "src.services.auth.UserService.get_user_by_username", mock_get_user
+    )
+
+    first = await get_user_from_db("max", None)
+    second = await get_user_from_db("max", None)
+
+    assert isinstance(first, UserSnapshot)
+    assert first == second
+    assert first.email == "max@example.com"
+    mock_get_user.assert_awaited_once_with("max")
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import pytest
+
+from main import app
+from src.conf.config import settings
+from src.services.health import HealthChecker, get_health_checker
+
+
+async def ok():
+    return "ok"
+
+
+async def degraded():
+    return "degraded"
+
+
+async def refused():
+    raise ConnectionRefusedError("Connection refused")
+
+
+async def hangs():
+    await asyncio.sleep(1)
+    return "ok"
+
+
+@pytest.fixture
+def checker():
+    checker = HealthChecker({"db": ok, "cache": degraded}, interval=10, timeout=0.05)
+    app.dependency_overrides[get_health_checker] = lambda: checker
+    yield checker
+    app.dependency_overrides.pop(get_health_checker)
+
+
+def test_liveness_does_not_touch_the_database(client, monkeypatch):
+    monkeypatch.setattr(settings, "DEBUG", True)
+
+    response = client.get("/api/healthchecker/live")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "alive"}
+    assert response.headers["X-DB-Query-Count"] == "0"
+
+
+def test_readiness_before_first_check(client, checker):
+    response = client.get("/api/healthchecker/ready")
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "starting"
+
+
+def test_readiness_reports_last_results(client, checker, monkeypatch):
+    asyncio.run(checker.check_all())
+    monkeypatch.setattr(settings, "DEBUG", True)
+
+    response = client.get("/api/healthchecker/ready")
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["status"] == "ready"
+    assert body["checks"]["db"]["status"] == "ok"
+    # A degraded cache falls back to memory and does not make the worker unready.
+    assert body["checks"]["cache"]["status"] == "degraded"
+    assert response.headers["X-DB-Query-Count"] == "0"
+
+
+def test_not_ready_when_database_is_down(client, checker, caplog):
+    asyncio.run(checker.check_all())
+    checker.checks["db"] = refused
+
+    with caplog.at_level(logging.WARNING, logger="healthchecker"):
+        asyncio.run(checker.check_all())
+
+    response = client.get("/api/healthchecker/ready")
+    assert response.status_code == 503
+    db = response.json()["checks"]["db"]
+    assert db["status"] == "down"
+    assert "Connection refused" in db["error"]
+    assert "Dependency 'db' is down (was ok)" in caplog.text
+
+
+def test_not_ready_when_results_are_stale(checker):
+    asyncio.run(checker.check_all())
+    checker.checked_at -= checker.interval * 4
+
+    assert checker.report()["status"] == "not_ready"
+
+
+@pytest.mark.asyncio
+async def test_slow_check_times_out():
+    checker = HealthChecker({"db": hangs}, timeout=0.05)
+
+    await checker.check_all()
+
+    assert checker.results["db"]["status"] == "down"
+    assert checker.results["db"]["latency_ms"] < 500
+
+
+@pytest.mark.asyncio
+async def test_background_checks():
+    calls = []
+
+    async def counted():
+        calls.append(1)
+        return "ok"
+
+    checker = HealthChecker({"db": counted}, interval=0.01)
+    checker.start()
+    await asyncio.sleep(0.05)
+    await checker.stop()
+
+    assert len(calls) >= 2
+    assert checker.report()["status"] == "ready"
@@ -0,0 +1,99 @@
+import io
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from fastapi import HTTPException
+from PIL import Image
+
+from src.services.image import (
+    AvatarImageProcessor,
+    InvalidImageError,
+    normalize_avatar,
+)
+
+
+def make_image(width: int, height: int, image_format: str = "PNG") -> bytes:
+    output = io.BytesIO()
+    Image.new("RGB", (width, height), color=(200, 10, 10)).save(
+        output, format=image_format
+    )
+    return output.getvalue()
+
+
+def make_upload(data: bytes, content_type: str = "image/png"):
+    file = MagicMock()
+    file.content_type = content_type
+    chunks = [data[i : i + 1024] for i in range(0, len(data), 1024)] + [b""]
+    file.read = AsyncMock(side_effect=chunks)
+    return file
+
+
+def test_normalize_avatar():
+    result = normalize_avatar(make_image(800, 600), 250, "WEBP", 80, 10_000_000)
+
+    with Image.open(io.BytesIO(result)) as img:
+        assert img.format == "WEBP"
+        assert img.size == (250, 250)
+
+
+def test_normalize_avatar_invalid_data():
+    with pytest.raises(InvalidImageError):
+        normalize_avatar(b"not an image", 250, "WEBP", 80, 10_000_000)
+
+
+def test_normalize_avatar_too_many_pixels():
+    with pytest.raises(InvalidImageError):
+        normalize_avatar(make_image(400, 400), 250, "JPEG", 80, 100_000)
+
+
+@pytest.mark.asyncio
+async def test_read_upload_too_large():
+    processor = AvatarImageProcessor(max_upload_bytes=2048)
+
+    with pytest.raises(HTTPException) as exc:
+        await processor.read_upload(make_upload(b"x" * 5000))
+
+    assert exc.value.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_read_upload_not_image():
+    processor = AvatarImageProcessor()
+
+    with pytest.raises(HTTPException) as exc:
+        await processor.read_upload(make_upload(b"text", "text/plain"))
+
+    assert exc.value.status_code == 415
+
+
+@pytest.mark.asyncio
+async def test_process():
+    processor = AvatarImageProcessor(size=64, image_format="JPEG", workers=1)
+    try:
+        result = await processor.process(make_upload(make_image(300, 200)))
+    finally:
+        processor.shutdown()
+
+    with Image.open(io.BytesIO(result)) as img:
+        assert img.format == "JPEG"
+        assert img.size == (64, 64)
+
+
+@pytest.mark.asyncio
+async def test_process_invalid_image():
+    processor = AvatarImageProcessor(workers=1)
+    try:
+        with pytest.raises(HTTPException) as exc:
+            await processor.process(make_upload(b"broken image bytes"))
+    finally:
+        processor.shutdown()
+
+    assert exc.value.status_code == 400
+
+
+def test_executor_does_not_fork():
+    processor = AvatarImageProcessor(workers=1)
+    try:
+        executor = processor._get_executor()
+        assert executor._mp_context.get_start_method() in ("forkserver", "spawn")
+    finally:
+        processor.shutdown()
@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import pytest
+from unittest.mock import Mock
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from main import app
+from src.conf.config import settings
+from src.database.db import get_db
+from src.database.instrumentation import (
+    QueryStats,
+    explain,
+    get_query_stats,
+    instrument_engine,
+    start_query_stats,
+)
+
+
+@pytest.fixture
+def instrumented_engine():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    instrument_engine(engine)
+    yield engine
+    asyncio.run(engine.dispose())
+
+
+def test_query_stats_repeated():
+    stats = QueryStats()
+    for _ in range(3):
+        stats.record("SELECT * FROM contacts WHERE id = ?", 0.002)
+    stats.record("SELECT * FROM users", 0.01)
+
+    assert stats.count == 4
+    assert stats.slowest_statement == "SELECT * FROM users"
+    assert stats.repeated(3) == [("SELECT * FROM contacts WHERE id = ?", 3)]
+    assert stats.repeated(4) == []
+
+
+@pytest.mark.asyncio
+async def test_engine_records_statements(instrumented_engine, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "SQL_SLOW_QUERY_MS", 0)
+    stats = start_query_stats()
+
+    with caplog.at_level(logging.WARNING, logger="sql"):
+        async with instrumented_engine.connect() as conn:
+            result = await conn.execute(text("SELECT :value"), {"value": 7})
+            assert result.scalar_one() == 7
+            await conn.execute(text("SELECT 1"))
+
+    assert get_query_stats() is stats
+    assert stats.count == 2
+    assert stats.total_time >= stats.slowest_time > 0
+    assert "Slow query" in caplog.text
+    assert "Plan:" in caplog.text
+
+
+def test_failed_explain_keeps_transaction(instrumented_engine):
+    def explain_missing_table(sync_conn):
+        return explain(sync_conn, "SELECT * FROM missing", ())
+
+    async def run():
+        async with instrumented_engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE notes (body TEXT)"))
+            await conn.execute(text("INSERT INTO notes VALUES ('kept')"))
+            plan = await conn.run_sync(explain_missing_table)
+            result = await conn.execute(text("SELECT body FROM notes"))
+            return plan, result.scalars().all()
+
+    assert asyncio.run(run()) == (None, ["kept"])
+
+
+def test_failed_explain_rolls_back_to_savepoint():
+    connection = Mock()
+    connection.dialect.name = "postgresql"
+    cursor = connection.connection.cursor.return_value
+    executed = []
+
+    def execute(sql, parameters=None):
+        executed.append(sql.split(" SELECT")[0])
+        if sql.startswith("EXPLAIN"):
+            raise RuntimeError("permission denied")
+
+    cursor.execute.side_effect = execute
+
+    assert explain(connection, "SELECT * FROM contacts", ()) is None
+    assert executed == [
+        "SAVEPOINT explain_slow_query",
+        "EXPLAIN",
+        "ROLLBACK TO SAVEPOINT explain_slow_query",
+        "RELEASE SAVEPOINT explain_slow_query",
+    ]
+    cursor.close.assert_called_once()
+
+
+def test_debug_headers(client, instrumented_engine, monkeypatch):
+    monkeypatch.setattr(settings, "DEBUG", True)
+
+    async def override_get_db():
+        async with AsyncSession(instrumented_engine) as session:
+            yield session
+
+    previous = app.dependency_overrides[get_db]
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        response = client.get("/api/healthchecker")
+    finally:
+        app.dependency_overrides[get_db] = previous
+
+    assert response.status_code == 200, response.text
+    assert response.headers["X-DB-Query-Count"] == "1"
+    labels = {"route": "/api/healthchecker"}
+    assert (REGISTRY.get_sample_value("db_queries_per_request_sum", labels) or 0.0) >= 1
+    assert (REGISTRY.get_sample_value("db_time_per_request_seconds_count", labels) or 0.0) >= 1
+    assert float(response.headers["X-DB-Time-Ms"]) > 0
+
+    metrics = client.get("/api/healthchecker/db").json()
+    assert metrics["queries"] >= 1
+    assert metrics["requests"] >= 1
+
+
+def test_no_debug_headers_by_default(client):
+    response = client.get("/api/healthchecker/db")
+
+    assert response.status_code == 200
+    assert "X-DB-Query-Count" not in response.headers
@@ -0,0 +1,71 @@
+import logging
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.conf.config import settings
+from src.database.db import DatabaseSessionManager
+from src.entity.models import Base
+from src.services import lifecycle
+from src.services.metrics import STARTUP_TIME
+
+
+@pytest.fixture
+async def manager(tmp_path, monkeypatch):
+    # File SQLite databases use a NullPool by default, which keeps no connections.
+    monkeypatch.setattr(
+        "src.database.db.create_async_engine",
+        lambda url: create_async_engine(url, poolclass=AsyncAdaptedQueuePool),
+    )
+    manager = DatabaseSessionManager(f"sqlite+aiosqlite:///{tmp_path / 'warmup.db'}")
+    async with manager.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    monkeypatch.setattr(lifecycle, "sessionmanager", manager)
+    yield manager
+    await manager.dispose()
+
+
+@pytest.mark.asyncio
+async def test_warm_up_opens_connections_and_primes_statements(manager, monkeypatch):
+    monkeypatch.setattr(settings, "DB_WARMUP_CONNECTIONS", 3)
+    await manager.dispose()
+    cache = manager.engine.sync_engine._compiled_cache
+
+    timings = await lifecycle.warm_up()
+
+    assert set(timings) == {"modules", "db_pool", "statements", "cache"}
+    assert manager.engine.pool.checkedin() == 3
+    assert len(cache) >= 6
+
+
+@pytest.mark.asyncio
+async def test_failing_step_is_skipped(manager, monkeypatch, caplog):
+    def broken_cache():
+        raise ConnectionError("Redis is down")
+
+    monkeypatch.setattr(lifecycle, "get_cache", broken_cache)
+
+    with caplog.at_level(logging.WARNING, logger=lifecycle.__name__):
+        timings = await lifecycle.warm_up()
+
+    assert "cache" in timings
+    assert "Warmup step 'cache' failed" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_drain_closes_pool(manager, monkeypatch):
+    await manager.warmup(2)
+    assert manager.engine.pool.checkedin() == 2
+
+    await lifecycle.drain()
+
+    assert manager.engine.pool.checkedin() == 0
+
+
+def test_record_startup(caplog):
+    with caplog.at_level(logging.INFO, logger=lifecycle.__name__):
+        lifecycle.record_startup(0.5, 0.25, {"db_pool": 10.0})
+
+    assert STARTUP_TIME.labels("import")._value.get() == 0.5
+    assert STARTUP_TIME.labels("lifespan")._value.get() == 0.25
+    assert "Worker ready in 750 ms" in caplog.text
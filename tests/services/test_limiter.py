@@ -0,0 +1,93 @@
+import fakeredis
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from main import rate_limit_handler
+from src.services.limiter import RateLimitExceeded, create_limiter
+
+
+@pytest.fixture
+def redis_server():
+    return fakeredis.FakeServer()
+
+
+def make_client(limiter) -> TestClient:
+    app = FastAPI()
+    app.add_exception_handler(RateLimitExceeded, rate_limit_handler)
+
+    @app.get("/limited")
+    @limiter.limit("2/minute")
+    async def limited(request: Request, response: Response):
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_redis_limiter_shared_between_workers(redis_server):
+    # Two limiters with the same Redis imitate two worker processes.
+    first_worker = make_client(
+        create_limiter(
+            "redis://localhost:6379",
+            "moving-window",
+            fakeredis.FakeAsyncRedis(server=redis_server),
+        )
+    )
+    second_worker = make_client(
+        create_limiter(
+            "redis://localhost:6379",
+            "moving-window",
+            fakeredis.FakeAsyncRedis(server=redis_server),
+        )
+    )
+
+    response = first_worker.get("/limited")
+    assert response.status_code == 200
+    assert response.headers["X-RateLimit-Limit"] == "2"
+    assert response.headers["X-RateLimit-Remaining"] == "1"
+
+    assert second_worker.get("/limited").status_code == 200
+
+    response = first_worker.get("/limited")
+    assert response.status_code == 429
+    assert response.headers["X-RateLimit-Remaining"] == "0"
+    assert "Retry-After" in response.headers
+
+
+def test_limiter_falls_back_to_memory():
+    # Nothing listens on port 1, so every Redis call fails immediately.
+    client = make_client(create_limiter("redis://127.0.0.1:1", "moving-window"))
+
+    assert client.get("/limited").status_code == 200
+    assert client.get("/limited").status_code == 200
+    assert client.get("/limited").status_code == 429
+
+
+def test_limiter_skips_storage_while_circuit_is_open(redis_server):
+    limiter = create_limiter(
+        "redis://localhost:6379",
+        "moving-window",
+        fakeredis.FakeAsyncRedis(server=redis_server),
+    )
+    client = make_client(limiter)
+    redis_server.connected = False
+
+    statuses = [client.get("/limited").status_code for _ in range(3)]
+    assert statuses == [200, 200, 429]
+    assert limiter.breaker.state == "open"
+
+    # While the circuit is open, requests are counted in memory only.
+    redis_server.connected = True
+    assert client.get("/limited").status_code == 429
+    assert not fakeredis.FakeRedis(server=redis_server).keys()
+
+
+def test_disabled_limiter_passes_requests():
+    limiter = create_limiter("memory://", "moving-window")
+    limiter.enabled = False
+    client = make_client(limiter)
+
+    for _ in range(3):
+        response = client.get("/limited")
+        assert response.status_code == 200
+        assert "X-RateLimit-Limit" not in response.headers
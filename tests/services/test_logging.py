@@ -0,0 +1,70 @@
+import json
+import logging
+import queue
+
+from src.conf.logging_config import (
+    ContextFilter,
+    DroppingQueueHandler,
+    JsonFormatter,
+    SamplingFilter,
+    _log_context,
+    bind_log_context,
+)
+
+
+def make_record(name="app", level=logging.INFO, msg="hello %s", args=("world",), **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_includes_context_and_extra():
+    token = _log_context.set({"request_id": "abc", "user_id": None, "started": 0.0})
+    try:
+        bind_log_context(user_id=7)
+        record = make_record(duration_ms=12.5)
+        ContextFilter().filter(record)
+    finally:
+        _log_context.reset(token)
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["message"] == "hello world"
+    assert entry["level"] == "INFO"
+    assert entry["request_id"] == "abc"
+    assert entry["user_id"] == 7
+    assert entry["duration_ms"] == 12.5
+    assert "elapsed_ms" in entry
+
+
+def test_sampling_filter_keeps_warnings():
+    sampling = SamplingFilter({"access": 0.0})
+
+    assert not sampling.filter(make_record(name="access"))
+    assert sampling.filter(make_record(name="access", level=logging.WARNING))
+    assert sampling.filter(make_record(name="sql"))
+
+
+def test_queue_handler_drops_when_full():
+    handler = DroppingQueueHandler(queue.Queue(1))
+    dropped = DroppingQueueHandler.dropped
+
+    handler.handle(make_record())
+    handler.handle(make_record())
+
+    assert handler.queue.get_nowait().msg == "hello world"
+    assert DroppingQueueHandler.dropped == dropped + 1
+
+
+def test_request_id_header(client, caplog):
+    with caplog.at_level(logging.INFO, logger="access"):
+        response = client.get("/api/healthchecker/db", headers={"X-Request-ID": "req-1"})
+
+    assert response.headers["X-Request-ID"] == "req-1"
+    record = next(r for r in caplog.records if r.name == "access")
+    assert record.status == 200
+    assert record.path == "/api/healthchecker/db"
+    assert record.duration_ms >= 0
+
+    response = client.get("/api/healthchecker/db")
+    assert len(response.headers["X-Request-ID"]) == 32
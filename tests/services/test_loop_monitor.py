@@ -0,0 +1,53 @@
+import asyncio
+import time
+import pytest
+from prometheus_client import REGISTRY
+
+from src.services.loop_monitor import LoopLagMonitor
+
+
+def blocking_handler():
+    time.sleep(0.3)
+
+
+@pytest.mark.asyncio
+async def test_monitor_captures_blocking_stack():
+    monitor = LoopLagMonitor(interval=0.02, threshold=0.1)
+    before = REGISTRY.get_sample_value("event_loop_blocks_total") or 0.0
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        blocking_handler()
+        await asyncio.sleep(0.05)
+    finally:
+        await monitor.stop()
+
+    assert len(monitor.reports) == 1
+    assert "blocking_handler" in monitor.reports[0]
+    assert REGISTRY.get_sample_value("event_loop_blocks_total") == before + 1
+    assert REGISTRY.get_sample_value("event_loop_lag_seconds_count") > 0
+
+
+@pytest.mark.asyncio
+async def test_monitor_quiet_without_blocking():
+    monitor = LoopLagMonitor(interval=0.02, threshold=0.2)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.1)
+    finally:
+        await monitor.stop()
+
+    assert not monitor.reports
+
+
+@pytest.mark.asyncio
+async def test_monitor_does_not_count_idle_interval():
+    # The sleep between measurements is longer than the threshold.
+    monitor = LoopLagMonitor(interval=0.3, threshold=0.1)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.7)
+    finally:
+        await monitor.stop()
+
+    assert not monitor.reports
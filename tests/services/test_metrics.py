@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+from fastapi import BackgroundTasks
+from prometheus_client import REGISTRY
+from unittest.mock import AsyncMock
+
+from src.conf.email import queue_email
+from src.services.auth import Hash
+
+
+def sample(name: str, labels: dict | None = None) -> float:
+    return REGISTRY.get_sample_value(name, labels or {}) or 0.0
+
+
+def test_metrics_endpoint_records_route_latency(client):
+    labels = {"method": "GET", "route": "/api/healthchecker/db", "status": "200"}
+    before = sample("http_request_duration_seconds_count", labels)
+
+    client.get("/api/healthchecker/db")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert sample("http_request_duration_seconds_count", labels) == before + 1
+    assert 'route="/api/healthchecker/db"' in response.text
+    assert "http_requests_in_flight" in response.text
+
+
+def test_unmatched_routes_share_one_label(client):
+    labels = {"method": "GET", "route": "unmatched", "status": "404"}
+    before = sample("http_request_duration_seconds_count", labels)
+
+    client.get("/no-such-page/1")
+    client.get("/no-such-page/2")
+
+    assert sample("http_request_duration_seconds_count", labels) == before + 2
+
+
+@pytest.mark.asyncio
+async def test_hash_async_records_queue_time():
+    before = sample("bcrypt_queue_seconds_count")
+    hash_service = Hash()
+
+    hashed = await hash_service.get_password_hash_async("password")
+
+    assert await hash_service.verify_password_async("password", hashed)
+    assert not await hash_service.verify_password_async("wrong", hashed)
+    assert sample("bcrypt_queue_seconds_count") == before + 3
+    assert sample("bcrypt_duration_seconds_count", {"operation": "verify"}) >= 2
+
+
+def test_queue_email_tracks_backlog():
+    send = AsyncMock()
+    background_tasks = BackgroundTasks()
+    before = sample("email_backlog")
+
+    queue_email(background_tasks, send, "user@example.com", username="user")
+    assert sample("email_backlog") == before + 1
+
+    asyncio.run(background_tasks())
+
+    send.assert_awaited_once_with("user@example.com", username="user")
+    assert sample("email_backlog") == before
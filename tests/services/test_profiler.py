@@ -0,0 +1,93 @@
+import asyncio
+import json
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from src.conf.config import settings
+from src.entity.models import UserRole
+from src.services.auth import create_access_token
+from tests.conftest import test_user
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def admin_headers():
+    token = asyncio.run(create_access_token(data={"sub": test_user["username"]}))
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_admin_request_profiled(client, profile_dir, admin_headers):
+    response = client.get(
+        "/api/healthchecker/db", headers={**admin_headers, "X-Profile": "speedscope"}
+    )
+
+    assert response.status_code == 200, response.text
+    profile_id = response.headers["X-Profile-Id"]
+    assert profile_id.endswith("-GET-api_healthchecker_db.speedscope.json")
+    assert (profile_dir / profile_id).is_file()
+
+    response = client.get(f"/api/profiles/{profile_id}", headers=admin_headers)
+    assert response.status_code == 200, response.text
+    assert "speedscope" in json.loads(response.content)["$schema"]
+
+
+def test_oldest_profiles_removed(client, profile_dir, admin_headers, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_MAX_FILES", 2)
+    profile_ids = [
+        client.get(
+            "/api/healthchecker/db", headers={**admin_headers, "X-Profile": "html"}
+        ).headers["X-Profile-Id"]
+        for _ in range(3)
+    ]
+
+    assert sorted(path.name for path in profile_dir.iterdir()) == sorted(profile_ids[1:])
+
+
+def test_request_without_header_not_profiled(client, profile_dir):
+    response = client.get("/api/healthchecker/db")
+
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+    assert not list(profile_dir.iterdir())
+
+
+def test_profile_requires_credentials(client, profile_dir):
+    response = client.get("/api/healthchecker/db", headers={"X-Profile": "html"})
+
+    assert response.status_code == 401, response.text
+    assert not list(profile_dir.iterdir())
+
+
+def test_profile_requires_admin(client, profile_dir, monkeypatch):
+    monkeypatch.setattr(
+        "src.services.profiler.get_current_user",
+        AsyncMock(return_value=SimpleNamespace(role=UserRole.USER)),
+    )
+
+    response = client.get(
+        "/api/healthchecker/db",
+        headers={"Authorization": "Bearer token", "X-Profile": "html"},
+    )
+
+    assert response.status_code == 403, response.text
+    assert not list(profile_dir.iterdir())
+
+
+def test_unknown_profile_format(client, profile_dir, admin_headers):
+    response = client.get(
+        "/api/healthchecker/db", headers={**admin_headers, "X-Profile": "pstats"}
+    )
+
+    assert response.status_code == 400, response.text
+
+
+def test_get_unknown_profile(client, profile_dir, admin_headers):
+    response = client.get("/api/profiles/missing.html", headers=admin_headers)
+
+    assert response.status_code == 404, response.text
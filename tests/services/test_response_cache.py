@@ -0,0 +1,120 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+from aiocache import SimpleMemoryCache
+
+from main import app
+from src.conf.config import settings
+from src.conf.contacts import ContactService
+from src.services.auth import get_current_user
+from src.services.cache import CacheService
+
+contacts = [
+    {
+        "id": 1,
+        "name": "Charlie",
+        "surname": "Smith",
+        "birthday": "1990-03-15",
+        "email": "charlie.smith@example.com",
+        "phone": "123-456-7890",
+        "created_at": "2024-01-01T00:00:00",
+        "updated_at": "2024-01-01T00:00:00",
+        "info": None,
+    }
+]
+
+
+@pytest.fixture
+def response_cache(monkeypatch):
+    cache = CacheService(SimpleMemoryCache())
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_TTL", 60)
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "redis")
+    monkeypatch.setattr("src.services.response_cache.get_cache", lambda: cache)
+    user = SimpleNamespace(id=101, username="alice")
+    app.dependency_overrides[get_current_user] = lambda: user
+    yield cache
+    app.dependency_overrides.pop(get_current_user)
+
+
+def test_get_contacts_served_from_cache(client, response_cache, monkeypatch):
+    mock_get_contacts = AsyncMock(return_value=contacts)
+    monkeypatch.setattr(
+        "src.conf.contacts.ContactService.get_contacts", mock_get_contacts
+    )
+
+    first = client.get("/api/contacts/?name=Charlie&limit=10")
+    second = client.get("/api/contacts/?limit=10&name=Charlie")
+
+    assert first.status_code == 200, first.text
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.json() == first.json() == contacts
+    mock_get_contacts.assert_awaited_once()
+
+    # Another query is another entry.
+    client.get("/api/contacts/?name=Dana&limit=10")
+    assert mock_get_contacts.await_count == 2
+
+
+def test_contact_write_invalidates_responses(client, response_cache, monkeypatch):
+    mock_get_contact = AsyncMock(return_value=contacts[0])
+    monkeypatch.setattr("src.conf.contacts.ContactService.get_contact", mock_get_contact)
+
+    client.get("/api/contacts/1")
+    assert client.get("/api/contacts/1").headers["X-Cache"] == "HIT"
+
+    mock_repository = Mock()
+    mock_repository.remove_contact = AsyncMock(return_value=contacts[0])
+    service = ContactService(AsyncMock())
+    service.repository = mock_repository
+
+    asyncio.run(service.remove_contact(1, SimpleNamespace(id=101)))
+
+    response = client.get("/api/contacts/1")
+    assert response.headers["X-Cache"] == "MISS"
+    assert mock_get_contact.await_count == 2
+
+
+def test_not_found_is_not_cached(client, response_cache, monkeypatch):
+    mock_get_contact = AsyncMock(return_value=None)
+    monkeypatch.setattr("src.conf.contacts.ContactService.get_contact", mock_get_contact)
+
+    assert client.get("/api/contacts/5").status_code == 404
+    assert client.get("/api/contacts/5").status_code == 404
+    assert mock_get_contact.await_count == 2
+
+
+def test_sparse_fields_are_cached_per_fieldset(client, response_cache, monkeypatch):
+    sparse = [{key: contacts[0][key] for key in ("id", "name", "phone")}]
+    mock_get_contacts = AsyncMock(return_value=sparse)
+    monkeypatch.setattr(
+        "src.conf.contacts.ContactService.get_contacts", mock_get_contacts
+    )
+
+    first = client.get("/api/contacts/?fields=name,phone")
+    second = client.get("/api/contacts/?fields=name,phone")
+
+    assert first.status_code == 200, first.text
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.json() == first.json() == sparse
+    mock_get_contacts.assert_awaited_once()
+
+
+@pytest.mark.parametrize("backend, failures", [("memory", 0), ("redis", 3)])
+def test_responses_not_cached_without_shared_backend(
+    client, response_cache, monkeypatch, backend, failures
+):
+    monkeypatch.setattr(settings, "CACHE_BACKEND", backend)
+    for _ in range(failures):
+        response_cache.breaker.record_failure()
+    mock_get_contact = AsyncMock(return_value=contacts[0])
+    monkeypatch.setattr("src.conf.contacts.ContactService.get_contact", mock_get_contact)
+
+    first = client.get("/api/contacts/1")
+    second = client.get("/api/contacts/1")
+
+    assert first.status_code == 200, first.text
+    assert "X-Cache" not in second.headers
+    assert second.json() == first.json() == contacts[0]
+    assert mock_get_contact.await_count == 2
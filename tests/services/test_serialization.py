@@ -0,0 +1,56 @@
+import asyncio
+import json
+from datetime import date, datetime
+from types import SimpleNamespace
+from typing import List
+
+from fastapi import Response
+from fastapi.routing import serialize_response as fastapi_serialize
+from fastapi.utils import create_model_field
+from pydantic import TypeAdapter
+
+from main import app
+from src.schemas.contacts import ContactResponse
+from src.services.serialization import model_response, serialize_response
+
+contact = SimpleNamespace(
+    id=1,
+    name="Charlie",
+    surname="Smith",
+    email="charlie.smith@example.com",
+    phone="123-456-7890",
+    birthday=date(1990, 3, 15),
+    info=None,
+    created_at=datetime(2024, 1, 1, 12, 30),
+    updated_at=None,
+)
+
+
+def test_model_response_matches_fastapi_serialization():
+    field = create_model_field("Response", List[ContactResponse], mode="serialization")
+    expected = asyncio.run(fastapi_serialize(field=field, response_content=[contact]))
+
+    response = model_response(TypeAdapter(List[ContactResponse]), [contact])
+
+    assert response.status_code == 200
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == expected
+
+
+def test_serialize_response_sets_status_and_passes_responses():
+    @serialize_response(ContactResponse, 201)
+    async def create(result):
+        return result
+
+    created = asyncio.run(create(contact))
+    assert created.status_code == 201
+    assert json.loads(created.body)["birthday"] == "1990-03-15"
+
+    error = Response(status_code=409)
+    assert asyncio.run(create(error)) is error
+
+
+def test_response_schema_keeps_email_format():
+    schema = app.openapi()["components"]["schemas"]["ContactResponse"]
+
+    assert schema["properties"]["email"]["format"] == "email"
@@ -0,0 +1,99 @@
+import os
+
+from src.conf.config import settings
+from src.conf import server
+from src.conf.server import (
+    cgroup_cpu_limit,
+    prepare_metrics_dir,
+    uvicorn_options,
+    worker_count,
+)
+
+
+def test_development_options():
+    options = uvicorn_options(production=False)
+
+    assert options["reload"] is True
+    assert "workers" not in options
+    assert options["log_config"] is None
+
+
+def test_production_options(monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 3)
+    monkeypatch.setattr(settings, "SERVER_MAX_REQUESTS", 10000)
+
+    options = uvicorn_options(production=True)
+
+    assert "reload" not in options
+    assert options["workers"] == 3
+    assert options["loop"] == "uvloop"
+    assert options["http"] == "httptools"
+    assert options["limit_max_requests"] == 10000
+    assert options["timeout_graceful_shutdown"] == settings.SERVER_GRACEFUL_TIMEOUT
+    assert options["backlog"] == settings.SERVER_BACKLOG
+
+
+def test_production_options_are_accepted_by_uvicorn(monkeypatch):
+    import uvicorn
+
+    monkeypatch.setattr(settings, "SERVER_MAX_REQUESTS", 0)
+
+    config = uvicorn.Config("main:app", **uvicorn_options(production=True))
+
+    assert config.limit_max_requests is None
+    assert config.workers == worker_count()
+
+
+def test_worker_count_defaults_to_cpus(monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 0)
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: set(range(6)), raising=False)
+    monkeypatch.setattr(server, "cgroup_cpu_limit", lambda: None)
+
+    assert worker_count() == 6
+
+
+def test_worker_count_follows_container_quota(monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 0)
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: set(range(32)), raising=False)
+    monkeypatch.setattr(server, "cgroup_cpu_limit", lambda: 1.5)
+
+    assert worker_count() == 2
+
+
+def test_cgroup_v2_cpu_limit(tmp_path):
+    (tmp_path / "cpu.max").write_text("150000 100000\n")
+    assert cgroup_cpu_limit(str(tmp_path)) == 1.5
+
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    assert cgroup_cpu_limit(str(tmp_path)) is None
+
+
+def test_cgroup_v1_cpu_limit(tmp_path):
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("50000\n")
+    assert cgroup_cpu_limit(str(tmp_path)) == 0.5
+
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("-1\n")
+    assert cgroup_cpu_limit(str(tmp_path)) is None
+    assert cgroup_cpu_limit(str(tmp_path / "missing")) is None
+
+
+def test_metrics_dir_is_emptied(tmp_path, monkeypatch):
+    path = tmp_path / "metrics"
+    path.mkdir()
+    (path / "counter_123.db").write_bytes(b"stale")
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(path))
+
+    prepare_metrics_dir(workers=2)
+
+    assert path.is_dir()
+    assert list(path.iterdir()) == []
+
+
+def test_single_worker_keeps_in_process_metrics(monkeypatch):
+    monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+
+    prepare_metrics_dir(workers=1)
+
+    assert "PROMETHEUS_MULTIPROC_DIR" not in os.environ
@@ -0,0 +1,67 @@
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent
+
+# Upper bound for importing the application in a fresh interpreter. It is about
+# 1 s on a developer machine; the margin absorbs slow CI runners.
+COLD_START_BUDGET_SECONDS = 4.0
+
+# Imported on first use or by the lifespan warmup, never by `import main`.
+LAZY_MODULES = [
+    "fastapi_mail",
+    "aiocache",
+    "redis",
+    "passlib",
+    "cloudinary",
+    "boto3",
+    "PIL",
+    "pyinstrument",
+]
+
+
+def import_main() -> tuple[float, dict]:
+    code = (
+        "import json, sys, time\n"
+        "started = time.perf_counter()\n"
+        "import main\n"
+        "elapsed = time.perf_counter() - started\n"
+        f"print(json.dumps([elapsed, {{m: m in sys.modules for m in {LAZY_MODULES!r}}}]))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_cold_start_is_within_budget():
+    started = time.perf_counter()
+    elapsed, loaded = import_main()
+
+    assert elapsed < COLD_START_BUDGET_SECONDS, (
+        f"import main took {elapsed:.2f}s; profile it with "
+        "`python -m benchmarks.import_time`"
+    )
+    assert time.perf_counter() - started < COLD_START_BUDGET_SECONDS * 2
+    assert [module for module, imported in loaded.items() if imported] == []
+
+
+def test_import_time_covers_spawned_worker_imports():
+    # A spawned worker executes main.py as __mp_main__ before uvicorn imports main.
+    code = (
+        "import json, runpy, time\n"
+        "started = time.perf_counter()\n"
+        "runpy.run_path('main.py', run_name='__mp_main__')\n"
+        "first = time.perf_counter() - started\n"
+        "import main\n"
+        "print(json.dumps([first, main.IMPORT_SECONDS]))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    first, import_seconds = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert import_seconds >= first
@@ -0,0 +1,78 @@
+import pytest
+from unittest.mock import MagicMock
+
+from src.conf.config import Settings
+from src.services.storage import CloudinaryStorage, LocalStorage, S3Storage
+
+
+def test_local_storage(tmp_path):
+    storage = LocalStorage(tmp_path, "/media/")
+
+    assert not storage.exists("avatars/abc.webp")
+    url = storage.save("avatars/abc.webp", b"data", "image/webp")
+
+    assert url == "/media/avatars/abc.webp"
+    assert storage.exists("avatars/abc.webp")
+    assert (tmp_path / "avatars" / "abc.webp").read_bytes() == b"data"
+
+
+def test_cloudinary_storage_save(monkeypatch):
+    calls = []
+
+    def mock_upload(file, **kwargs):
+        calls.append((file.read(), kwargs))
+        return {"version": 1}
+
+    monkeypatch.setattr("cloudinary.uploader.upload", mock_upload)
+    storage = CloudinaryStorage("cloud", "key", "secret", timeout=5)
+
+    url = storage.save("avatars/abc.webp", b"data", "image/webp")
+
+    assert url.endswith("/avatars/abc.webp")
+    assert calls[0][0] == b"data"
+    assert calls[0][1]["public_id"] == "avatars/abc"
+    assert calls[0][1]["timeout"] == 5
+    # Stored avatars are kept instead of being uploaded again.
+    assert calls[0][1]["overwrite"] is False
+
+
+def test_cloudinary_storage_exists_skips_admin_api(monkeypatch):
+    resource = MagicMock()
+    monkeypatch.setattr("cloudinary.api.resource", resource)
+    storage = CloudinaryStorage("cloud", "key", "secret")
+
+    assert not storage.exists("avatars/abc.webp")
+    resource.assert_not_called()
+
+
+def test_s3_storage():
+    class MissingKey(Exception):
+        response = {"Error": {"Code": "404"}}
+
+    client = MagicMock()
+    client.head_object.side_effect = MissingKey()
+    storage = S3Storage(
+        "bucket", endpoint_url="http://minio:9000", client=client
+    )
+
+    assert not storage.exists("avatars/abc.webp")
+    url = storage.save("avatars/abc.webp", b"data", "image/webp")
+
+    assert url == "http://minio:9000/bucket/avatars/abc.webp"
+    client.put_object.assert_called_once()
+    assert client.put_object.call_args.kwargs["ContentType"] == "image/webp"
+
+
+def test_s3_storage_error():
+    client = MagicMock()
+    client.head_object.side_effect = RuntimeError("connection failed")
+    storage = S3Storage("bucket", public_url="https://cdn.example.com", client=client)
+
+    with pytest.raises(RuntimeError):
+        storage.exists("avatars/abc.webp")
+    assert storage.url("avatars/abc.webp") == "https://cdn.example.com/avatars/abc.webp"
+
+
+def test_deployments_default_to_cloudinary():
+    # The local disk of a container is lost on redeploy.
+    assert Settings.model_fields["AVATAR_STORAGE"].default == "cloudinary"
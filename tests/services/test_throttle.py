@@ -0,0 +1,91 @@
+import fakeredis
+import pytest
+from fastapi import HTTPException
+from prometheus_client import REGISTRY
+
+from src.services.cache import CircuitBreaker
+from src.services.throttle import AuthThrottle, RedisCounterStore
+
+
+def rejections(scope: str) -> float:
+    return REGISTRY.get_sample_value(
+        "auth_throttle_rejections_total", {"scope": scope}
+    ) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_throttle_exponential_backoff():
+    throttle = AuthThrottle(max_failures=2, base_delay=10, max_delay=25)
+
+    await throttle.hit("account:login:bob", 2)
+    assert await throttle.retry_after("account:login:bob") == 0
+
+    await throttle.hit("account:login:bob", 2)
+    assert await throttle.retry_after("account:login:bob") == 10
+
+    await throttle.hit("account:login:bob", 2)
+    assert await throttle.retry_after("account:login:bob") == 20
+
+    await throttle.hit("account:login:bob", 2)
+    assert await throttle.retry_after("account:login:bob") == 25
+
+
+@pytest.mark.asyncio
+async def test_throttle_check_rejects_locked_key():
+    throttle = AuthThrottle(max_ip_attempts=1, base_delay=5)
+    await throttle.hit("ip:10.0.0.1", 1)
+    rejected = rejections("ip")
+
+    with pytest.raises(HTTPException) as exc:
+        await throttle.check("ip", "10.0.0.1")
+
+    assert exc.value.status_code == 429
+    assert exc.value.headers["Retry-After"] == "5"
+    assert rejections("ip") == rejected + 1
+    await throttle.check("ip", "10.0.0.2")
+
+
+@pytest.mark.asyncio
+async def test_throttle_redis_store():
+    store = RedisCounterStore(fakeredis.FakeAsyncRedis())
+    throttle = AuthThrottle(store, base_delay=3)
+
+    await throttle.hit("account:login:bob", 1)
+
+    assert await throttle.retry_after("account:login:bob") == 3
+    assert await store.client.ttl("throttle:count:account:login:bob") == 900
+
+
+@pytest.mark.asyncio
+async def test_throttle_falls_back_when_store_fails():
+    class BrokenStore:
+        async def incr(self, key, ttl):
+            raise ConnectionError("Redis is down")
+
+        async def set(self, key, ttl):
+            raise ConnectionError("Redis is down")
+
+        async def ttl(self, key):
+            raise ConnectionError("Redis is down")
+
+    throttle = AuthThrottle(BrokenStore(), base_delay=2)
+    await throttle.hit("ip:10.0.0.1", 1)
+
+    assert await throttle.retry_after("ip:10.0.0.1") == 2
+
+
+@pytest.mark.asyncio
+async def test_throttle_skips_store_while_circuit_is_open():
+    class BrokenStore:
+        calls = 0
+
+        async def incr(self, key, ttl):
+            BrokenStore.calls += 1
+            raise TimeoutError("Redis does not answer")
+
+    throttle = AuthThrottle(BrokenStore(), breaker=CircuitBreaker(2, 30.0))
+    for _ in range(5):
+        await throttle.hit("ip:10.0.0.1", 10)
+
+    assert BrokenStore.calls == 2
+    assert throttle.breaker.state == "open"
@@ -0,0 +1,95 @@
+import json
+import time
+import pytest
+
+from src.services.auth import create_email_token
+from src.services.tracing import (
+    FileExporter,
+    Span,
+    Trace,
+    _current,
+    span,
+    trace_methods,
+    traced,
+)
+from tests.conftest import test_user
+
+
+class ListExporter:
+    def __init__(self):
+        self.traces = []
+
+    def export(self, trace):
+        self.traces.append(trace)
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    exporter = ListExporter()
+    monkeypatch.setattr("src.services.tracing.get_exporter", lambda: exporter)
+    return exporter
+
+
+@pytest.mark.asyncio
+async def test_spans_nest_within_trace():
+    @trace_methods("repository.items")
+    class Repository:
+        async def get_item(self):
+            with span("cache.get", key="item:1"):
+                return 1
+
+    @traced("email.send")
+    def send():
+        raise ConnectionError("SMTP is down")
+
+    trace = Trace(trace_id="t1")
+    root = Span("root", "t1", "r1", None, time.time())
+    token = _current.set((trace, root))
+    try:
+        assert await Repository().get_item() == 1
+        with pytest.raises(ConnectionError):
+            send()
+    finally:
+        _current.reset(token)
+
+    spans = {s.name: s for s in trace.spans}
+    assert spans["repository.items.get_item"].parent_id == "r1"
+    assert spans["cache.get"].parent_id == spans["repository.items.get_item"].span_id
+    assert spans["cache.get"].attributes == {"key": "item:1"}
+    assert spans["email.send"].error == "ConnectionError('SMTP is down')"
+    assert all(s.duration_ms is not None for s in trace.spans)
+
+
+def test_span_outside_trace_is_noop():
+    with span("cache.get") as current:
+        assert current is None
+
+
+def test_request_trace(client, exporter):
+    token = create_email_token({"sub": test_user["email"]})
+
+    response = client.get(f"/api/auth/confirmed_email/{token}")
+
+    assert response.status_code == 200, response.text
+    trace = exporter.traces[-1]
+    assert response.headers["X-Trace-Id"] == trace.trace_id
+    root = next(s for s in trace.spans if s.parent_id is None)
+    assert root.name == "GET /api/auth/confirmed_email/{token}"
+    assert root.attributes["status"] == 200
+    lookup = next(s for s in trace.spans if s.name == "repository.users.get_user_by_email")
+    assert lookup.parent_id == root.span_id
+
+
+def test_file_exporter(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    exporter = FileExporter(str(path))
+    trace = Trace("t1", [Span("root", "t1", "r1", None, time.time(), 1.5)])
+
+    exporter.export(trace)
+    deadline = time.monotonic() + 2
+    while not (path.exists() and path.read_text()) and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    line = json.loads(path.read_text().splitlines()[0])
+    assert line["trace_id"] == "t1"
+    assert line["spans"][0]["duration_ms"] == 1.5
@@ -0,0 +1,130 @@
+import asyncio
+import hashlib
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from fastapi import HTTPException
+
+from src.services.storage import LocalStorage
+from src.services.upload_file import UploadFileService
+
+avatar_bytes = b"normalized-avatar"
+avatar_key = f"avatars/{hashlib.sha256(avatar_bytes).hexdigest()}.webp"
+
+
+@pytest.fixture
+def processor():
+    processor = MagicMock()
+    processor.process = AsyncMock(return_value=avatar_bytes)
+    processor.extension = "webp"
+    processor.content_type = "image/webp"
+    return processor
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalStorage(tmp_path, "/media")
+
+
+@pytest.mark.asyncio
+async def test_upload_file(storage, processor, fake_upload_file, tmp_path):
+    upload_service = UploadFileService(storage, processor=processor)
+
+    url = await upload_service.upload_file(fake_upload_file)
+
+    assert url == f"/media/{avatar_key}"
+    assert (tmp_path / avatar_key).read_bytes() == avatar_bytes
+    processor.process.assert_awaited_once_with(fake_upload_file)
+
+
+@pytest.mark.asyncio
+async def test_upload_file_same_as_current(processor, fake_upload_file):
+    storage = MagicMock()
+    storage.url.return_value = f"/media/{avatar_key}"
+    upload_service = UploadFileService(storage, processor=processor)
+
+    url = await upload_service.upload_file(fake_upload_file, f"/media/{avatar_key}")
+
+    assert url == f"/media/{avatar_key}"
+    storage.exists.assert_not_called()
+    storage.save.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_upload_file_already_stored(processor, fake_upload_file):
+    storage = MagicMock()
+    storage.url.return_value = f"/media/{avatar_key}"
+    storage.exists.return_value = True
+    upload_service = UploadFileService(storage, processor=processor)
+
+    url = await upload_service.upload_file(fake_upload_file, "/media/old.webp")
+
+    assert url == f"/media/{avatar_key}"
+    storage.exists.assert_called_once_with(avatar_key)
+    storage.save.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_upload_file_timeout(processor, fake_upload_file):
+    def slow_save(key, data, content_type):
+        time.sleep(0.5)
+        return "/media/avatar.webp"
+
+    storage = MagicMock()
+    storage.exists.return_value = False
+    storage.save.side_effect = slow_save
+    upload_service = UploadFileService(storage, processor=processor, timeout=0.1)
+
+    with pytest.raises(HTTPException) as exc:
+        await upload_service.upload_file(fake_upload_file)
+
+    assert exc.value.status_code == 504
+
+
+@pytest.mark.asyncio
+async def test_upload_file_timeout_keeps_slot_until_thread_finishes(
+    processor, fake_upload_file
+):
+    def slow_save(key, data, content_type):
+        time.sleep(0.3)
+        return "/media/avatar.webp"
+
+    storage = MagicMock()
+    storage.exists.return_value = False
+    storage.save.side_effect = slow_save
+    upload_service = UploadFileService(
+        storage, processor=processor, timeout=0.05, max_concurrency=1
+    )
+
+    with pytest.raises(HTTPException):
+        await upload_service.upload_file(fake_upload_file)
+
+    # The abandoned thread still holds the only slot.
+    assert upload_service._semaphore.locked()
+    await asyncio.sleep(0.5)
+    assert not upload_service._semaphore.locked()
+
+
+@pytest.mark.asyncio
+async def test_upload_file_slot_wait_within_timeout(processor, fake_upload_file):
+    def slow_save(key, data, content_type):
+        time.sleep(0.3)
+        return "/media/avatar.webp"
+
+    storage = MagicMock()
+    storage.exists.return_value = False
+    storage.save.side_effect = slow_save
+    upload_service = UploadFileService(
+        storage, processor=processor, timeout=0.05, max_concurrency=1
+    )
+
+    with pytest.raises(HTTPException) as first:
+        await upload_service.upload_file(fake_upload_file)
+    # The only slot is still held by the abandoned thread.
+    with pytest.raises(HTTPException) as second:
+        await upload_service.upload_file(fake_upload_file)
+
+    assert first.value.status_code == 504
+    assert second.value.status_code == 503
+    assert storage.save.call_count == 1
+    await asyncio.sleep(0.5)
@@ -0,0 +1,48 @@
+import pytest
+import pytest_asyncio
+from aiocache import SimpleMemoryCache
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.entity.models import Base, User
+from src.services.cache import CacheService
+from src.services.users import UserService, user_cache_key
+
+
+@pytest_asyncio.fixture
+async def expiring_session():
+    # The application sessions keep the default expire_on_commit=True.
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(bind=engine, expire_on_commit=True)() as session:
+        session.add(
+            User(
+                username="kate",
+                email="kate@example.com",
+                hashed_password="secret",
+                role="user",
+            )
+        )
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "update",
+    [
+        lambda service: service.confirmed_email("kate@example.com"),
+        lambda service: service.update_avatar_url("kate@example.com", "avatar.png"),
+        lambda service: service.reset_password(1, "new_secret"),
+    ],
+    ids=["confirmed_email", "update_avatar_url", "reset_password"],
+)
+async def test_update_invalidates_cached_user(expiring_session, monkeypatch, update):
+    cache = CacheService(SimpleMemoryCache())
+    monkeypatch.setattr("src.services.users.get_cache", lambda: cache)
+    await cache.set(user_cache_key("kate"), {"value": "cached"})
+
+    await update(UserService(expiring_session))
+
+    assert await cache.get(user_cache_key("kate")) is None